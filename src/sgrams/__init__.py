@@ -7,16 +7,85 @@ This module implements state transformation tables for various N-Gram orders:
 - 3rd Power N-Grams (Cubic): N₃(n) = 1 + (1 + n)³
 - 2D Catalan (Rooted Trees - OEIS A000081)
 - 3D Catalan (Unlabeled Trees - OEIS A000055)
+- Integer Partitions (Resource Allocation - OEIS A000041)
 """
 
-from .sgram import SGram
-from .state_transformer import StateTransformer
-from .fraction_patterns import FractionPattern
-from .ngram_base import NGramBase
-from .ngram_1st_power import NGram1stPower, NGram1stPowerFactory
-from .ngram_3rd_power import NGram3rdPower, NGram3rdPowerFactory
-from .ngram_2d_catalan import NGram2DCatalan, NGram2DCatalanFactory
-from .ngram_3d_catalan import NGram3DCatalan, NGram3DCatalanFactory, FlipTransform
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .sgram import SGram
+    from .state_transformer import StateTransformer
+    from .fraction_patterns import FractionPattern
+    from .ngram_base import NGramBase, PatternKey, PatternRange
+    from .ngram_1st_power import NGram1stPower, NGram1stPowerFactory
+    from .ngram_3rd_power import NGram3rdPower, NGram3rdPowerFactory
+    from .ngram_2d_catalan import NGram2DCatalan, NGram2DCatalanFactory
+    from .ngram_3d_catalan import NGram3DCatalan, NGram3DCatalanFactory, FlipTransform
+    from .ngram_partition import NGramPartition, NGramPartitionFactory
+    from .compact import CompactSGram, CompactNGram, PackedPatterns, to_compact
+    from .flyweight import (
+        enable_flyweight_cache, disable_flyweight_cache,
+        flyweight_cache_info, clear_flyweight_cache
+    )
+    from .registry import NGramFamily, NGramRegistry, get_family, register_family
+    from .catalogue import PatternCatalogue, CatalogueError, write_catalogue
+    from .pattern_store import PatternStore, PatternMatch, PatternStoreError, write_pattern_store
+
+# Public name -> submodule defining it; submodules are imported on first access
+_LAZY_ATTRIBUTES = {
+    'SGram': 'sgram',
+    'StateTransformer': 'state_transformer',
+    'FractionPattern': 'fraction_patterns',
+    'NGramBase': 'ngram_base',
+    'PatternKey': 'ngram_base',
+    'PatternRange': 'ngram_base',
+    'NGram1stPower': 'ngram_1st_power',
+    'NGram1stPowerFactory': 'ngram_1st_power',
+    'NGram3rdPower': 'ngram_3rd_power',
+    'NGram3rdPowerFactory': 'ngram_3rd_power',
+    'NGram2DCatalan': 'ngram_2d_catalan',
+    'NGram2DCatalanFactory': 'ngram_2d_catalan',
+    'NGram3DCatalan': 'ngram_3d_catalan',
+    'NGram3DCatalanFactory': 'ngram_3d_catalan',
+    'FlipTransform': 'ngram_3d_catalan',
+    'NGramPartition': 'ngram_partition',
+    'NGramPartitionFactory': 'ngram_partition',
+    'CompactSGram': 'compact',
+    'CompactNGram': 'compact',
+    'PackedPatterns': 'compact',
+    'to_compact': 'compact',
+    'enable_flyweight_cache': 'flyweight',
+    'disable_flyweight_cache': 'flyweight',
+    'flyweight_cache_info': 'flyweight',
+    'clear_flyweight_cache': 'flyweight',
+    'NGramFamily': 'registry',
+    'NGramRegistry': 'registry',
+    'get_family': 'registry',
+    'register_family': 'registry',
+    'PatternCatalogue': 'catalogue',
+    'CatalogueError': 'catalogue',
+    'write_catalogue': 'catalogue',
+    'PatternStore': 'pattern_store',
+    'PatternMatch': 'pattern_store',
+    'PatternStoreError': 'pattern_store',
+    'write_pattern_store': 'pattern_store',
+}
+
+
+def __getattr__(name: str):
+    """Import the submodule behind a public name on first access"""
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f'.{module_name}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
 
 __all__ = [
     # 2nd Power (S-Grams - existing)
@@ -25,6 +94,8 @@ __all__ = [
     'FractionPattern',
     # Base classes
     'NGramBase',
+    'PatternKey',
+    'PatternRange',
     # 1st Power
     'NGram1stPower',
     'NGram1stPowerFactory',
@@ -38,4 +109,31 @@ __all__ = [
     'NGram3DCatalan',
     'NGram3DCatalanFactory',
     'FlipTransform',
+    # Integer Partitions
+    'NGramPartition',
+    'NGramPartitionFactory',
+    # Compact representation
+    'CompactSGram',
+    'CompactNGram',
+    'PackedPatterns',
+    'to_compact',
+    # Flyweight cache
+    'enable_flyweight_cache',
+    'disable_flyweight_cache',
+    'flyweight_cache_info',
+    'clear_flyweight_cache',
+    # Type registry
+    'NGramFamily',
+    'NGramRegistry',
+    'get_family',
+    'register_family',
+    # Memory-mapped catalogue
+    'PatternCatalogue',
+    'CatalogueError',
+    'write_catalogue',
+    # SQLite pattern store
+    'PatternStore',
+    'PatternMatch',
+    'PatternStoreError',
+    'write_pattern_store',
 ]
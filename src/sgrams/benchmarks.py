@@ -0,0 +1,396 @@
+"""
+Benchmarks for the N-Grams module.
+
+Times the hot paths of the state transformation system so changes to
+the lookup structures can be compared. Run directly:
+
+    python benchmarks.py
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import timeit
+import tracemalloc
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError:  # Only the batch benchmark needs NumPy
+    np = None
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sgrams.sgram import SGramFactory
+from sgrams.ngram_3rd_power import NGram3rdPowerFactory
+from sgrams.state_transformer import StateTransformer, MultiPatternTransformer
+from sgrams.fraction_patterns import FractionPatternAnalyzer
+from sgrams.table_generator import StateTransformationTableGenerator, AllSGramsTableGenerator
+from sgrams.compact import to_compact
+from sgrams.ngram_2d_catalan import NGram2DCatalanFactory
+from sgrams.ngram_3d_catalan import NGram3DCatalanFactory
+from sgrams.flyweight import enable_flyweight_cache, disable_flyweight_cache, flyweight_cache_info
+from sgrams.sequences import rooted_trees_count
+from sgrams.trees import iter_free_trees, iter_rooted_trees
+
+
+# Import-time budgets (ms) per CLI invocation, measured with -X importtime
+# on top of a bare interpreter start
+IMPORT_TIME_BUDGETS = {
+    ('--help',): 30,
+    ('types',): 50,
+    ('summary',): 45,
+    ('summary', '--type', '3d'): 45,
+    ('show', '3'): 45,
+    ('show', '3', '--type', 'part'): 45,
+    ('transition', '3', '5'): 45,
+    ('trace', '3', '1'): 45,
+    ('compare',): 45,
+    ('compare', '--type', '2d'): 45,
+    ('export', '--type', '3rd'): 45,
+}
+
+
+def _best_time(func, number: int, repeat: int = 5) -> float:
+    """Best per-call time of func in microseconds"""
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1e6
+
+
+def _print_row(label: str, plain: float, compiled: float) -> None:
+    """Print one comparison row"""
+    speedup = plain / compiled if compiled else float('inf')
+    print(f"  {label:<28s} {plain:>12.2f} {compiled:>12.2f} {speedup:>9.1f}x")
+
+
+def _print_header(title: str) -> None:
+    """Print a benchmark section header"""
+    print("\n" + "=" * 70)
+    print(title)
+    print("=" * 70)
+    print(f"  {'Operation':<28s} {'Plain (us)':>12s} {'Compiled (us)':>12s} {'Speed-up':>10s}")
+    print("-" * 70)
+
+
+def benchmark_transformer(ngram, title: str, number: int) -> None:
+    """
+    Compare plain and compiled StateTransformer lookups on an N-Gram.
+
+    Up to 64 states of the longest primary pattern are resolved, informed
+    and measured against its first state, so list scans show up.
+    """
+    pattern = max(ngram.fraction_patterns, key=lambda name: len(ngram.fraction_patterns[name]))
+    sequence = ngram.fraction_patterns[pattern]
+    states = [sequence[i] for i in range(0, len(sequence), max(1, len(sequence) // 64))]
+    first = sequence[0]
+
+    plain_build = _best_time(lambda: StateTransformer(ngram), 1, repeat=3)
+    compiled_build = _best_time(lambda: StateTransformer(ngram, compiled=True), 1, repeat=3)
+    plain = StateTransformer(ngram)
+    compiled = StateTransformer(ngram, compiled=True)
+
+    _print_header(f"{title} (pattern {pattern}, cycle length {len(sequence)})")
+    _print_row("construction", plain_build, compiled_build)
+    for name, run in (
+        ('resolve', lambda t: [t.resolve(s, pattern) for s in states]),
+        ('inform', lambda t: [t.inform(s, pattern) for s in states]),
+        ('get_state_distance', lambda t: [t.get_state_distance(first, s, pattern) for s in states]),
+    ):
+        _print_row(f"{name} x{len(states)}",
+                   _best_time(lambda: run(plain), number),
+                   _best_time(lambda: run(compiled), number))
+
+
+def benchmark_sgram_11():
+    """Compiled vs plain transformer on the hand-written S-Gram 11"""
+    benchmark_transformer(SGramFactory.create_sgram(11), "S-Gram s12", number=2000)
+
+
+def benchmark_large_sgram():
+    """Compiled vs plain transformer on a generated S-Gram with a long '1/n' row"""
+    benchmark_transformer(SGramFactory.create_sgram(401), "S-Gram s402", number=200)
+
+
+def benchmark_large_cubic():
+    """Compiled vs plain transformer on a large 3rd Power pattern"""
+    benchmark_transformer(NGram3rdPowerFactory.create_ngram_3rd(60), "3rd Power n3_60", number=200)
+
+
+def benchmark_multi_pattern(index: int = 30):
+    """
+    MultiPatternTransformer against the per-pattern approach it replaced.
+
+    The baseline builds one StateTransformer per pattern and answers
+    queries by scanning a fresh get_all_patterns() merge.
+    """
+    sgram = SGramFactory.create_sgram(index)
+    patterns = sgram.get_all_patterns()
+    states = list(range(0, index * index + 1, 3))
+    names = list(patterns)
+
+    def baseline_build():
+        return {pattern: StateTransformer(sgram) for pattern in patterns}
+
+    def baseline_lookup():
+        return [[name for name, seq in sgram.get_all_patterns().items() if state in seq]
+                for state in states]
+
+    def baseline_cross():
+        all_patterns = sgram.get_all_patterns
+        return [state if state in all_patterns().get(names[0], []) and
+                state in all_patterns().get(names[-1], []) else None
+                for state in states]
+
+    multi = MultiPatternTransformer(sgram)
+
+    print("\n" + "=" * 70)
+    print(f"S-Gram {sgram.symbol} MultiPatternTransformer ({len(patterns)} patterns, {len(states)} queries)")
+    print("=" * 70)
+    print(f"  {'Operation':<28s} {'Before (us)':>12s} {'After (us)':>12s} {'Speed-up':>10s}")
+    print("-" * 70)
+    _print_row("construction",
+               _best_time(baseline_build, 1, repeat=3),
+               _best_time(lambda: MultiPatternTransformer(sgram), 1, repeat=3))
+    _print_row("get_pattern_for_state",
+               _best_time(baseline_lookup, 3),
+               _best_time(lambda: [multi.get_pattern_for_state(s) for s in states], 3))
+    _print_row("cross_pattern_transition",
+               _best_time(baseline_cross, 3),
+               _best_time(lambda: [multi.cross_pattern_transition(s, names[0], names[-1])
+                                   for s in states], 3))
+
+
+def benchmark_pattern_keys(indices=(60, 120)):
+    """
+    Divisor parsing with PatternKey vs string splitting, plus analyzer
+    and table generation over large generated S-Grams.
+    """
+    print("\n" + "=" * 70)
+    print("Pattern keys: split('/') parsing vs interned PatternKey")
+    print("=" * 70)
+    print(f"  {'Operation':<28s} {'Split (us)':>12s} {'Key (us)':>12s} {'Speed-up':>10s}")
+    print("-" * 70)
+    for index in indices:
+        sgram = SGramFactory.create_sgram(index)
+        keys = list(sgram.get_all_patterns())
+        plain = [str(key) for key in keys]
+        _print_row(f"{sgram.symbol} parse x{len(keys)}",
+                   _best_time(lambda: [(int(k.split('/')[0]), int(k.split('/')[1])) for k in plain], 20),
+                   _best_time(lambda: [(k.numerator, k.denominator) for k in keys], 20))
+        _print_row(f"{sgram.symbol} sort x{len(keys)}",
+                   _best_time(lambda: sorted(plain, key=lambda k: (int(k.split('/')[0]) / int(k.split('/')[1]),
+                                                               int(k.split('/')[1]))), 20),
+                   _best_time(lambda: sorted(keys), 20))
+
+    print("\n" + "-" * 70)
+    print(f"  {'Operation':<40s} {'Time (ms)':>12s}")
+    print("-" * 70)
+    for index in indices:
+        sgram = SGramFactory.create_sgram(index)
+        analyze = _best_time(lambda: FractionPatternAnalyzer(sgram).generate_summary(), 1, repeat=3)
+        tables = _best_time(lambda: StateTransformationTableGenerator(sgram).generate_complete_table(), 1, repeat=3)
+        print(f"  {sgram.symbol + ' analyzer summary':<40s} {analyze / 1000:>12.2f}")
+        print(f"  {sgram.symbol + ' complete table':<40s} {tables / 1000:>12.2f}")
+
+
+def _retained_bytes(build) -> int:
+    """Bytes still allocated after build() returns, while its result is alive"""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = build()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del result
+    return after - before
+
+
+def benchmark_compact_memory(count: int = 20000, max_index: int = 40):
+    """
+    Memory of dict-of-list S-Grams vs packed CompactSGram.
+
+    Only explicit state lists shrink; families whose patterns are all
+    range-backed (1st/3rd power, Catalan, partitions) are already compact.
+    """
+    indices = [i % max_index for i in range(count)]
+    table_indices = [i % 12 for i in range(count)]
+
+    print("\n" + "=" * 70)
+    print(f"Memory for {count} N-Grams kept alive")
+    print("=" * 70)
+    print(f"  {'Layout':<28s} {'Dataclass (MB)':>14s} {'Compact (MB)':>13s} {'Ratio':>8s}")
+    print("-" * 70)
+    for label, build in (
+        ("S-Grams 0-11", lambda: [SGramFactory.create_sgram(i) for i in table_indices]),
+        (f"S-Grams 0-{max_index - 1}", lambda: [SGramFactory.create_sgram(i) for i in indices]),
+    ):
+        plain = _retained_bytes(build)
+        packed = _retained_bytes(lambda: [to_compact(ngram) for ngram in build()])
+        print(f"  {label:<28s} {plain / 2**20:>14.2f} {packed / 2**20:>13.2f} {plain / packed:>7.1f}x")
+
+
+def benchmark_flyweight_cache():
+    """
+    Repeated factory calls with and without the flyweight cache.
+
+    Cached N-Grams are CompactSGram/CompactNGram instances, so workloads
+    that mostly scan pattern lists pay for the packed views.
+    """
+    workloads = (
+        ("create_all_sgrams", SGramFactory.create_all_sgrams, 200),
+        ("create_sgram 0-39", lambda: [SGramFactory.create_sgram(i) for i in range(40)], 20),
+        ("2D Catalan create_range", NGram2DCatalanFactory.create_range, 200),
+        ("AllSGramsTableGenerator", lambda: AllSGramsTableGenerator().generate_all_tables(), 20),
+    )
+
+    print("\n" + "=" * 70)
+    print("Flyweight cache: repeated factory calls")
+    print("=" * 70)
+    print(f"  {'Operation':<28s} {'Uncached (us)':>12s} {'Cached (us)':>12s} {'Speed-up':>10s}")
+    print("-" * 70)
+    for label, run, number in workloads:
+        disable_flyweight_cache()
+        uncached = _best_time(run, number)
+        enable_flyweight_cache()
+        cached = _best_time(run, number)
+        _print_row(label, uncached, cached)
+    info = flyweight_cache_info()
+    print(f"  cache: {info.hits} hits, {info.misses} misses, {info.currsize}/{info.maxsize} entries")
+    disable_flyweight_cache()
+
+
+def benchmark_batch_resolve():
+    """Per-element resolve vs resolve_batch over a large array of states"""
+    if np is None:
+        print("\nSkipping batch benchmark: NumPy is not installed")
+        return
+
+    sgram = SGramFactory.create_sgram(11)
+    transformer = StateTransformer(sgram, compiled=True)
+    pattern_ids = transformer.get_pattern_ids()
+    names = list(pattern_ids)
+    rng = np.random.default_rng(0)
+
+    # Every element is a valid (state, pattern) pair
+    choices = rng.integers(0, len(names), size=100_000)
+    states = np.array([sgram.get_all_patterns()[names[c]][0] for c in choices], dtype=np.int64)
+    ids = np.array([pattern_ids[names[c]] for c in choices], dtype=np.intp)
+    state_list = states.tolist()
+    name_list = [names[c] for c in choices]
+
+    plain = _best_time(lambda: [transformer.resolve(s, p) for s, p in zip(state_list, name_list)], 1, repeat=3)
+    batch = _best_time(lambda: transformer.resolve_batch(states, ids), 1, repeat=3)
+
+    print("\n" + "=" * 70)
+    print(f"S-Gram s12 batch resolve ({len(states)} states, {len(names)} patterns)")
+    print("=" * 70)
+    print(f"  {'Operation':<28s} {'Loop (us)':>12s} {'Batch (us)':>12s} {'Speed-up':>10s}")
+    print("-" * 70)
+    _print_row("resolve", plain, batch)
+
+
+def benchmark_rooted_trees(max_n: int = 20):
+    """Rooted tree enumeration throughput, checked against A000081"""
+    print("\n" + "=" * 70)
+    print(f"Rooted tree enumeration (iter_rooted_trees, n up to {max_n})")
+    print("=" * 70)
+    print(f"  {'n':<6s} {'Trees':>12s} {'Seconds':>10s} {'Trees/s':>14s} {'A000081':>8s}")
+    print("-" * 70)
+    for n in range(max(max_n - 5, 1), max_n + 1):
+        start = timeit.default_timer()
+        count = sum(1 for _ in iter_rooted_trees(n))
+        elapsed = timeit.default_timer() - start
+        status = 'ok' if count == rooted_trees_count(n) else 'WRONG'
+        print(f"  {n:<6d} {count:>12d} {elapsed:>10.2f} {count / elapsed:>14,.0f} {status:>8s}")
+
+
+def benchmark_free_trees(max_n: int = 20):
+    """Free tree enumeration throughput, checked against A000055_SEQUENCE"""
+    expected = NGram3DCatalanFactory.A000055_SEQUENCE
+
+    print("\n" + "=" * 70)
+    print(f"Free tree enumeration (iter_free_trees, n up to {max_n})")
+    print("=" * 70)
+    print(f"  {'n':<6s} {'Trees':>12s} {'Seconds':>10s} {'Trees/s':>14s} {'A000055':>8s}")
+    print("-" * 70)
+    for n in range(max(max_n - 5, 1), max_n + 1):
+        start = timeit.default_timer()
+        count = sum(1 for _ in iter_free_trees(n))
+        elapsed = timeit.default_timer() - start
+        if n < len(expected):
+            status = 'ok' if count == expected[n] else 'WRONG'
+        else:
+            status = '-'
+        print(f"  {n:<6d} {count:>12d} {elapsed:>10.2f} {count / elapsed:>14,.0f} {status:>8s}")
+
+
+def _import_time_ms(args, repeat: int = 5) -> float:
+    """
+    Best total import time of a Python invocation, in milliseconds.
+
+    Sums the cumulative time of the top-level entries that -X importtime
+    reports, so nested imports are counted once.
+    """
+    env = dict(os.environ, PYTHONPATH=str(Path(__file__).parent.parent))
+    best = float('inf')
+    for _ in range(repeat):
+        result = subprocess.run([sys.executable, '-X', 'importtime', *args],
+                                env=env, stdout=subprocess.DEVNULL,
+                                stderr=subprocess.PIPE, text=True)
+        total = 0
+        for line in result.stderr.splitlines():
+            if not line.startswith('import time:'):
+                continue
+            _, cumulative, name = line.split('|')
+            if cumulative.strip().isdigit() and not name[1:].startswith(' '):
+                total += int(cumulative)
+        best = min(best, total / 1000)
+    return best
+
+
+def benchmark_import_time():
+    """CLI import time per subcommand against IMPORT_TIME_BUDGETS"""
+    cli = str(Path(__file__).parent / 'sgrams_cli.py')
+    baseline = _import_time_ms(['-c', 'pass'])
+
+    print("\n" + "=" * 70)
+    print(f"CLI import time (-X importtime, interpreter baseline {baseline:.1f} ms)")
+    print("=" * 70)
+    print(f"  {'Command':<36s} {'Imports (ms)':>12s} {'Budget (ms)':>12s} {'Status':>6s}")
+    print("-" * 70)
+    with tempfile.TemporaryDirectory() as directory:
+        for command, budget in IMPORT_TIME_BUDGETS.items():
+            args = list(command)
+            if command[0] == 'export':
+                args += ['--output', os.path.join(directory, 'tables.md')]
+            elapsed = _import_time_ms([cli, *args]) - baseline
+            status = 'ok' if elapsed <= budget else 'OVER'
+            print(f"  {' '.join(command):<36s} {elapsed:>12.1f} {budget:>12d} {status:>6s}")
+
+
+def main():
+    """Run all benchmarks"""
+    benchmarks = [
+        benchmark_sgram_11,
+        benchmark_large_sgram,
+        benchmark_large_cubic,
+        benchmark_multi_pattern,
+        benchmark_pattern_keys,
+        benchmark_compact_memory,
+        benchmark_flyweight_cache,
+        benchmark_batch_resolve,
+        benchmark_rooted_trees,
+        benchmark_free_trees,
+        benchmark_import_time,
+    ]
+
+    for benchmark_func in benchmarks:
+        benchmark_func()
+
+    print("\n" + "=" * 70)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,504 @@
+"""
+Memory-mapped binary catalogue of precomputed N-Gram patterns.
+
+Building the patterns of every family for a large index range is slow;
+a catalogue stores them once so later processes only map the file:
+
+    >>> from sgrams.catalogue import write_catalogue, PatternCatalogue
+    >>> write_catalogue('ngrams.cat', end=100)
+    >>> with PatternCatalogue('ngrams.cat') as catalogue:
+    ...     catalogue.get_state_sequence('2nd', 3, '1/7').tolist()
+    [1, 4, 2, 8, 5, 7]
+
+Opening a catalogue reads only its header and family table; pattern
+records are unpacked from the map when an N-Gram is requested, and the
+states themselves are never copied: sequences are memoryviews (or NumPy
+arrays with numpy=True) over the mapped file. Range-backed patterns are
+stored as start/stop/step and returned as PatternRange.
+
+File layout, all integers little-endian:
+
+- Header (HEADER): magic, version, family count and the offsets of the
+  family, N-Gram and pattern tables and of the key string pool
+- State data: packed uint32 or uint64 arrays, wider states as a byte
+  width (BIG_STATES_DATA) followed by unsigned integers of that width,
+  and range triples, each
+  aligned to 8 bytes; triples are int64 (RANGE_DATA) or, for values
+  past 64 bits, byte lengths (BIG_RANGE_DATA) followed by signed
+  integers of those lengths
+- Key string pool: the UTF-8 divisor keys, each distinct key once
+- Family table (FAMILY_ENTRY): key, first index, number of N-Grams and
+  the family's first row in the N-Gram table
+- N-Gram table (NGRAM_ENTRY): first row in the pattern table and the
+  numbers of fraction patterns and additional factors
+- Pattern table (PATTERN_ENTRY): key offset and length in the string
+  pool, kind, data offset and number of states
+"""
+
+import mmap
+import struct
+import sys
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .ngram_base import PatternKey, PatternRange
+
+MAGIC = b'NGRAMCAT'
+VERSION = 1
+
+# magic, version, family count, family/N-Gram/pattern table and string pool offsets
+HEADER = struct.Struct('<8sIIQQQQ')
+# key, first index, N-Gram count, first N-Gram row
+FAMILY_ENTRY = struct.Struct('<16sQQQ')
+# first pattern row, fraction pattern count, additional factor count
+NGRAM_ENTRY = struct.Struct('<QII')
+# key offset, key length, kind, data offset, state count
+PATTERN_ENTRY = struct.Struct('<QIB3xQQ')
+# byte width of each state of a pattern past 64 bits
+BIG_STATES_DATA = struct.Struct('<I4x')
+# start, stop, step of a range-backed pattern
+RANGE_DATA = struct.Struct('<qqq')
+# byte lengths of start, stop, step of a range-backed pattern past 64 bits
+BIG_RANGE_DATA = struct.Struct('<III')
+
+# Pattern kinds
+KIND_UINT32 = 1
+KIND_UINT64 = 2
+KIND_RANGE = 3
+KIND_BIG_RANGE = 4
+KIND_BIG_STATES = 5
+
+_ALIGNMENT = 8
+_LITTLE_ENDIAN = sys.byteorder == 'little'
+_INT64_MIN = -(1 << 63)
+_INT64_MAX = (1 << 63) - 1
+_UINT64_MAX = (1 << 64) - 1
+
+# NumPy is only needed for numpy=True views and is imported on first use
+np = None
+
+
+def _load_numpy() -> Any:
+    """
+    Import NumPy for array views.
+
+    Raises:
+        ImportError: If NumPy is not installed
+    """
+    global np
+    if np is None:
+        try:
+            import numpy
+        except ImportError:
+            raise ImportError("NumPy views of a catalogue require NumPy") from None
+        np = numpy
+    return np
+
+
+class CatalogueError(ValueError):
+    """Raised for files that are not valid catalogues"""
+
+
+def _pack_states(states: Sequence[int]) -> Tuple[int, bytes]:
+    """
+    Pack an explicit state sequence.
+
+    Returns:
+        The pattern kind and the little-endian bytes
+
+    Raises:
+        ValueError: If a state is negative
+    """
+    if not states:
+        return KIND_UINT32, b''
+    low, high = min(states), max(states)
+    if low < 0:
+        raise ValueError(f"States must not be negative, got {low}")
+    if high > _UINT64_MAX:
+        width = (high.bit_length() + 7) // 8
+        return KIND_BIG_STATES, BIG_STATES_DATA.pack(width) + b''.join(
+            state.to_bytes(width, 'little') for state in states
+        )
+    kind, typecode = (KIND_UINT32, 'I') if high < 1 << 32 else (KIND_UINT64, 'Q')
+    packed = array(typecode, states)
+    if not _LITTLE_ENDIAN:
+        packed.byteswap()
+    return kind, packed.tobytes()
+
+
+def _pack_range(states: PatternRange) -> Tuple[int, bytes]:
+    """
+    Pack a range-backed pattern as its start, stop and step.
+
+    Returns:
+        The pattern kind and the little-endian bytes
+    """
+    r = states.as_range()
+    values = (r.start, r.stop, r.step)
+    if all(_INT64_MIN <= value <= _INT64_MAX for value in values):
+        return KIND_RANGE, RANGE_DATA.pack(*values)
+    encoded = [value.to_bytes(value.bit_length() // 8 + 1, 'little', signed=True)
+               for value in values]
+    return KIND_BIG_RANGE, BIG_RANGE_DATA.pack(*map(len, encoded)) + b''.join(encoded)
+
+
+def write_catalogue(path: str, end: int, families: Optional[Iterable[str]] = None,
+                    start: int = 0) -> None:
+    """
+    Write the patterns of N-Gram families to a catalogue file.
+
+    N-Grams are built and written one at a time, so only the tables are
+    kept in memory.
+
+    Args:
+        path: File to write
+        end: Index to stop before
+        families: Registry type keys (default: every registered type)
+        start: First index
+
+    Raises:
+        ValueError: If the range is empty, a key is too long or a
+            pattern has negative states
+        KeyError: If a type key is unknown
+    """
+    from .registry import registry
+
+    if start < 0 or end <= start:
+        raise ValueError("need 0 <= start < end")
+    keys = list(dict.fromkeys(registry.keys() if families is None else families))
+
+    family_table = bytearray()
+    ngram_table = bytearray()
+    pattern_table = bytearray()
+    strings = bytearray()
+    string_offsets: Dict[str, int] = {}
+    ngram_rows = pattern_rows = 0
+
+    with open(path, 'wb') as f:
+        f.write(bytes(HEADER.size))
+        position = HEADER.size
+
+        for key in keys:
+            encoded = key.encode('utf-8')
+            if len(encoded) > FAMILY_ENTRY.size - 24:
+                raise ValueError(f"Type key too long for a catalogue: {key!r}")
+            family = registry.get_family(key)
+            family_table += FAMILY_ENTRY.pack(encoded, start, end - start, ngram_rows)
+
+            for ngram in family.iter_range(start, end):
+                groups = (ngram.fraction_patterns, ngram.additional_factors)
+                ngram_table += NGRAM_ENTRY.pack(pattern_rows, len(groups[0]), len(groups[1]))
+                ngram_rows += 1
+
+                for patterns in groups:
+                    for divisor, states in patterns.items():
+                        if isinstance(states, PatternRange):
+                            kind, data = _pack_range(states)
+                            # Range states are not read back by count; clip past 64 bits
+                            count = min(states.size, _UINT64_MAX)
+                        else:
+                            kind, data = _pack_states(states)
+                            count = len(states)
+
+                        padding = -position % _ALIGNMENT
+                        if padding:
+                            f.write(bytes(padding))
+                            position += padding
+                        f.write(data)
+
+                        divisor = str(divisor)
+                        key_offset = string_offsets.get(divisor)
+                        if key_offset is None:
+                            key_offset = string_offsets[divisor] = len(strings)
+                            strings += divisor.encode('utf-8')
+                        pattern_table += PATTERN_ENTRY.pack(
+                            key_offset, len(divisor.encode('utf-8')), kind, position, count
+                        )
+                        pattern_rows += 1
+                        position += len(data)
+
+        strings_offset = position
+        family_offset = strings_offset + len(strings)
+        family_offset += -family_offset % _ALIGNMENT
+        ngram_offset = family_offset + len(family_table)
+        pattern_offset = ngram_offset + len(ngram_table)
+
+        f.write(strings)
+        f.write(bytes(family_offset - strings_offset - len(strings)))
+        f.write(family_table)
+        f.write(ngram_table)
+        f.write(pattern_table)
+
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, VERSION, len(keys), family_offset, ngram_offset,
+                            pattern_offset, strings_offset))
+
+
+class CatalogueNGram:
+    """
+    Patterns of one N-Gram in a catalogue.
+
+    Offers the pattern accessors of SGram and NGramBase;
+    fraction_patterns and additional_factors are built from the pattern
+    table on first access and hold views into the mapped file.
+
+    Attributes:
+        key: Type key of the family
+        index: The N-Gram index
+    """
+
+    __slots__ = ('_catalogue', '_row', '_numpy', '_fraction_patterns',
+                 '_additional_factors', 'key', 'index')
+
+    def __init__(self, catalogue: 'PatternCatalogue', key: str, index: int, row: int,
+                 numpy: bool = False):
+        self._catalogue = catalogue
+        self._row = row
+        self._numpy = numpy
+        self._fraction_patterns: Optional[Dict[PatternKey, Any]] = None
+        self._additional_factors: Optional[Dict[PatternKey, Any]] = None
+        self.key = key
+        self.index = index
+
+    def _load(self) -> None:
+        """Read this N-Gram's pattern records"""
+        first, fractions, additional = self._catalogue._ngram_entry(self._row)
+        patterns = self._catalogue._patterns(first, fractions + additional, self._numpy)
+        self._fraction_patterns = dict(patterns[:fractions])
+        self._additional_factors = dict(patterns[fractions:])
+
+    @property
+    def fraction_patterns(self) -> Dict[PatternKey, Any]:
+        """Primary patterns, keyed by divisor"""
+        if self._fraction_patterns is None:
+            self._load()
+        return self._fraction_patterns
+
+    @property
+    def additional_factors(self) -> Dict[PatternKey, Any]:
+        """Additional factor patterns, keyed by divisor"""
+        if self._additional_factors is None:
+            self._load()
+        return self._additional_factors
+
+    def get_state_sequence(self, divisor: Optional[str] = None) -> Sequence[int]:
+        """
+        Get the state sequence for a specific divisor.
+
+        Args:
+            divisor: The divisor key (e.g., '1/3', '1/7'). If None, returns primary pattern.
+
+        Returns:
+            A view of the states, or an empty list for an unknown divisor
+        """
+        if divisor is None:
+            if self.fraction_patterns:
+                return next(iter(self.fraction_patterns.values()))
+            return []
+        return self.fraction_patterns.get(divisor, [])
+
+    def get_all_patterns(self) -> Dict[PatternKey, Sequence[int]]:
+        """Returns all fraction patterns including additional factors"""
+        all_patterns = dict(self.fraction_patterns)
+        all_patterns.update(self.additional_factors)
+        return all_patterns
+
+    def __repr__(self) -> str:
+        return f"CatalogueNGram({self.key!r}, {self.index})"
+
+
+class PatternCatalogue:
+    """
+    Read-only, memory-mapped catalogue written by write_catalogue().
+
+    State sequences are memoryviews of format 'I' or 'Q' over the map
+    (NumPy arrays with numpy=True); on big-endian hosts they are copied
+    into byte-swapped arrays instead, and states past 64 bits are
+    decoded into lists. Views keep the map alive: close()
+    leaves it to the garbage collector while any view is still in use.
+    """
+
+    def __init__(self, path: str):
+        """
+        Map a catalogue file.
+
+        Args:
+            path: File written by write_catalogue()
+
+        Raises:
+            CatalogueError: If the file is not a catalogue of a supported version
+        """
+        with open(path, 'rb') as f:
+            try:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise CatalogueError(f"{path} is empty") from None
+        self._buffer = memoryview(self._map)
+        self.path = path
+
+        if len(self._map) < HEADER.size:
+            self.close()
+            raise CatalogueError(f"{path} is too short to be a catalogue")
+        (magic, version, family_count, self._family_offset, self._ngram_offset,
+         self._pattern_offset, self._strings_offset) = HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise CatalogueError(f"{path} is not a version {VERSION} N-Gram catalogue")
+
+        self._families: Dict[str, Tuple[int, int, int]] = {}
+        for i in range(family_count):
+            key, start, count, first_row = FAMILY_ENTRY.unpack_from(
+                self._map, self._family_offset + i * FAMILY_ENTRY.size
+            )
+            self._families[key.rstrip(b'\0').decode('utf-8')] = (start, count, first_row)
+
+    def keys(self) -> List[str]:
+        """Type keys of the catalogued families"""
+        return list(self._families)
+
+    def index_range(self, key: str) -> range:
+        """
+        Indices catalogued for a family.
+
+        Raises:
+            KeyError: If the family is not in the catalogue
+        """
+        start, count, _ = self._family(key)
+        return range(start, start + count)
+
+    def _family(self, key: str) -> Tuple[int, int, int]:
+        """Start index, count and first N-Gram row of a family"""
+        try:
+            return self._families[key]
+        except KeyError:
+            raise KeyError(f"N-Gram type '{key}' is not in the catalogue") from None
+
+    def _ngram_entry(self, row: int) -> Tuple[int, int, int]:
+        """First pattern row and pattern counts of an N-Gram"""
+        return NGRAM_ENTRY.unpack_from(self._map, self._ngram_offset + row * NGRAM_ENTRY.size)
+
+    def _states(self, kind: int, offset: int, count: int, numpy: bool) -> Sequence[int]:
+        """View of one pattern's states"""
+        if kind == KIND_RANGE:
+            return PatternRange(*RANGE_DATA.unpack_from(self._map, offset))
+        if kind == KIND_BIG_STATES:
+            width, = BIG_STATES_DATA.unpack_from(self._map, offset)
+            offset += BIG_STATES_DATA.size
+            return [int.from_bytes(self._map[position:position + width], 'little')
+                    for position in range(offset, offset + count * width, width)]
+        if kind == KIND_BIG_RANGE:
+            values = []
+            position = offset + BIG_RANGE_DATA.size
+            for length in BIG_RANGE_DATA.unpack_from(self._map, offset):
+                values.append(int.from_bytes(self._map[position:position + length],
+                                             'little', signed=True))
+                position += length
+            return PatternRange(*values)
+        typecode, dtype = ('I', '<u4') if kind == KIND_UINT32 else ('Q', '<u8')
+        if numpy:
+            return _load_numpy().frombuffer(self._map, dtype=dtype, count=count, offset=offset)
+        data = self._buffer[offset:offset + count * struct.calcsize(typecode)]
+        if _LITTLE_ENDIAN:
+            return data.cast(typecode)
+        swapped = array(typecode, data)
+        swapped.byteswap()
+        return swapped
+
+    def _patterns(self, first: int, count: int,
+                  numpy: bool) -> List[Tuple[PatternKey, Sequence[int]]]:
+        """(key, view) pairs for consecutive pattern rows"""
+        patterns = []
+        strings = self._strings_offset
+        for row in range(first, first + count):
+            key_offset, key_length, kind, offset, states = PATTERN_ENTRY.unpack_from(
+                self._map, self._pattern_offset + row * PATTERN_ENTRY.size
+            )
+            key = self._map[strings + key_offset:strings + key_offset + key_length].decode('utf-8')
+            patterns.append((PatternKey(key), self._states(kind, offset, states, numpy)))
+        return patterns
+
+    def get(self, key: str, index: int, numpy: bool = False) -> CatalogueNGram:
+        """
+        Get the catalogued patterns of an N-Gram.
+
+        Args:
+            key: Type key, e.g. '3rd'
+            index: The N-Gram index
+            numpy: Whether sequences are NumPy arrays instead of memoryviews
+
+        Raises:
+            KeyError: If the family is not in the catalogue
+            IndexError: If the index is outside the catalogued range
+        """
+        start, count, first_row = self._family(key)
+        if not start <= index < start + count:
+            raise IndexError(f"Index {index} is not catalogued for '{key}' "
+                             f"({start} to {start + count - 1})")
+        return CatalogueNGram(self, key, index, first_row + index - start, numpy)
+
+    def get_state_sequence(self, key: str, index: int, divisor: Optional[str] = None,
+                           numpy: bool = False) -> Sequence[int]:
+        """
+        Get a state sequence without building the N-Gram.
+
+        Args:
+            key: Type key
+            index: The N-Gram index
+            divisor: The divisor key; if None, returns the primary pattern
+            numpy: Whether to return a NumPy array instead of a memoryview
+
+        Returns:
+            A view of the states, or an empty list for an unknown divisor
+        """
+        return self.get(key, index, numpy).get_state_sequence(divisor)
+
+    def get_all_patterns(self, key: str, index: int,
+                         numpy: bool = False) -> Dict[PatternKey, Sequence[int]]:
+        """
+        Get all patterns of an N-Gram, including additional factors.
+
+        Args:
+            key: Type key
+            index: The N-Gram index
+            numpy: Whether sequences are NumPy arrays instead of memoryviews
+
+        Returns:
+            Mapping from divisor keys to views of the states
+        """
+        return self.get(key, index, numpy).get_all_patterns()
+
+    def iter_range(self, key: str, start: Optional[int] = None,
+                   end: Optional[int] = None) -> Iterator[CatalogueNGram]:
+        """
+        Iterate over catalogued N-Grams of a family.
+
+        Args:
+            key: Type key
+            start: First index (default: the first catalogued one)
+            end: Index to stop before (default: after the last catalogued one)
+
+        Yields:
+            CatalogueNGram instances, clipped to the catalogued range
+        """
+        indices = self.index_range(key)
+        start = indices.start if start is None else max(start, indices.start)
+        end = indices.stop if end is None else min(end, indices.stop)
+        for index in range(start, end):
+            yield self.get(key, index)
+
+    def close(self) -> None:
+        """Unmap the file, unless views into it are still alive"""
+        self._buffer.release()
+        try:
+            self._map.close()
+        except BufferError:
+            pass
+
+    def __enter__(self) -> 'PatternCatalogue':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"PatternCatalogue({self.path!r})"
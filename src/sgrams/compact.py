@@ -0,0 +1,378 @@
+"""
+Compact N-Gram representation.
+
+SGram and the NGramBase families keep their patterns as dicts of Python
+int lists, which costs roughly 36 bytes per state. This module provides
+frozen, slotted counterparts that pack every pattern of an N-Gram into
+one unsigned-int array with offsets:
+
+- PackedPatterns: read-only pattern mapping over a single buffer
+- PatternView: zero-copy sequence view of one packed pattern
+- CompactSGram / CompactNGram: frozen N-Grams built on PackedPatterns
+- to_compact(ngram): the compact form of any SGram or NGramBase instance
+
+Range-backed patterns are already compact and are kept as they are, as
+are patterns with states that do not fit in an unsigned 64-bit integer.
+"""
+
+from array import array
+from collections.abc import Mapping, Sequence as SequenceABC
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Sequence, Union, overload
+
+from .ngram_base import NGramBase, PatternKey, PatternRange
+from .sgram import SGram
+
+# Mappings with more patterns than this build a key -> position dict on
+# their first lookup; smaller ones find keys by scanning a tuple
+KEY_INDEX_THRESHOLD = 16
+
+
+def _typecode_for(states: Sequence[int]) -> Optional[str]:
+    """Smallest unsigned array typecode that holds every state, if any"""
+    if not states:
+        return 'I'
+    low, high = min(states), max(states)
+    if low < 0:
+        return None
+    if high < 1 << (8 * array('I').itemsize):
+        return 'I'
+    if high < 1 << 64:
+        return 'Q'
+    return None
+
+
+class PatternView(SequenceABC):
+    """
+    Read-only view of one pattern inside a PackedPatterns buffer.
+
+    No states are copied: indexing reads the shared buffer, and index()
+    and membership use the array's C search over the view's slice.
+    Views compare equal to lists, tuples and ranges with the same states.
+    """
+
+    __slots__ = ('_buffer', '_start', '_stop')
+
+    def __init__(self, buffer: array, start: int, stop: int):
+        """
+        Create a view of buffer[start:stop].
+
+        Args:
+            buffer: The packed state buffer
+            start: Position of the first state
+            stop: Position after the last state
+        """
+        self._buffer = buffer
+        self._start = start
+        self._stop = stop
+
+    def __len__(self) -> int:
+        return self._stop - self._start
+
+    @overload
+    def __getitem__(self, position: int) -> int: ...
+
+    @overload
+    def __getitem__(self, position: slice) -> List[int]: ...
+
+    def __getitem__(self, position: Union[int, slice]) -> Union[int, List[int]]:
+        start = self._start
+        if type(position) is int and 0 <= position < self._stop - start:
+            return self._buffer[start + position]
+        if isinstance(position, slice):
+            return memoryview(self._buffer)[self._start:self._stop][position].tolist()
+        length = self._stop - self._start
+        if position < 0:
+            position += length
+        if not 0 <= position < length:
+            raise IndexError("pattern index out of range")
+        return self._buffer[self._start + position]
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(memoryview(self._buffer)[self._start:self._stop])
+
+    def __contains__(self, state: object) -> bool:
+        try:
+            self._buffer.index(state, self._start, self._stop)
+        except (ValueError, TypeError, OverflowError):
+            return False
+        return True
+
+    def index(self, state: int, start: int = 0, stop: Optional[int] = None) -> int:
+        """Position of a state in the pattern"""
+        length = self._stop - self._start
+        start, stop, _ = slice(start, stop).indices(length)
+        try:
+            return self._buffer.index(state, self._start + start, self._start + stop) - self._start
+        except (TypeError, OverflowError):
+            raise ValueError(f"{state} is not in pattern") from None
+
+    def count(self, state: int) -> int:
+        """Number of occurrences of a state"""
+        return self._buffer[self._start:self._stop].count(state)
+
+    def tolist(self) -> List[int]:
+        """Copy the states into a list"""
+        return self._buffer[self._start:self._stop].tolist()
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, PatternView):
+            return self.tolist() == other.tolist()
+        if isinstance(other, (list, tuple, range, PatternRange)):
+            return len(other) == len(self) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"PatternView({self.tolist()!r})"
+
+
+class PackedPatterns(Mapping):
+    """
+    Read-only pattern mapping with every state in one array.
+
+    Pattern i occupies buffer[offsets[i]:offsets[i + 1]]. Lookups return
+    PatternView objects over the shared buffer; range-backed patterns
+    and unpackable ones are returned unchanged. Keys are looked up by a
+    scan of a tuple, which is cheaper to store than a dict and fast for
+    the handful of patterns a typical N-Gram has; mappings with more than
+    KEY_INDEX_THRESHOLD patterns build a position dict when first used.
+    """
+
+    __slots__ = ('_keys', '_positions', '_buffer', '_offsets', '_extras')
+
+    def __init__(self, patterns: Mapping[str, Sequence[int]]):
+        """
+        Pack a pattern mapping.
+
+        Args:
+            patterns: Mapping from divisor keys to state sequences
+        """
+        packable = [
+            sequence for sequence in patterns.values()
+            if not isinstance(sequence, PatternRange)
+        ]
+        typecodes = {_typecode_for(sequence) for sequence in packable}
+        typecode = 'Q' if 'Q' in typecodes else 'I'
+
+        buffer = array(typecode)
+        offsets = array('I', [0])
+        extras = {}
+        for i, sequence in enumerate(patterns.values()):
+            if isinstance(sequence, PatternRange) or _typecode_for(sequence) is None:
+                extras[i] = sequence
+            else:
+                buffer.extend(sequence)
+            offsets.append(len(buffer))
+
+        self._keys = tuple(PatternKey(key) for key in patterns)
+        self._positions: Optional[Dict[str, int]] = None
+        self._buffer = buffer if buffer else None
+        self._offsets = offsets if buffer else None
+        self._extras = extras or None
+
+    def _view(self, i: int) -> Sequence[int]:
+        """Sequence for the i-th pattern"""
+        if self._extras is not None and i in self._extras:
+            return self._extras[i]
+        if self._buffer is None:
+            return []
+        return PatternView(self._buffer, self._offsets[i], self._offsets[i + 1])
+
+    def _key_positions(self) -> Optional[Dict[str, int]]:
+        """Key -> position dict for large mappings, None for small ones"""
+        if self._positions is None and len(self._keys) > KEY_INDEX_THRESHOLD:
+            self._positions = {key: i for i, key in enumerate(self._keys)}
+        return self._positions
+
+    def __getitem__(self, key: str) -> Sequence[int]:
+        positions = self._key_positions()
+        if positions is not None:
+            i = positions.get(key)
+            if i is None:
+                raise KeyError(key)
+            return self._view(i)
+        try:
+            i = self._keys.index(key)
+        except ValueError:
+            raise KeyError(key) from None
+        return self._view(i)
+
+    def __contains__(self, key: object) -> bool:
+        positions = self._key_positions()
+        if positions is not None:
+            return key in positions
+        return key in self._keys
+
+    def __iter__(self) -> Iterator[PatternKey]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def values(self):
+        """Views of all patterns, in order"""
+        return [self._view(i) for i in range(len(self._keys))]
+
+    def items(self):
+        """(key, view) pairs for all patterns, in order"""
+        return [(key, self._view(i)) for i, key in enumerate(self._keys)]
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes used by the packed state buffer and offsets"""
+        if self._buffer is None:
+            return 0
+        return (len(self._buffer) * self._buffer.itemsize +
+                len(self._offsets) * self._offsets.itemsize)
+
+    def __repr__(self) -> str:
+        return f"PackedPatterns({dict(self.items())!r})"
+
+
+class FrozenDict(Mapping):
+    """
+    Read-only copy of a small dict, such as an N-Gram's formula_parts.
+
+    Cached instances are shared by every caller, so their mappings must
+    not be writable. Unlike types.MappingProxyType this holds its own
+    copy and can be pickled.
+    """
+
+    __slots__ = ('_data',)
+
+    def __init__(self, data: Mapping[str, int]):
+        self._data = dict(data)
+
+    def __getitem__(self, key: str) -> int:
+        return self._data[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __repr__(self) -> str:
+        return f"FrozenDict({self._data!r})"
+
+
+@dataclass(frozen=True, slots=True)
+class CompactSGram:
+    """
+    Frozen, slotted S-Gram with packed patterns.
+
+    Has the same attributes and accessors as SGram; fraction_patterns and
+    additional_factors are PackedPatterns, so get_state_sequence and
+    get_all_patterns return views over one shared buffer, and
+    formula_parts is a read-only FrozenDict.
+    """
+    index: int
+    catalan_number: int
+    numerator: int
+    denominator: int
+    symbolic_notation: str
+    transformation: str
+    formula_parts: FrozenDict
+    fraction_patterns: PackedPatterns
+    additional_factors: PackedPatterns
+
+    symbol = SGram.symbol
+    fraction = SGram.fraction
+    formula = SGram.formula
+    _gcd = SGram._gcd
+    get_state_sequence = SGram.get_state_sequence
+    get_all_patterns = SGram.get_all_patterns
+    __str__ = SGram.__str__
+
+    @classmethod
+    def from_sgram(cls, sgram: SGram) -> 'CompactSGram':
+        """Pack an SGram"""
+        return cls(
+            index=sgram.index,
+            catalan_number=sgram.catalan_number,
+            numerator=sgram.numerator,
+            denominator=sgram.denominator,
+            symbolic_notation=sgram.symbolic_notation,
+            transformation=sgram.transformation,
+            formula_parts=FrozenDict(sgram.formula_parts),
+            fraction_patterns=PackedPatterns(sgram.fraction_patterns),
+            additional_factors=PackedPatterns(sgram.additional_factors),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class CompactNGram:
+    """
+    Frozen, slotted N-Gram of any NGramBase family, with packed patterns.
+
+    The family class is kept so symbol, formula, compute_value, str()
+    and any other public methods come from the family's own definitions.
+    Patterns are PackedPatterns and formula_parts is a read-only FrozenDict.
+
+    Attributes:
+        family: The NGramBase subclass this N-Gram was packed from
+    """
+    family: type
+    index: int
+    sequence_value: int
+    formula_parts: FrozenDict
+    fraction_patterns: PackedPatterns
+    additional_factors: PackedPatterns
+
+    _gcd = NGramBase._gcd
+    get_state_sequence = NGramBase.get_state_sequence
+    get_all_patterns = NGramBase.get_all_patterns
+
+    @property
+    def symbol(self) -> str:
+        """Returns the family's symbolic notation"""
+        return self.family.symbol.fget(self)
+
+    @property
+    def formula(self) -> str:
+        """Returns the family's formula string"""
+        return self.family.formula.fget(self)
+
+    def compute_value(self, n: int) -> int:
+        """Compute the family's value for index n"""
+        return self.family.compute_value(self, n)
+
+    def __str__(self) -> str:
+        return self.family.__str__(self)
+
+    def __getattr__(self, name: str):
+        """Bind the family's other methods, e.g. NGram2DCatalan.iter_trees"""
+        if not name.startswith('_'):
+            method = getattr(self.family, name, None)
+            if callable(method):
+                return method.__get__(self)
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+    @classmethod
+    def from_ngram(cls, ngram: NGramBase) -> 'CompactNGram':
+        """Pack an N-Gram of any NGramBase family"""
+        return cls(
+            family=type(ngram),
+            index=ngram.index,
+            sequence_value=ngram.sequence_value,
+            formula_parts=FrozenDict(ngram.formula_parts),
+            fraction_patterns=PackedPatterns(ngram.fraction_patterns),
+            additional_factors=PackedPatterns(ngram.additional_factors),
+        )
+
+
+def to_compact(ngram: Union[SGram, NGramBase]) -> Union[CompactSGram, CompactNGram]:
+    """
+    Pack an SGram or NGramBase instance into its compact form.
+
+    Args:
+        ngram: The N-Gram to pack
+
+    Returns:
+        CompactSGram for S-Grams, CompactNGram for every other family
+    """
+    if isinstance(ngram, SGram):
+        return CompactSGram.from_sgram(ngram)
+    return CompactNGram.from_ngram(ngram)
@@ -0,0 +1,346 @@
+"""
+Machine-readable exports of N-Gram patterns and transition tables.
+
+The markdown exports in table_generator are meant for people; these
+stream the same patterns in forms other programs load directly:
+
+- JSON Lines: one object per pattern with its states, or with
+  [start, stop, step] for range-backed patterns
+- CSV: one (family, index, divisor, additional, position, state, next,
+  prev) row per state, where next and prev are the states the pattern
+  resolves and informs to, i.e. the transition table, and additional is
+  1 for additional factors (the same divisor can be both a primary
+  pattern and an additional factor of one N-Gram)
+- NPZ: the CSV columns as NumPy arrays, plus a 'families' array of type
+  keys that the 'family' column indexes
+
+N-Grams are built and written one at a time. The NPZ writer spools
+each column to a temporary file and copies it into the archive at the
+end, so memory use stays flat for every format; NumPy is not needed to
+write it. CSV and NPZ expand every state, so patterns longer than
+max_cycle_length (default MAX_CYCLE_LENGTH) are left out of them.
+
+    >>> import io
+    >>> from sgrams.exporters import write_csv
+    >>> out = io.StringIO()
+    >>> write_csv(out, ['2nd'], 3, 4)
+    >>> print(out.getvalue().splitlines()[:3])
+    ['family,index,divisor,additional,position,state,next,prev', '2nd,3,1/7,0,0,1,4,7', '2nd,3,1/7,0,1,4,2,1']
+"""
+
+import csv
+import json
+import os
+import struct
+import sys
+import tempfile
+import zipfile
+from array import array
+from typing import IO, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .ngram_base import PatternKey, PatternRange
+
+# Export formats accepted by the CLI, with their file extensions
+EXPORT_FORMATS = {
+    'markdown': 'md',
+    'jsonl': 'jsonl',
+    'csv': 'csv',
+    'npz': 'npz',
+}
+
+# Longest pattern whose states CSV and NPZ exports expand
+MAX_CYCLE_LENGTH = 1_000_000
+
+# Column names and NumPy dtypes of the transition table
+TRANSITION_COLUMNS = ('family', 'index', 'divisor', 'additional', 'position', 'state', 'next', 'prev')
+NPZ_COLUMNS = (
+    ('family', 'i', '<i4'),
+    ('index', 'q', '<i8'),
+    ('numerator', 'q', '<i8'),
+    ('denominator', 'q', '<i8'),
+    ('additional', 'B', '|u1'),
+    ('position', 'q', '<i8'),
+    ('state', 'Q', '<u8'),
+    ('next', 'Q', '<u8'),
+    ('prev', 'Q', '<u8'),
+)
+
+# Rows an NPZ column buffers before spooling them to its temporary file
+_SPOOL_ROWS = 65_536
+
+# .npy headers are padded so the data starts on this boundary
+_NPY_ALIGNMENT = 64
+
+
+def iter_patterns(families: Iterable[str], start: int = 0,
+                  end: int = 12) -> Iterator[Tuple[str, object, PatternKey, bool, Sequence[int]]]:
+    """
+    Iterate over every pattern of N-Gram families.
+
+    Args:
+        families: Registry type keys
+        start: Starting index (inclusive)
+        end: Ending index (exclusive)
+
+    Yields:
+        (type key, N-Gram, divisor, is additional factor, states)
+
+    Raises:
+        KeyError: If a type key is unknown
+    """
+    from .registry import registry
+
+    for key in families:
+        for ngram in registry.get_family(key).iter_range(start, end):
+            for additional, patterns in enumerate((ngram.fraction_patterns,
+                                                   ngram.additional_factors)):
+                for divisor, states in patterns.items():
+                    yield key, ngram, PatternKey(divisor), bool(additional), states
+
+
+def pattern_record(divisor: str, additional: bool, states: Sequence[int]) -> dict:
+    """
+    JSON-ready description of one pattern.
+
+    Args:
+        divisor: The pattern's divisor key
+        additional: Whether the pattern is an additional factor
+        states: The pattern's states
+
+    Returns:
+        Dictionary with divisor, additional and cycle_length, and either
+        states or, for range-backed patterns, range as [start, stop, step]
+    """
+    record = {'divisor': str(divisor), 'additional': additional}
+    if isinstance(states, PatternRange):
+        r = states.as_range()
+        record['cycle_length'] = states.size
+        record['range'] = [r.start, r.stop, r.step]
+    else:
+        record['cycle_length'] = len(states)
+        record['states'] = list(states)
+    return record
+
+
+def iter_jsonl_lines(families: Iterable[str], start: int = 0, end: int = 12) -> Iterator[str]:
+    """
+    Iterate over JSON Lines records, one per pattern.
+
+    Each record holds family, index, symbol, divisor, additional and
+    cycle_length, and either states or, for range-backed patterns, range
+    as [start, stop, step].
+
+    Args:
+        families: Registry type keys
+        start: Starting index (inclusive)
+        end: Ending index (exclusive)
+
+    Yields:
+        One JSON document per line, without newlines
+    """
+    for key, ngram, divisor, additional, states in iter_patterns(families, start, end):
+        record = {'family': key, 'index': ngram.index, 'symbol': ngram.symbol}
+        record.update(pattern_record(divisor, additional, states))
+        yield json.dumps(record)
+
+
+def _pattern_size(states: Sequence[int]) -> int:
+    """Number of states, even for ranges past len()'s limit"""
+    return states.size if isinstance(states, PatternRange) else len(states)
+
+
+def iter_transition_rows(families: Iterable[str], start: int = 0, end: int = 12,
+                         max_cycle_length: Optional[int] = MAX_CYCLE_LENGTH
+                         ) -> Iterator[Tuple[str, int, PatternKey, int, int, int, int, int]]:
+    """
+    Iterate over transition table rows, one per state of each pattern.
+
+    Args:
+        families: Registry type keys
+        start: Starting index (inclusive)
+        end: Ending index (exclusive)
+        max_cycle_length: Skip longer patterns (None: expand every pattern)
+
+    Yields:
+        (family, index, divisor, additional, position, state, next, prev)
+        tuples, additional being 1 for additional factors and 0 otherwise
+    """
+    for key, ngram, divisor, additional, states in iter_patterns(families, start, end):
+        length = _pattern_size(states)
+        if not length or (max_cycle_length is not None and length > max_cycle_length):
+            continue
+        index = ngram.index
+        additional = int(additional)
+        remaining = iter(states)
+        first = previous = next(remaining)
+        prev = states[-1]
+        position = 0
+        for state in remaining:
+            yield key, index, divisor, additional, position, previous, state, prev
+            prev, previous = previous, state
+            position += 1
+        yield key, index, divisor, additional, position, previous, first, prev
+
+
+def write_jsonl(file: IO[str], families: Iterable[str], start: int = 0, end: int = 12) -> None:
+    """
+    Write JSON Lines records of every pattern to an open text file.
+
+    Args:
+        file: Open text file
+        families: Registry type keys
+        start: Starting index (inclusive)
+        end: Ending index (exclusive)
+    """
+    for line in iter_jsonl_lines(families, start, end):
+        file.write(line)
+        file.write('\n')
+
+
+def write_csv(file: IO[str], families: Iterable[str], start: int = 0, end: int = 12,
+              max_cycle_length: Optional[int] = MAX_CYCLE_LENGTH) -> None:
+    """
+    Write the transition table of every pattern to an open CSV file.
+
+    Args:
+        file: Text file opened with newline=''
+        families: Registry type keys
+        start: Starting index (inclusive)
+        end: Ending index (exclusive)
+        max_cycle_length: Skip longer patterns (None: expand every pattern)
+    """
+    writer = csv.writer(file, lineterminator='\n')
+    writer.writerow(TRANSITION_COLUMNS)
+    writer.writerows(iter_transition_rows(families, start, end, max_cycle_length))
+
+
+def _npy_header(dtype: str, count: int) -> bytes:
+    """Version 1.0 .npy header for a one-dimensional array"""
+    header = f"{{'descr': '{dtype}', 'fortran_order': False, 'shape': ({count},), }}"
+    # Magic (6), version (2) and header length (2) precede the header
+    padding = -(10 + len(header) + 1) % _NPY_ALIGNMENT
+    header = (header + ' ' * padding + '\n').encode('latin1')
+    return b'\x93NUMPY\x01\x00' + struct.pack('<H', len(header)) + header
+
+
+class _SpooledColumn:
+    """One NPZ column, buffered in an array and spooled to a temporary file"""
+
+    def __init__(self, name: str, typecode: str, dtype: str, directory: str):
+        self.name = name
+        self.typecode = typecode
+        self.dtype = dtype
+        self.count = 0
+        self._buffer = array(typecode)
+        self._file = open(os.path.join(directory, f'{name}.bin'), 'w+b')
+
+    def append(self, value: int) -> None:
+        try:
+            self._buffer.append(value)
+        except OverflowError:
+            raise ValueError(f"{self.name} value {value} does not fit in {self.dtype}; "
+                             f"export this range as jsonl or csv") from None
+        if len(self._buffer) >= _SPOOL_ROWS:
+            self.flush()
+
+    def flush(self) -> None:
+        if sys.byteorder != 'little':
+            self._buffer.byteswap()
+        self._buffer.tofile(self._file)
+        self.count += len(self._buffer)
+        self._buffer = array(self.typecode)
+
+    def copy_to(self, archive: zipfile.ZipFile) -> None:
+        """Write the column to the archive as <name>.npy"""
+        self.flush()
+        self._file.seek(0)
+        with archive.open(f'{self.name}.npy', 'w', force_zip64=True) as entry:
+            entry.write(_npy_header(self.dtype, self.count))
+            while True:
+                chunk = self._file.read(1 << 20)
+                if not chunk:
+                    break
+                entry.write(chunk)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def write_npz(path: str, families: Iterable[str], start: int = 0, end: int = 12,
+              max_cycle_length: Optional[int] = MAX_CYCLE_LENGTH) -> None:
+    """
+    Write the transition table of every pattern as NPZ columns.
+
+    The archive holds one array per NPZ_COLUMNS entry, all of the same
+    length, and a 'families' array of type keys indexed by 'family';
+    divisors are split into 'numerator' and 'denominator'. Load it with
+    numpy.load(path).
+
+    Args:
+        path: File to write
+        families: Registry type keys
+        start: Starting index (inclusive)
+        end: Ending index (exclusive)
+        max_cycle_length: Skip longer patterns (None: expand every pattern)
+
+    Raises:
+        ValueError: If a value does not fit in its column's dtype
+    """
+    families = list(dict.fromkeys(families))
+    codes = {key: code for code, key in enumerate(families)}
+
+    with tempfile.TemporaryDirectory() as directory:
+        columns: List[_SpooledColumn] = []
+        try:
+            for name, typecode, dtype in NPZ_COLUMNS:
+                columns.append(_SpooledColumn(name, typecode, dtype, directory))
+            family, index, numerator, denominator, additional, position, state, next_, prev = columns
+
+            for row in iter_transition_rows(families, start, end, max_cycle_length):
+                family.append(codes[row[0]])
+                index.append(row[1])
+                numerator.append(row[2].numerator)
+                denominator.append(row[2].denominator)
+                additional.append(row[3])
+                position.append(row[4])
+                state.append(row[5])
+                next_.append(row[6])
+                prev.append(row[7])
+
+            width = max((len(key) for key in families), default=1)
+            names = b''.join(key.encode('utf-32-le').ljust(4 * width, b'\0') for key in families)
+            with zipfile.ZipFile(path, 'w', zipfile.ZIP_STORED, allowZip64=True) as archive:
+                archive.writestr('families.npy', _npy_header(f'<U{width}', len(families)) + names)
+                for column in columns:
+                    column.copy_to(archive)
+        finally:
+            for column in columns:
+                column.close()
+
+
+def write_export(path: str, export_format: str, families: Iterable[str], start: int = 0,
+                 end: int = 12, max_cycle_length: Optional[int] = MAX_CYCLE_LENGTH) -> None:
+    """
+    Write a machine-readable export to a file.
+
+    Args:
+        path: File to write
+        export_format: 'jsonl', 'csv' or 'npz'
+        families: Registry type keys
+        start: Starting index (inclusive)
+        end: Ending index (exclusive)
+        max_cycle_length: Skip longer patterns in CSV and NPZ exports
+
+    Raises:
+        ValueError: If the format is unknown or a value does not fit an NPZ column
+    """
+    if export_format == 'jsonl':
+        with open(path, 'w') as f:
+            write_jsonl(f, families, start, end)
+    elif export_format == 'csv':
+        with open(path, 'w', newline='') as f:
+            write_csv(f, families, start, end, max_cycle_length)
+    elif export_format == 'npz':
+        write_npz(path, families, start, end, max_cycle_length)
+    else:
+        raise ValueError(f"Unknown export format '{export_format}'")
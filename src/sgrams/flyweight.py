@@ -0,0 +1,188 @@
+"""
+Flyweight instance cache for N-Gram factories.
+
+When enabled, every factory method decorated with @flyweight builds each
+(type, index) N-Gram once and then hands out the same frozen instance
+(a CompactSGram or CompactNGram), so repeated create_* / create_range
+calls from table generators, analyzers and the CLI stop rebuilding
+dicts and lists. The cache is opt-in, bounded (least recently used
+entries are evicted), thread-safe, and reports hit/miss statistics.
+
+Enabling the cache changes what the factories return: SGramFactory
+methods return CompactSGram instead of SGram, and the other families'
+factories return CompactNGram instead of their NGram* class. Compact
+instances have the same attributes and accessors but are immutable,
+since every caller shares them: fraction_patterns, additional_factors
+and formula_parts are read-only mappings.
+
+Examples:
+    >>> from sgrams.sgram import SGramFactory
+    >>> from sgrams.flyweight import enable_flyweight_cache
+    >>> cache = enable_flyweight_cache(maxsize=256)
+    >>> SGramFactory.create_sgram(3) is SGramFactory.create_sgram(3)
+    True
+"""
+
+import inspect
+import threading
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable, Hashable, NamedTuple, Optional, TypeVar
+
+# Default number of N-Grams kept when the cache is enabled
+FLYWEIGHT_CACHE_SIZE = 1024
+
+F = TypeVar('F', bound=Callable[..., Any])
+
+
+class CacheInfo(NamedTuple):
+    """Flyweight cache statistics"""
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class FlyweightCache:
+    """
+    Bounded, thread-safe LRU cache of frozen N-Gram instances.
+
+    The lock only guards the LRU dict; builds run outside it, so
+    factories are not serialised. Concurrent misses on one key may each
+    build it, but all callers get the instance stored first.
+    """
+
+    def __init__(self, maxsize: int = FLYWEIGHT_CACHE_SIZE):
+        """
+        Create an empty cache.
+
+        Args:
+            maxsize: Maximum number of instances kept
+        """
+        if maxsize < 1:
+            raise ValueError(f"Cache size must be positive, got {maxsize}")
+        self.maxsize = maxsize
+        self._entries: 'OrderedDict[Hashable, Any]' = OrderedDict()
+        self._lock = threading.RLock()
+        self._hits = 0
+        self._misses = 0
+
+    def get_or_create(self, key: Hashable, build: Callable[[], Any]) -> Any:
+        """
+        Get the instance for a key, building it on the first request.
+
+        Args:
+            key: Cache key, e.g. ('2nd', 3)
+            build: Called without arguments to build a missing instance
+
+        Returns:
+            The shared instance
+        """
+        entries = self._entries
+        with self._lock:
+            if key in entries:
+                self._hits += 1
+                entries.move_to_end(key)
+                return entries[key]
+            self._misses += 1
+
+        instance = build()
+
+        with self._lock:
+            # Keep the instance of a concurrent build that finished first
+            if key in entries:
+                entries.move_to_end(key)
+                return entries[key]
+            entries[key] = instance
+            if len(entries) > self.maxsize:
+                entries.popitem(last=False)
+            return instance
+
+    def info(self) -> CacheInfo:
+        """Get hit/miss statistics"""
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self.maxsize, len(self._entries))
+
+    def clear(self) -> None:
+        """Drop all instances and reset the statistics"""
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+
+
+_cache: Optional[FlyweightCache] = None
+
+
+def enable_flyweight_cache(maxsize: int = FLYWEIGHT_CACHE_SIZE) -> FlyweightCache:
+    """
+    Turn on the flyweight cache for all N-Gram factories.
+
+    From then on the factories return shared, immutable CompactSGram /
+    CompactNGram instances instead of SGram / NGram* dataclasses.
+    Enabling again with a different size starts a new, empty cache.
+
+    Args:
+        maxsize: Maximum number of N-Grams kept
+
+    Returns:
+        The active cache
+    """
+    global _cache
+    if _cache is None or _cache.maxsize != maxsize:
+        _cache = FlyweightCache(maxsize)
+    return _cache
+
+
+def disable_flyweight_cache() -> None:
+    """Turn off the flyweight cache; factories build fresh instances again"""
+    global _cache
+    _cache = None
+
+
+def flyweight_cache_info() -> Optional[CacheInfo]:
+    """Get cache statistics, or None if the cache is disabled"""
+    cache = _cache
+    return cache.info() if cache is not None else None
+
+
+def clear_flyweight_cache() -> None:
+    """Drop all cached N-Grams and reset the statistics"""
+    cache = _cache
+    if cache is not None:
+        cache.clear()
+
+
+def _freeze(ngram: Any) -> Any:
+    """Frozen, shareable form of a freshly built N-Gram"""
+    from .compact import CompactNGram, CompactSGram, to_compact
+
+    if isinstance(ngram, (CompactSGram, CompactNGram)):
+        return ngram
+    return to_compact(ngram)
+
+
+def flyweight(kind: str) -> Callable[[F], F]:
+    """
+    Route a factory method through the flyweight cache.
+
+    The decorated method must take the N-Gram index as its last
+    parameter, given positionally or by keyword. Calls that raise are
+    not cached.
+
+    Args:
+        kind: N-Gram type key, e.g. '2nd' or '3d'
+    """
+    def decorate(create: F) -> F:
+        signature = inspect.signature(create)
+        index_name = list(signature.parameters)[-1]
+
+        @wraps(create)
+        def wrapper(*args, **kwargs):
+            cache = _cache
+            if cache is None:
+                return create(*args, **kwargs)
+            index = signature.bind(*args, **kwargs).arguments[index_name]
+            return cache.get_or_create((kind, index), lambda: _freeze(create(*args, **kwargs)))
+        return wrapper
+    return decorate
@@ -8,6 +8,7 @@ that emerge in S-Grams and their relationships.
 from typing import List, Dict, Tuple, Optional
 from dataclasses import dataclass
 from .sgram import SGram
+from .ngram_base import PatternKey
 
 
 @dataclass
@@ -16,7 +17,7 @@ class FractionPattern:
     Represents a fraction pattern within an S-Gram.
     
     Attributes:
-        divisor: The divisor notation (e.g., '1/3', '2/13')
+        divisor: The divisor notation (e.g., '1/3', '2/13'), interned as a PatternKey
         sequence: The state sequence
         cycle_length: Length of the cycle
         is_primary: Whether this is the primary pattern
@@ -28,15 +29,19 @@ class FractionPattern:
     is_primary: bool = False
     is_additional_factor: bool = False
     
+    def __post_init__(self):
+        """Intern the divisor so its parts are parsed only once"""
+        self.divisor = PatternKey(self.divisor)
+    
     @property
     def numerator(self) -> int:
-        """Extract numerator from divisor string"""
-        return int(self.divisor.split('/')[0])
+        """Numerator of the divisor"""
+        return self.divisor.numerator
     
     @property
     def denominator(self) -> int:
-        """Extract denominator from divisor string"""
-        return int(self.divisor.split('/')[1])
+        """Denominator of the divisor"""
+        return self.divisor.denominator
     
     def contains_state(self, state: int) -> bool:
         """Check if a state is in this pattern's sequence"""
@@ -59,6 +64,12 @@ class FractionPattern:
 class FractionPatternAnalyzer:
     """
     Analyzes fraction patterns across S-Grams.
+    
+    An inverted index (state -> sorted pattern ids, plus occurrence counts)
+    is built once at construction, so distribution, uniqueness, overlap
+    and summary queries are linear in the total pattern size rather than
+    scanning every pattern per state. A pattern id is the pattern's
+    position in self.patterns.
     """
     
     def __init__(self, sgram: SGram):
@@ -70,6 +81,10 @@ class FractionPatternAnalyzer:
         """
         self.sgram = sgram
         self.patterns = self._extract_patterns()
+        self._divisor_ids: Dict[str, int] = {}
+        for pattern_id, pattern in enumerate(self.patterns):
+            self._divisor_ids.setdefault(pattern.divisor, pattern_id)
+        self._state_index, self._state_counts = self._build_state_index()
     
     def _extract_patterns(self) -> List[FractionPattern]:
         """Extract all fraction patterns from the S-Gram"""
@@ -95,6 +110,31 @@ class FractionPatternAnalyzer:
         
         return patterns
     
+    def _build_state_index(self) -> Tuple[Dict[int, List[int]], Dict[int, int]]:
+        """
+        Build the inverted state index.
+        
+        Returns:
+            (index, counts) where index maps state -> sorted ids of the
+            patterns containing it, and counts maps state -> number of
+            occurrences across all patterns
+        """
+        index: Dict[int, List[int]] = {}
+        counts: Dict[int, int] = {}
+        for pattern_id, pattern in enumerate(self.patterns):
+            for state in pattern.sequence:
+                pattern_ids = index.get(state)
+                if pattern_ids is None:
+                    index[state] = [pattern_id]
+                elif pattern_ids[-1] != pattern_id:
+                    pattern_ids.append(pattern_id)
+                counts[state] = counts.get(state, 0) + 1
+        return index, counts
+    
+    def get_pattern_ids(self, state: int) -> List[int]:
+        """Get the sorted ids of the patterns containing a state"""
+        return list(self._state_index.get(state, ()))
+    
     def get_primary_pattern(self) -> Optional[FractionPattern]:
         """Get the primary fraction pattern"""
         for pattern in self.patterns:
@@ -104,21 +144,16 @@ class FractionPatternAnalyzer:
     
     def get_patterns_containing_state(self, state: int) -> List[FractionPattern]:
         """Get all patterns that contain a specific state"""
-        return [p for p in self.patterns if p.contains_state(state)]
+        return [self.patterns[i] for i in self._state_index.get(state, ())]
     
     def get_pattern_by_divisor(self, divisor: str) -> Optional[FractionPattern]:
         """Get a pattern by its divisor notation"""
-        for pattern in self.patterns:
-            if pattern.divisor == divisor:
-                return pattern
-        return None
+        pattern_id = self._divisor_ids.get(divisor)
+        return self.patterns[pattern_id] if pattern_id is not None else None
     
     def get_all_states(self) -> set:
         """Get all unique states across all patterns"""
-        states = set()
-        for pattern in self.patterns:
-            states.update(pattern.sequence)
-        return states
+        return set(self._state_index)
     
     def get_pattern_overlap(self, divisor1: str, divisor2: str) -> List[int]:
         """
@@ -131,16 +166,16 @@ class FractionPatternAnalyzer:
         Returns:
             List of states that appear in both patterns
         """
-        pattern1 = self.get_pattern_by_divisor(divisor1)
-        pattern2 = self.get_pattern_by_divisor(divisor2)
+        id1 = self._divisor_ids.get(divisor1)
+        id2 = self._divisor_ids.get(divisor2)
         
-        if not pattern1 or not pattern2:
+        if id1 is None or id2 is None:
             return []
         
-        set1 = set(pattern1.sequence)
-        set2 = set(pattern2.sequence)
-        
-        return sorted(set1 & set2)
+        return sorted(
+            state for state in set(self.patterns[id1].sequence)
+            if id2 in self._state_index[state]
+        )
     
     def analyze_cycle_relationships(self) -> Dict[str, any]:
         """
@@ -176,11 +211,7 @@ class FractionPatternAnalyzer:
         Returns:
             Dictionary mapping state -> number of patterns containing it
         """
-        distribution = {}
-        for pattern in self.patterns:
-            for state in pattern.sequence:
-                distribution[state] = distribution.get(state, 0) + 1
-        return distribution
+        return dict(self._state_counts)
     
     def find_unique_states(self) -> Dict[str, List[int]]:
         """
@@ -189,21 +220,15 @@ class FractionPatternAnalyzer:
         Returns:
             Dictionary mapping divisor -> list of unique states
         """
-        unique = {}
-        all_states = [set(p.sequence) for p in self.patterns]
+        # States whose only pattern is this one
+        unique_by_id: List[List[int]] = [[] for _ in self.patterns]
+        for state, pattern_ids in self._state_index.items():
+            if len(pattern_ids) == 1:
+                unique_by_id[pattern_ids[0]].append(state)
         
-        for i, pattern in enumerate(self.patterns):
-            # States in this pattern
-            pattern_states = set(pattern.sequence)
-            
-            # States in all other patterns
-            other_states = set()
-            for j, other_set in enumerate(all_states):
-                if i != j:
-                    other_states.update(other_set)
-            
-            # Unique to this pattern
-            unique[pattern.divisor] = sorted(pattern_states - other_states)
+        unique = {}
+        for pattern, states in zip(self.patterns, unique_by_id):
+            unique[pattern.divisor] = sorted(states)
         
         return unique
     
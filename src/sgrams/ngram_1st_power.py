@@ -13,7 +13,8 @@ Applications:
 
 from typing import Dict, List
 from dataclasses import dataclass
-from .ngram_base import NGramBase
+from .ngram_base import NGramBase, PatternRange
+from .flyweight import flyweight
 
 
 @dataclass
@@ -70,6 +71,7 @@ class NGram1stPowerFactory:
     """Factory class for creating 1st Power N-Gram instances"""
     
     @staticmethod
+    @flyweight('1st')
     def create_ngram_1st(index: int) -> NGram1stPower:
         """
         Create a 1st Power N-Gram for the given index.
@@ -85,7 +87,7 @@ class NGram1stPowerFactory:
         # For 1st power, patterns are very simple
         # The value itself forms a trivial cycle
         fraction_patterns = {
-            f'1/{value}': list(range(1, value + 1))
+            f'1/{value}': PatternRange(1, value + 1)
         }
         
         return NGram1stPower(
@@ -14,9 +14,12 @@ Applications:
 - Hierarchical department structures
 """
 
-from typing import Dict, List
+from typing import Dict, Iterator, List, Sequence
 from dataclasses import dataclass
-from .ngram_base import NGramBase
+from .ngram_base import NGramBase, PatternRange, format_states
+from .flyweight import flyweight
+from .sequences import rooted_trees_count, rooted_trees_sequence
+from .trees import iter_rooted_trees
 
 
 @dataclass
@@ -42,10 +45,20 @@ class NGram2DCatalan(NGramBase):
         """
         Compute the number of rooted trees with n nodes (OEIS A000081).
         
-        This uses a recursive formula based on the generating function.
-        For practical purposes, we use precomputed values for n <= 20.
+        This uses the Euler-transform recurrence of the generating function,
+        so any n is supported.
         """
-        return NGram2DCatalanFactory.A000081_SEQUENCE[n] if n < len(NGram2DCatalanFactory.A000081_SEQUENCE) else 0
+        return rooted_trees_count(n)
+    
+    def iter_trees(self) -> Iterator[List[int]]:
+        """
+        Iterate over the rooted trees this N-Gram counts.
+        
+        Yields:
+            Canonical level sequences of the index-node trees, in one list
+            updated in place (see trees.iter_rooted_trees)
+        """
+        return iter_rooted_trees(self.index)
     
     def __str__(self) -> str:
         """String representation of the 2D Catalan N-Gram"""
@@ -62,12 +75,12 @@ class NGram2DCatalan(NGramBase):
         if self.fraction_patterns:
             lines.append("\nHierarchy Patterns:")
             for divisor, pattern in self.fraction_patterns.items():
-                lines.append(f"  {divisor} | {' '.join(map(str, pattern))}")
+                lines.append(f"  {divisor} | {format_states(pattern)}")
         
         if self.additional_factors:
             lines.append("\nStructural Factors:")
             for divisor, pattern in self.additional_factors.items():
-                lines.append(f"  {divisor} | {' '.join(map(str, pattern))}")
+                lines.append(f"  {divisor} | {format_states(pattern)}")
         
         return "\n".join(lines)
 
@@ -77,6 +90,7 @@ class NGram2DCatalanFactory:
     
     # OEIS A000081: Number of rooted trees with n nodes
     # https://oeis.org/A000081
+    # Reference values; counts are computed by sequences.rooted_trees_count
     A000081_SEQUENCE = [
         0,      # n=0 (conventionally 0, some sources use 1)
         1,      # n=1
@@ -102,12 +116,13 @@ class NGram2DCatalanFactory:
     ]
     
     @staticmethod
-    def _generate_tree_patterns(index: int, tree_count: int) -> Dict[str, List[int]]:
+    def _generate_tree_patterns(index: int, tree_count: int) -> Dict[str, Sequence[int]]:
         """
         Generate hierarchy patterns for rooted trees.
         
         These patterns represent different ways to traverse or organize
-        the hierarchical structure.
+        the hierarchical structure. Patterns are range-backed, since tree counts
+        grow exponentially with the index.
         """
         patterns = {}
         
@@ -116,7 +131,7 @@ class NGram2DCatalanFactory:
         
         # Primary pattern: all possible tree structures
         if tree_count > 0:
-            patterns[f'1/{tree_count}'] = list(range(1, tree_count + 1))
+            patterns[f'1/{tree_count}'] = PatternRange(1, tree_count + 1)
         
         # For indices that have interesting factorizations
         # we add patterns for sub-hierarchies
@@ -129,25 +144,26 @@ class NGram2DCatalanFactory:
             
             for factor in factors[:3]:  # Limit to first 3 factors
                 step = tree_count // factor
-                patterns[f'{factor}/{tree_count}'] = list(range(factor, tree_count + 1, step))
+                patterns[f'{factor}/{tree_count}'] = PatternRange(factor, tree_count + 1, step)
         
         return patterns
     
     @staticmethod
+    @flyweight('2d')
     def create_ngram_2d_catalan(index: int) -> NGram2DCatalan:
         """
         Create a 2D Catalan N-Gram (Rooted Tree) for the given index.
         
         Args:
-            index: The N-Gram index (0-20 supported)
+            index: The N-Gram index (any non-negative integer)
             
         Returns:
             NGram2DCatalan instance
         """
-        if index >= len(NGram2DCatalanFactory.A000081_SEQUENCE):
-            raise ValueError(f"Index {index} exceeds supported range (0-{len(NGram2DCatalanFactory.A000081_SEQUENCE)-1})")
+        if index < 0:
+            raise ValueError(f"Index must be non-negative, got {index}")
         
-        tree_count = NGram2DCatalanFactory.A000081_SEQUENCE[index]
+        tree_count = rooted_trees_count(index)
         fraction_patterns = NGram2DCatalanFactory._generate_tree_patterns(index, tree_count)
         
         # Additional factors represent structural properties
@@ -178,8 +194,7 @@ class NGram2DCatalanFactory:
         Returns:
             List of NGram2DCatalan instances
         """
-        max_idx = min(end, len(cls.A000081_SEQUENCE))
-        return [cls.create_ngram_2d_catalan(i) for i in range(start, max_idx)]
+        return [cls.create_ngram_2d_catalan(i) for i in range(start, end)]
 
 
 def get_rooted_trees_sequence(max_n: int = 20) -> List[int]:
@@ -197,4 +212,4 @@ def get_rooted_trees_sequence(max_n: int = 20) -> List[int]:
         >>> seq[:6]
         [0, 1, 1, 2, 4, 9]
     """
-    return NGram2DCatalanFactory.A000081_SEQUENCE[:max_n + 1]
+    return rooted_trees_sequence(max_n)
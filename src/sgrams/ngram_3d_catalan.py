@@ -15,9 +15,12 @@ Applications:
 - Symmetric organizational patterns
 """
 
-from typing import Dict, List, Set
+from typing import Dict, Iterator, List, Sequence, Set
 from dataclasses import dataclass
-from .ngram_base import NGramBase
+from .ngram_base import NGramBase, PatternRange, format_states
+from .flyweight import flyweight
+from .sequences import unlabeled_trees_count, unlabeled_trees_sequence
+from .trees import iter_free_trees
 
 
 @dataclass
@@ -43,10 +46,23 @@ class NGram3DCatalan(NGramBase):
         """
         Compute the number of unlabeled trees with n nodes (OEIS A000055).
         
-        This accounts for symmetry via the flip transform.
-        For practical purposes, we use precomputed values for n <= 20.
+        This accounts for symmetry via the flip transform, using Otter's
+        formula on the rooted-tree counts, so any n is supported.
         """
-        return NGram3DCatalanFactory.A000055_SEQUENCE[n] if n < len(NGram3DCatalanFactory.A000055_SEQUENCE) else 0
+        return unlabeled_trees_count(n)
+    
+    def iter_trees(self, parents: bool = False) -> Iterator[List[int]]:
+        """
+        Iterate over the unlabeled trees this N-Gram counts.
+        
+        Args:
+            parents: Whether to yield parent arrays instead of level sequences
+        
+        Yields:
+            Each index-node tree rooted at its center, in one list updated
+            in place (see trees.iter_free_trees)
+        """
+        return iter_free_trees(self.index, parents)
     
     def __str__(self) -> str:
         """String representation of the 3D Catalan N-Gram"""
@@ -64,12 +80,12 @@ class NGram3DCatalan(NGramBase):
         if self.fraction_patterns:
             lines.append("\nSymmetric Network Patterns:")
             for divisor, pattern in self.fraction_patterns.items():
-                lines.append(f"  {divisor} | {' '.join(map(str, pattern))}")
+                lines.append(f"  {divisor} | {format_states(pattern)}")
         
         if self.additional_factors:
             lines.append("\nSymmetry Factors:")
             for divisor, pattern in self.additional_factors.items():
-                lines.append(f"  {divisor} | {' '.join(map(str, pattern))}")
+                lines.append(f"  {divisor} | {format_states(pattern)}")
         
         return "\n".join(lines)
 
@@ -99,8 +115,9 @@ class FlipTransform:
             Canonical form of the pattern under flip
         """
         # Simple flip: reverse and return minimum lexicographic order
-        reversed_pattern = list(reversed(pattern))
-        return min(pattern, reversed_pattern)
+        forward_pattern = list(pattern)
+        reversed_pattern = forward_pattern[::-1]
+        return min(forward_pattern, reversed_pattern)
     
     @staticmethod
     def cluster_by_symmetry(patterns: List[List[int]]) -> Dict[str, List[List[int]]]:
@@ -129,6 +146,7 @@ class NGram3DCatalanFactory:
     
     # OEIS A000055: Number of unlabeled trees with n nodes
     # https://oeis.org/A000055
+    # Reference values; counts are computed by sequences.unlabeled_trees_count
     A000055_SEQUENCE = [
         1,      # n=0 (empty tree)
         1,      # n=1
@@ -154,12 +172,13 @@ class NGram3DCatalanFactory:
     ]
     
     @staticmethod
-    def _generate_symmetric_patterns(index: int, tree_count: int) -> Dict[str, List[int]]:
+    def _generate_symmetric_patterns(index: int, tree_count: int) -> Dict[str, Sequence[int]]:
         """
         Generate symmetric network patterns for unlabeled trees.
         
         These patterns account for symmetry and represent different
-        ways to organize symmetric team structures.
+        ways to organize symmetric team structures. Patterns are range-backed,
+        since tree counts grow exponentially with the index.
         """
         patterns = {}
         
@@ -169,7 +188,7 @@ class NGram3DCatalanFactory:
         
         # Primary pattern: all symmetric structures
         if tree_count > 0:
-            patterns[f'1/{tree_count}'] = list(range(1, tree_count + 1))
+            patterns[f'1/{tree_count}'] = PatternRange(1, tree_count + 1)
         
         # For symmetric structures, we often have fewer patterns
         # due to equivalence under flip transform
@@ -178,25 +197,26 @@ class NGram3DCatalanFactory:
             half = (tree_count + 1) // 2
             if half > 1:
                 # Pattern representing symmetric pairs
-                patterns[f'1/{half}'] = list(range(1, tree_count + 1, 2))
+                patterns[f'1/{half}'] = PatternRange(1, tree_count + 1, 2)
         
         return patterns
     
     @staticmethod
+    @flyweight('3d')
     def create_ngram_3d_catalan(index: int) -> NGram3DCatalan:
         """
         Create a 3D Catalan N-Gram (Unlabeled Tree) for the given index.
         
         Args:
-            index: The N-Gram index (0-20 supported)
+            index: The N-Gram index (any non-negative integer)
             
         Returns:
             NGram3DCatalan instance
         """
-        if index >= len(NGram3DCatalanFactory.A000055_SEQUENCE):
-            raise ValueError(f"Index {index} exceeds supported range (0-{len(NGram3DCatalanFactory.A000055_SEQUENCE)-1})")
+        if index < 0:
+            raise ValueError(f"Index must be non-negative, got {index}")
         
-        tree_count = NGram3DCatalanFactory.A000055_SEQUENCE[index]
+        tree_count = unlabeled_trees_count(index)
         fraction_patterns = NGram3DCatalanFactory._generate_symmetric_patterns(index, tree_count)
         
         # Additional factors represent symmetry properties
@@ -230,8 +250,7 @@ class NGram3DCatalanFactory:
         Returns:
             List of NGram3DCatalan instances
         """
-        max_idx = min(end, len(cls.A000055_SEQUENCE))
-        return [cls.create_ngram_3d_catalan(i) for i in range(start, max_idx)]
+        return [cls.create_ngram_3d_catalan(i) for i in range(start, end)]
 
 
 def get_unlabeled_trees_sequence(max_n: int = 20) -> List[int]:
@@ -249,4 +268,4 @@ def get_unlabeled_trees_sequence(max_n: int = 20) -> List[int]:
         >>> seq[:6]
         [1, 1, 1, 1, 2, 3]
     """
-    return NGram3DCatalanFactory.A000055_SEQUENCE[:max_n + 1]
+    return unlabeled_trees_sequence(max_n)
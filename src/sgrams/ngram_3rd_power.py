@@ -12,9 +12,10 @@ Applications:
 - Hierarchical depth encoding
 """
 
-from typing import Dict, List
+from typing import Dict, List, Sequence
 from dataclasses import dataclass
-from .ngram_base import NGramBase
+from .ngram_base import NGramBase, PatternRange
+from .flyweight import flyweight
 
 
 @dataclass
@@ -74,12 +75,14 @@ class NGram3rdPowerFactory:
     """Factory class for creating 3rd Power N-Gram instances"""
     
     @staticmethod
-    def _generate_cubic_patterns(index: int, value: int) -> Dict[str, List[int]]:
+    def _generate_cubic_patterns(index: int, value: int) -> Dict[str, Sequence[int]]:
         """
         Generate fraction patterns for cubic N-Grams.
         
         For cubic patterns, we create patterns based on the cube structure.
         The patterns are more complex than linear but follow deterministic rules.
+        Each pattern is an arithmetic progression, so it is stored as a
+        range-backed PatternRange rather than a materialized list.
         """
         patterns = {}
         
@@ -90,22 +93,23 @@ class NGram3rdPowerFactory:
         # Generate pattern based on divisors of the expansion
         if expansion > 1:
             # Primary cycle includes all states
-            patterns[f'1/{expansion}'] = list(range(1, expansion + 1))
+            patterns[f'1/{expansion}'] = PatternRange(1, expansion + 1)
         
         # Add patterns for perfect cube factors
         base = 1 + index
         if base > 1:
             # Pattern for the base value
-            patterns[f'1/{base}'] = list(range(1, base + 1))
+            patterns[f'1/{base}'] = PatternRange(1, base + 1)
             
             # Pattern for base squared
             base_sq = base ** 2
             if base_sq != expansion:
-                patterns[f'1/{base_sq}'] = list(range(1, base_sq + 1, base))
+                patterns[f'1/{base_sq}'] = PatternRange(1, base_sq + 1, base)
         
         return patterns
     
     @staticmethod
+    @flyweight('3rd')
     def create_ngram_3rd(index: int) -> NGram3rdPower:
         """
         Create a 3rd Power N-Gram for the given index.
@@ -9,9 +9,253 @@ This module provides the foundation for all N-Gram types including:
 - 3D Catalan (Trees - OEIS A000055)
 """
 
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Mapping, Optional, Sequence, Tuple, Union, overload
+from collections.abc import Sequence as SequenceABC
 from dataclasses import dataclass, field
 from abc import ABC, abstractmethod
+from fractions import Fraction
+import weakref
+
+
+class PatternKey(str):
+    """
+    Interned, pre-parsed divisor key such as '2/13'.
+    
+    A PatternKey is a str, so it hashes and compares equal to the plain
+    'a/b' string and pattern dicts keyed by it still accept string
+    lookups. The numerator and denominator are parsed once, the string
+    hash is computed once and cached, each distinct key in use exists only
+    once in memory, and keys order numerically by the value of the
+    fraction (ties broken by denominator) rather than lexicographically.
+    
+    The intern table holds keys weakly, so keys no pattern dict uses any
+    more are freed. Plain 'a/b' strings are ordered against keys by value
+    too, from either side of the comparison; ordering a key against any
+    other string raises TypeError.
+    
+    Attributes:
+        numerator: Integer numerator of the key
+        denominator: Integer denominator of the key
+    """
+    
+    _interned: 'weakref.WeakValueDictionary[str, PatternKey]' = weakref.WeakValueDictionary()
+    
+    numerator: int
+    denominator: int
+    _sort_key: Tuple[float, Union[Fraction, float], int]
+    
+    def __new__(cls, key: str) -> 'PatternKey':
+        if type(key) is cls:
+            return key
+        interned = cls._interned.get(key)
+        if interned is not None:
+            return interned
+        
+        numerator, slash, denominator = key.partition('/')
+        try:
+            num, den = int(numerator), int(denominator)
+        except ValueError:
+            raise ValueError(f"Pattern key must look like 'a/b', got {key!r}") from None
+        if not slash:
+            raise ValueError(f"Pattern key must look like 'a/b', got {key!r}")
+        
+        self = super().__new__(cls, key)
+        self.numerator = num
+        self.denominator = den
+        # The float orders almost every pair in C; the exact Fraction
+        # only breaks ties between values that round to the same float
+        value = Fraction(num, den) if den else float('inf')
+        try:
+            approximate = float(value)
+        except OverflowError:
+            approximate = float('inf') if value > 0 else float('-inf')
+        self._sort_key = (approximate, value, den)
+        return cls._interned.setdefault(key, self)
+    
+    @classmethod
+    def from_parts(cls, numerator: int, denominator: int) -> 'PatternKey':
+        """Get the key for numerator/denominator"""
+        return cls(f"{numerator}/{denominator}")
+    
+    def __getnewargs__(self) -> Tuple[str]:
+        return (str(self),)
+    
+    @staticmethod
+    def _order_of(other: object, op: str):
+        """Sort key of the other operand, or NotImplemented for non-strings"""
+        if isinstance(other, PatternKey):
+            return other._sort_key
+        if not isinstance(other, str):
+            return NotImplemented
+        try:
+            return PatternKey(other)._sort_key
+        except ValueError:
+            raise TypeError(f"'{op}' not supported between PatternKey and "
+                            f"non-key string {other!r}") from None
+    
+    def __lt__(self, other: object) -> bool:
+        order = self._order_of(other, '<')
+        return order if order is NotImplemented else self._sort_key < order
+    
+    def __le__(self, other: object) -> bool:
+        order = self._order_of(other, '<=')
+        return order if order is NotImplemented else self._sort_key <= order
+    
+    def __gt__(self, other: object) -> bool:
+        order = self._order_of(other, '>')
+        return order if order is NotImplemented else self._sort_key > order
+    
+    def __ge__(self, other: object) -> bool:
+        order = self._order_of(other, '>=')
+        return order if order is NotImplemented else self._sort_key >= order
+    
+    def __repr__(self) -> str:
+        return f"PatternKey({str(self)!r})"
+
+
+def intern_patterns(patterns: Mapping[str, Sequence[int]]) -> Dict[PatternKey, Sequence[int]]:
+    """
+    Re-key a pattern dict with interned PatternKeys, keeping its order.
+    
+    Args:
+        patterns: Mapping from 'a/b' strings (or PatternKeys) to sequences
+    
+    Returns:
+        New dict with the same sequences keyed by PatternKey
+    """
+    return {PatternKey(key): sequence for key, sequence in patterns.items()}
+
+
+class PatternRange(SequenceABC):
+    """
+    Read-only state sequence backed by a range.
+    
+    Arithmetic patterns (1, 2, ..., n or every k-th state) are stored as
+    a range instead of a list, so a pattern with millions of states costs
+    a few machine words. len, membership, index and slicing are all O(1);
+    iteration and comparison with lists behave like a list of the states.
+    """
+    
+    __slots__ = ('_range',)
+    
+    def __init__(self, start: int, stop: Optional[int] = None, step: int = 1):
+        """
+        Create a pattern with the same arguments as range().
+        
+        Args:
+            start: First state (or the stop value if stop is omitted)
+            stop: End of the pattern (exclusive)
+            step: Distance between consecutive states
+        """
+        if stop is None:
+            start, stop = 0, start
+        self._range = range(start, stop, step)
+    
+    @classmethod
+    def from_range(cls, states: range) -> 'PatternRange':
+        """Wrap an existing range"""
+        return cls(states.start, states.stop, states.step)
+    
+    def as_range(self) -> range:
+        """The underlying range"""
+        return self._range
+    
+    @property
+    def size(self) -> int:
+        """Number of states, even past the sys.maxsize limit of len()"""
+        r = self._range
+        if r.step > 0:
+            return max(0, (r.stop - r.start + r.step - 1) // r.step)
+        return max(0, (r.start - r.stop - r.step - 1) // -r.step)
+    
+    def __len__(self) -> int:
+        return len(self._range)
+    
+    def __bool__(self) -> bool:
+        return bool(self._range)
+    
+    @overload
+    def __getitem__(self, position: int) -> int: ...
+    
+    @overload
+    def __getitem__(self, position: slice) -> 'PatternRange': ...
+    
+    def __getitem__(self, position: Union[int, slice]) -> Union[int, 'PatternRange']:
+        if isinstance(position, slice):
+            return PatternRange.from_range(self._range[position])
+        return self._range[position]
+    
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._range)
+    
+    def __reversed__(self) -> Iterator[int]:
+        return reversed(self._range)
+    
+    def __contains__(self, state: object) -> bool:
+        return state in self._range
+    
+    def index(self, state: int, start: int = 0, stop: Optional[int] = None) -> int:
+        """Position of a state in the pattern (O(1))"""
+        position = self._range.index(state)
+        if position < start or (stop is not None and position >= stop):
+            raise ValueError(f"{state} is not in pattern")
+        return position
+    
+    def count(self, state: int) -> int:
+        """Number of occurrences of a state (0 or 1)"""
+        return self._range.count(state)
+    
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, PatternRange):
+            return self._range == other._range
+        if isinstance(other, range):
+            return self._range == other
+        if isinstance(other, (list, tuple)):
+            return len(other) == len(self._range) and all(
+                a == b for a, b in zip(self._range, other)
+            )
+        return NotImplemented
+    
+    def __hash__(self) -> int:
+        return hash(self._range)
+    
+    def __repr__(self) -> str:
+        r = self._range
+        if r.step == 1:
+            return f"PatternRange({r.start}, {r.stop})"
+        return f"PatternRange({r.start}, {r.stop}, {r.step})"
+
+
+# States shown at each end of a long pattern by format_states()
+PRINT_STATES_EDGE = 10
+
+
+def format_states(pattern: Sequence[int], edge: int = PRINT_STATES_EDGE) -> str:
+    """
+    Format a pattern's states for display, eliding the middle of long ones.
+    
+    Range-backed patterns can hold more states than fit in memory, so
+    only the first and last edge states of longer patterns are shown.
+    
+    Args:
+        pattern: A list or PatternRange of states
+        edge: States shown at each end
+    
+    Returns:
+        The states separated by spaces
+    
+    Examples:
+        >>> format_states([1, 4, 2, 8, 5, 7])
+        '1 4 2 8 5 7'
+        >>> format_states(PatternRange(1, 101), edge=3)
+        '1 2 3 … 98 99 100 (100 states)'
+    """
+    size = pattern.size if isinstance(pattern, PatternRange) else len(pattern)
+    if size <= 2 * edge:
+        return ' '.join(map(str, pattern))
+    head = ' '.join(map(str, pattern[:edge]))
+    tail = ' '.join(map(str, pattern[-edge:]))
+    return f"{head} … {tail} ({size} states)"
 
 
 @dataclass
@@ -29,8 +273,13 @@ class NGramBase(ABC):
     index: int
     sequence_value: int
     formula_parts: Dict[str, int]
-    fraction_patterns: Dict[str, List[int]] = field(default_factory=dict)
-    additional_factors: Dict[str, List[int]] = field(default_factory=dict)
+    fraction_patterns: Dict[str, Sequence[int]] = field(default_factory=dict)
+    additional_factors: Dict[str, Sequence[int]] = field(default_factory=dict)
+    
+    def __post_init__(self):
+        """Key the pattern dicts by interned PatternKeys"""
+        self.fraction_patterns = intern_patterns(self.fraction_patterns)
+        self.additional_factors = intern_patterns(self.additional_factors)
     
     @property
     @abstractmethod
@@ -49,7 +298,7 @@ class NGramBase(ABC):
         """Compute the N-Gram value for index n"""
         pass
     
-    def get_state_sequence(self, divisor: Optional[str] = None) -> List[int]:
+    def get_state_sequence(self, divisor: Optional[str] = None) -> Sequence[int]:
         """
         Get the state sequence for a specific divisor.
         
@@ -57,7 +306,8 @@ class NGramBase(ABC):
             divisor: The divisor key (e.g., '1/3', '1/7'). If None, returns primary pattern.
             
         Returns:
-            List of integers representing the state sequence
+            Sequence of integers representing the state sequence
+            (a list or a read-only PatternRange)
         """
         if divisor is None:
             if self.fraction_patterns:
@@ -65,7 +315,7 @@ class NGramBase(ABC):
             return []
         return self.fraction_patterns.get(divisor, [])
     
-    def get_all_patterns(self) -> Dict[str, List[int]]:
+    def get_all_patterns(self) -> Dict[str, Sequence[int]]:
         """Returns all fraction patterns including additional factors"""
         all_patterns = dict(self.fraction_patterns)
         all_patterns.update(self.additional_factors)
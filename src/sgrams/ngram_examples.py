@@ -108,7 +108,7 @@ def example_2d_catalan_ngrams():
     print("-" * 80)
     ngram6 = NGram2DCatalanFactory.create_ngram_2d_catalan(6)
     for divisor, pattern in ngram6.fraction_patterns.items():
-        print(f"  {divisor}: {pattern}")
+        print(f"  {divisor}: {list(pattern)}")
 
 
 def example_3d_catalan_ngrams():
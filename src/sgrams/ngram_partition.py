@@ -0,0 +1,164 @@
+"""
+Partition N-Grams (Integer Partitions - OEIS A000041)
+
+Implements resource allocation patterns based on integer partitions.
+Unlike the Catalan extensions, order does not matter: a partition of n
+is one way to split a budget of n units into unordered parts.
+
+OEIS A000041: Number of partitions of n
+Sequence: 1, 1, 2, 3, 5, 7, 11, 15, 22, 30, 42, 56, ...
+
+Applications:
+- Budget allocations
+- Resource partitioning
+- Team size distributions
+- Work package divisions
+"""
+
+from typing import Dict, List, Sequence
+from dataclasses import dataclass
+from .ngram_base import NGramBase, PatternRange, format_states
+from .flyweight import flyweight
+from .sequences import partition_count, partition_sequence
+
+
+@dataclass
+class NGramPartition(NGramBase):
+    """
+    Represents a Partition N-Gram (Resource Allocation).
+    
+    Maps to OEIS A000041: Number of partitions of n.
+    These represent the distinct ways to allocate n resource units.
+    """
+    
+    @property
+    def symbol(self) -> str:
+        """Returns the pt-notation (pt0, pt1, etc.) for partitions"""
+        return f"pt{self.index}"
+    
+    @property
+    def formula(self) -> str:
+        """Returns the formula description"""
+        return f"A000041({self.index}) = {self.sequence_value} partitions"
+    
+    def compute_value(self, n: int) -> int:
+        """
+        Compute the number of partitions of n (OEIS A000041).
+        
+        This uses Euler's pentagonal-number recurrence, so any n is supported.
+        """
+        return partition_count(n)
+    
+    def __str__(self) -> str:
+        """String representation of the Partition N-Gram"""
+        lines = []
+        lines.append("-" * 60)
+        lines.append(f"Partition N-Gram (Resource Allocation): {self.symbol}")
+        lines.append(f"Index: {self.index}")
+        lines.append(f"Partition Count: {self.sequence_value}")
+        lines.append(f"Formula: {self.formula}")
+        lines.append(f"OEIS: A000041")
+        lines.append("-" * 60)
+        
+        # Add fraction patterns if they exist
+        if self.fraction_patterns:
+            lines.append("\nAllocation Patterns:")
+            for divisor, pattern in self.fraction_patterns.items():
+                lines.append(f"  {divisor} | {format_states(pattern)}")
+        
+        if self.additional_factors:
+            lines.append("\nAllocation Factors:")
+            for divisor, pattern in self.additional_factors.items():
+                lines.append(f"  {divisor} | {format_states(pattern)}")
+        
+        return "\n".join(lines)
+
+
+class NGramPartitionFactory:
+    """Factory class for creating Partition N-Gram instances"""
+    
+    @staticmethod
+    def _generate_allocation_patterns(index: int, partition_total: int) -> Dict[str, Sequence[int]]:
+        """
+        Generate allocation patterns for integer partitions.
+        
+        The primary pattern enumerates every allocation of the budget;
+        the part-size pattern lists the unit sizes a single part can take.
+        Patterns are range-backed, since partition counts grow quickly.
+        """
+        patterns = {}
+        
+        # Primary pattern: all allocations of the budget
+        patterns[f'1/{partition_total}'] = PatternRange(1, partition_total + 1)
+        
+        # Part sizes available to a single allocation
+        if index > 1 and f'1/{index}' not in patterns:
+            patterns[f'1/{index}'] = PatternRange(1, index + 1)
+        
+        return patterns
+    
+    @staticmethod
+    @flyweight('part')
+    def create_ngram_partition(index: int) -> NGramPartition:
+        """
+        Create a Partition N-Gram for the given index.
+        
+        Args:
+            index: The N-Gram index (any non-negative integer)
+        
+        Returns:
+            NGramPartition instance
+        """
+        if index < 0:
+            raise ValueError(f"Index must be non-negative, got {index}")
+        
+        partition_total = partition_count(index)
+        fraction_patterns = NGramPartitionFactory._generate_allocation_patterns(
+            index, partition_total
+        )
+        
+        # Additional factors represent the whole budget as one allocation
+        additional_factors = {'1/1': [partition_total]}
+        
+        return NGramPartition(
+            index=index,
+            sequence_value=partition_total,
+            formula_parts={
+                'partitions': partition_total,
+                'index': index
+            },
+            fraction_patterns=fraction_patterns,
+            additional_factors=additional_factors
+        )
+    
+    @classmethod
+    def create_range(cls, start: int = 0, end: int = 12) -> List[NGramPartition]:
+        """
+        Create a range of Partition N-Grams.
+        
+        Args:
+            start: Starting index (inclusive)
+            end: Ending index (exclusive)
+        
+        Returns:
+            List of NGramPartition instances
+        """
+        return [cls.create_ngram_partition(i) for i in range(start, end)]
+
+
+def get_partitions_sequence(max_n: int = 20) -> List[int]:
+    """
+    Get the integer partitions sequence (OEIS A000041) up to max_n.
+    
+    Args:
+        max_n: Maximum index to return
+    
+    Returns:
+        List of partition counts
+    
+    Examples:
+        >>> seq = get_partitions_sequence(10)
+        >>> seq[:6]
+        [1, 1, 2, 3, 5, 7]
+    """
+    return partition_sequence(max_n)
@@ -0,0 +1,402 @@
+"""
+SQLite-backed store of N-Gram patterns, indexed by state, divisor and
+cycle length.
+
+Questions such as "which N-Grams of any family contain state 5" or
+"which patterns have cycle length 6" otherwise mean building every
+N-Gram and scanning its lists. write_pattern_store() loads the patterns
+once; PatternStore answers them from indexes:
+
+    >>> from sgrams.pattern_store import write_pattern_store, PatternStore
+    >>> write_pattern_store('ngrams.db', end=100)
+    >>> with PatternStore('ngrams.db') as store:
+    ...     [(m.family, m.index, m.divisor, m.position)
+    ...      for m in store.find_state(8, family='2nd', cycle_length=6)][:2]
+    [('2nd', 3, '1/7', 3), ('2nd', 6, '4/31', 4)]
+
+Tables:
+
+- families: type key, description and the stored index range
+- ngrams: family, index and symbol of each N-Gram
+- patterns: divisor, numerator, denominator, whether it is an
+  additional factor, cycle length and, for range-backed patterns, the
+  range's first state, last state and step
+- pattern_states: one (state, pattern, position) row per state of each
+  explicit pattern
+
+Range-backed patterns are matched arithmetically instead of being
+expanded into state rows, so a family with huge arithmetic cycles costs
+one row per pattern. SQLite integers are signed 64-bit: explicit states
+past that are not indexed, a range's last state is the last one that
+fits, ranges whose start or step does not fit are not indexed, and
+longer cycles have a NULL cycle length.
+"""
+
+import sqlite3
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .ngram_base import PatternKey, PatternRange
+
+SCHEMA_VERSION = 2
+
+# Rows inserted per executemany() call while loading
+BATCH_SIZE = 50_000
+
+_INT64_MIN = -(1 << 63)
+_INT64_MAX = (1 << 63) - 1
+
+_SCHEMA = """
+CREATE TABLE families (
+    key TEXT PRIMARY KEY,
+    description TEXT NOT NULL,
+    start INTEGER NOT NULL,
+    end INTEGER NOT NULL
+);
+CREATE TABLE ngrams (
+    id INTEGER PRIMARY KEY,
+    family TEXT NOT NULL REFERENCES families(key),
+    idx INTEGER NOT NULL,
+    symbol TEXT NOT NULL
+);
+CREATE TABLE patterns (
+    id INTEGER PRIMARY KEY,
+    ngram_id INTEGER NOT NULL REFERENCES ngrams(id),
+    divisor TEXT NOT NULL,
+    numerator INTEGER NOT NULL,
+    denominator INTEGER NOT NULL,
+    additional INTEGER NOT NULL,
+    cycle_length INTEGER,
+    range_start INTEGER,
+    range_last INTEGER,
+    range_step INTEGER
+);
+CREATE TABLE pattern_states (
+    state INTEGER NOT NULL,
+    pattern_id INTEGER NOT NULL REFERENCES patterns(id),
+    position INTEGER NOT NULL
+);
+"""
+
+# Built after loading, which is much faster than maintaining them per row
+_INDEXES = """
+CREATE UNIQUE INDEX ngrams_family_idx ON ngrams (family, idx);
+CREATE INDEX patterns_ngram ON patterns (ngram_id);
+CREATE INDEX patterns_divisor ON patterns (divisor);
+CREATE INDEX patterns_cycle_length ON patterns (cycle_length);
+CREATE INDEX patterns_range_last ON patterns (range_last) WHERE range_step IS NOT NULL;
+CREATE INDEX pattern_states_state ON pattern_states (state, pattern_id);
+"""
+
+
+class PatternStoreError(ValueError):
+    """Raised for databases that are not pattern stores"""
+
+
+@dataclass(frozen=True)
+class PatternMatch:
+    """
+    One pattern returned by a PatternStore query.
+
+    Attributes:
+        family: Type key of the N-Gram's family
+        index: The N-Gram index
+        divisor: The divisor key, e.g. '1/7'
+        cycle_length: Number of states, or None past 64 bits
+        additional: Whether the pattern is an additional factor
+        position: Position of the queried state in the pattern, or None
+            for queries without a state
+    """
+    family: str
+    index: int
+    divisor: str
+    cycle_length: Optional[int]
+    additional: bool
+    position: Optional[int] = None
+
+
+def _clip(value: int) -> int:
+    """Clip an integer to SQLite's signed 64-bit range"""
+    return min(max(value, _INT64_MIN), _INT64_MAX)
+
+
+def _range_bounds(states: PatternRange) -> Tuple[Optional[int], Optional[int], Optional[int]]:
+    """
+    (start, last, step) columns of an ascending range-backed pattern.
+
+    last is the largest state that fits in a signed 64-bit integer, so
+    every queryable state keeps its membership. Ranges whose start or
+    step does not fit, or that have no such state, get NULL bounds.
+    """
+    r = states.as_range()
+    if not (_INT64_MIN <= r.start <= _INT64_MAX and r.step <= _INT64_MAX) or not states.size:
+        return None, None, None
+    last = r.start + min(states.size - 1, (_INT64_MAX - r.start) // r.step) * r.step
+    return r.start, last, r.step
+
+
+def _iter_rows(families: Sequence[str], start: int, end: int) -> Iterator[Tuple[str, tuple]]:
+    """
+    Build N-Grams one at a time and yield (table, row) pairs for them.
+
+    Ids are assigned here so rows of all three tables can be batched
+    independently.
+    """
+    from .registry import registry
+
+    ngram_id = pattern_id = 0
+    for key in families:
+        family = registry.get_family(key)
+        for ngram in family.iter_range(start, end):
+            ngram_id += 1
+            yield 'ngrams', (ngram_id, key, ngram.index, ngram.symbol)
+
+            for additional, patterns in enumerate((ngram.fraction_patterns,
+                                                   ngram.additional_factors)):
+                for divisor, states in patterns.items():
+                    pattern_id += 1
+                    divisor = PatternKey(divisor)
+                    if isinstance(states, PatternRange) and states.as_range().step > 0:
+                        length = states.size
+                        bounds = _range_bounds(states)
+                    else:
+                        length = len(states)
+                        bounds = (None, None, None)
+                        for position, state in enumerate(states):
+                            if _INT64_MIN <= state <= _INT64_MAX:
+                                yield 'pattern_states', (state, pattern_id, position)
+                    yield 'patterns', (
+                        pattern_id, ngram_id, str(divisor),
+                        _clip(divisor.numerator), _clip(divisor.denominator), additional,
+                        length if length <= _INT64_MAX else None, *bounds
+                    )
+
+
+def write_pattern_store(path: str, end: int, families: Optional[Iterable[str]] = None,
+                        start: int = 0, batch_size: int = BATCH_SIZE) -> None:
+    """
+    Load the patterns of N-Gram families into a SQLite database.
+
+    Existing pattern store tables in the database are replaced. Rows are
+    inserted with batched executemany() in one transaction and the
+    indexes are built afterwards; the database is left in WAL mode so
+    readers do not block a later reload.
+
+    Args:
+        path: Database file to write
+        end: Index to stop before
+        families: Registry type keys (default: every registered type)
+        start: First index
+        batch_size: Rows per executemany() call
+
+    Raises:
+        ValueError: If the range is empty
+        KeyError: If a type key is unknown
+    """
+    from .registry import registry
+
+    if start < 0 or end <= start:
+        raise ValueError("need 0 <= start < end")
+    keys = list(dict.fromkeys(registry.keys() if families is None else families))
+    descriptions = [(key, registry.get_family(key).description, start, end) for key in keys]
+
+    inserts = {
+        'ngrams': "INSERT INTO ngrams VALUES (?, ?, ?, ?)",
+        'patterns': "INSERT INTO patterns VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        'pattern_states': "INSERT INTO pattern_states VALUES (?, ?, ?)",
+    }
+
+    connection = sqlite3.connect(path, isolation_level=None)
+    try:
+        connection.execute("PRAGMA journal_mode = WAL")
+        connection.execute("PRAGMA synchronous = NORMAL")
+        connection.execute("BEGIN")
+        for table in ('pattern_states', 'patterns', 'ngrams', 'families', 'metadata'):
+            connection.execute(f"DROP TABLE IF EXISTS {table}")
+        for statement in _SCHEMA.split(';'):
+            if statement.strip():
+                connection.execute(statement)
+        connection.execute("CREATE TABLE metadata (key TEXT PRIMARY KEY, value TEXT)")
+        connection.execute("INSERT INTO metadata VALUES ('schema_version', ?)",
+                           (str(SCHEMA_VERSION),))
+        connection.executemany("INSERT INTO families VALUES (?, ?, ?, ?)", descriptions)
+
+        batches = {table: [] for table in inserts}
+        for table, row in _iter_rows(keys, start, end):
+            batch = batches[table]
+            batch.append(row)
+            if len(batch) >= batch_size:
+                connection.executemany(inserts[table], batch)
+                batch.clear()
+        for table, batch in batches.items():
+            connection.executemany(inserts[table], batch)
+
+        for statement in _INDEXES.split(';'):
+            if statement.strip():
+                connection.execute(statement)
+        connection.execute("COMMIT")
+        connection.execute("ANALYZE")
+    except BaseException:
+        if connection.in_transaction:
+            connection.execute("ROLLBACK")
+        raise
+    finally:
+        connection.close()
+
+
+class PatternStore:
+    """
+    Read-only queries over a database written by write_pattern_store().
+
+    Every query can be narrowed by family, state, divisor and cycle
+    length; results are ordered by family, index and pattern.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open a pattern store.
+
+        Args:
+            path: Database written by write_pattern_store()
+
+        Raises:
+            PatternStoreError: If the file is not a pattern store of a supported version
+        """
+        self.path = path
+        self._connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True,
+                                           check_same_thread=False)
+        try:
+            row = self._connection.execute(
+                "SELECT value FROM metadata WHERE key = 'schema_version'"
+            ).fetchone()
+        except sqlite3.DatabaseError:
+            row = None
+        if row is None or row[0] != str(SCHEMA_VERSION):
+            self.close()
+            raise PatternStoreError(f"{path} is not a version {SCHEMA_VERSION} pattern store")
+
+    def keys(self) -> List[str]:
+        """Type keys of the stored families"""
+        return [key for key, in self._connection.execute("SELECT key FROM families ORDER BY rowid")]
+
+    def index_range(self, key: str) -> range:
+        """
+        Indices stored for a family.
+
+        Raises:
+            KeyError: If the family is not in the store
+        """
+        row = self._connection.execute(
+            "SELECT start, end FROM families WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            raise KeyError(f"N-Gram type '{key}' is not in the pattern store")
+        return range(*row)
+
+    def query(self, state: Optional[int] = None, divisor: Optional[str] = None,
+              cycle_length: Optional[int] = None, family: Optional[str] = None,
+              limit: Optional[int] = None) -> List[PatternMatch]:
+        """
+        Find patterns matching every given condition.
+
+        Args:
+            state: State the pattern must contain
+            divisor: Divisor key, e.g. '1/7'
+            cycle_length: Number of states in the pattern
+            family: Type key the N-Gram must belong to
+            limit: Maximum number of matches (default: all)
+
+        Returns:
+            Matching patterns; with a state, each carries its position
+        """
+        conditions = []
+        parameters = []
+        if divisor is not None:
+            conditions.append("p.divisor = ?")
+            parameters.append(str(divisor))
+        if cycle_length is not None:
+            conditions.append("p.cycle_length = ?")
+            parameters.append(cycle_length)
+        if family is not None:
+            conditions.append("n.family = ?")
+            parameters.append(family)
+
+        columns = "n.family, n.idx, p.divisor, p.cycle_length, p.additional"
+        joins = "FROM patterns p JOIN ngrams n ON n.id = p.ngram_id"
+        if state is None:
+            sql = f"SELECT {columns}, NULL AS position, p.id {joins}"
+            if conditions:
+                sql += " WHERE " + " AND ".join(conditions)
+        else:
+            if not _INT64_MIN <= state <= _INT64_MAX:
+                return []
+            where = "".join(f" AND {condition}" for condition in conditions)
+            sql = (
+                f"SELECT {columns}, s.position, p.id FROM pattern_states s "
+                f"JOIN patterns p ON p.id = s.pattern_id JOIN ngrams n ON n.id = p.ngram_id "
+                f"WHERE s.state = ?{where} "
+                f"UNION ALL "
+                f"SELECT {columns}, (? - p.range_start) / p.range_step, p.id {joins} "
+                f"WHERE p.range_step IS NOT NULL AND p.range_last >= ? AND p.range_start <= ? "
+                f"AND (? - p.range_start) % p.range_step = 0{where}"
+            )
+            parameters = [state, *parameters, state, state, state, state, *parameters]
+        sql += " ORDER BY 1, 2, 7"
+        if limit is not None:
+            sql += " LIMIT ?"
+            parameters.append(limit)
+
+        return [PatternMatch(family, index, divisor, length, bool(additional), position)
+                for family, index, divisor, length, additional, position, _
+                in self._connection.execute(sql, parameters)]
+
+    def find_state(self, state: int, family: Optional[str] = None,
+                   cycle_length: Optional[int] = None,
+                   limit: Optional[int] = None) -> List[PatternMatch]:
+        """
+        Find the patterns containing a state.
+
+        Args:
+            state: The state value
+            family: Type key to restrict to (default: every family)
+            cycle_length: Cycle length to restrict to
+            limit: Maximum number of matches (default: all)
+        """
+        return self.query(state=state, cycle_length=cycle_length, family=family, limit=limit)
+
+    def find_cycle_length(self, cycle_length: int, family: Optional[str] = None,
+                          limit: Optional[int] = None) -> List[PatternMatch]:
+        """
+        Find the patterns with a cycle length.
+
+        Args:
+            cycle_length: Number of states in the pattern
+            family: Type key to restrict to (default: every family)
+            limit: Maximum number of matches (default: all)
+        """
+        return self.query(cycle_length=cycle_length, family=family, limit=limit)
+
+    def find_divisor(self, divisor: str, family: Optional[str] = None,
+                     limit: Optional[int] = None) -> List[PatternMatch]:
+        """
+        Find the patterns with a divisor key.
+
+        Args:
+            divisor: The divisor key, e.g. '1/7'
+            family: Type key to restrict to (default: every family)
+            limit: Maximum number of matches (default: all)
+        """
+        return self.query(divisor=divisor, family=family, limit=limit)
+
+    def close(self) -> None:
+        """Close the database connection"""
+        self._connection.close()
+
+    def __enter__(self) -> 'PatternStore':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"PatternStore({self.path!r})"
@@ -0,0 +1,339 @@
+"""
+N-Gram type registry.
+
+Maps N-Gram type keys ('1st', '2nd', '3rd', '2d', '3d', 'part') to
+families that all implement one factory protocol:
+
+- get(index): the N-Gram at an index
+- iter_range(start, end): the N-Grams for a range of indices, lazily
+- count(index): the family's sequence value at an index, without
+  building the N-Gram
+
+Built-in families are registered by module and attribute name and are
+only imported when first used. Third-party families are discovered in
+the 'sgrams.families' entry point group, also loaded on first request.
+An entry point may name an NGramFamily instance or a class whose
+instances implement the protocol:
+
+    [project.entry-points."sgrams.families"]
+    hex = "mypackage.hexgrams:HexFamily"
+
+Examples:
+    >>> from sgrams.registry import get_family
+    >>> family = get_family('2d')
+    >>> family.count(6)
+    20
+    >>> [ngram.symbol for ngram in family.iter_range(0, 3)]
+    ['rt0', 'rt1', 'rt2']
+"""
+
+import threading
+from abc import ABC, abstractmethod
+from importlib import import_module
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+
+# Entry point group scanned for third-party families
+ENTRY_POINT_GROUP = 'sgrams.families'
+
+
+def _resolve(reference: str) -> Any:
+    """
+    Import the object named by a 'module:attribute.path' reference.
+
+    Modules without a package prefix are taken relative to sgrams.
+    """
+    module_name, _, path = reference.partition(':')
+    if '.' not in module_name:
+        module = import_module(f'.{module_name}', __package__)
+    else:
+        module = import_module(module_name)
+    target = module
+    for name in path.split('.'):
+        target = getattr(target, name)
+    return target
+
+
+class NGramFamily(ABC):
+    """
+    One N-Gram type behind the uniform factory protocol.
+
+    Attributes:
+        key: Short type key, e.g. '2nd'
+        description: Human-readable name, e.g. '2nd Power (S-Grams/Quadratic)'
+    """
+
+    def __init__(self, key: str, description: str):
+        self.key = key
+        self.description = description
+
+    @abstractmethod
+    def get(self, index: int) -> Any:
+        """
+        Create the N-Gram at an index.
+
+        Args:
+            index: The N-Gram index
+
+        Returns:
+            The family's N-Gram instance
+        """
+
+    @abstractmethod
+    def count(self, index: int) -> int:
+        """
+        Get the family's sequence value at an index.
+
+        Args:
+            index: The N-Gram index
+
+        Returns:
+            The sequence value, computed without building the N-Gram
+        """
+
+    def iter_range(self, start: int = 0, end: int = 12) -> Iterator[Any]:
+        """
+        Iterate over N-Grams for a range of indices.
+
+        Args:
+            start: Starting index (inclusive)
+            end: Ending index (exclusive)
+
+        Yields:
+            N-Gram instances, built one at a time
+        """
+        for index in range(start, end):
+            yield self.get(index)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.key!r}, {self.description!r})"
+
+
+class LazyFamily(NGramFamily):
+    """
+    Family whose factory module is imported on first use.
+
+    The create method and count function are given as 'module:attribute'
+    references (module names without a package are relative to sgrams);
+    count may also be a plain callable.
+    """
+
+    def __init__(self, key: str, description: str, create: str,
+                 count: Union[str, Callable[[int], int]]):
+        """
+        Describe a family without importing it.
+
+        Args:
+            key: Short type key
+            description: Human-readable name
+            create: Reference to the factory method building one N-Gram
+            count: Reference to, or callable computing, the sequence value
+        """
+        super().__init__(key, description)
+        self._create_ref = create
+        self._count_ref = count
+        self._create: Optional[Callable[[int], Any]] = None
+        self._count: Optional[Callable[[int], int]] = count if callable(count) else None
+
+    def get(self, index: int) -> Any:
+        create = self._create
+        if create is None:
+            create = self._create = _resolve(self._create_ref)
+        return create(index)
+
+    def count(self, index: int) -> int:
+        count = self._count
+        if count is None:
+            count = self._count = _resolve(self._count_ref)
+        return count(index)
+
+
+def _first_power_count(index: int) -> int:
+    """1st Power value: 1 + (1 + n)"""
+    return 1 + (1 + index)
+
+
+def _second_power_count(index: int) -> int:
+    """2nd Power value: 1 + (1 + n)²"""
+    return 1 + (1 + index) ** 2
+
+
+def _third_power_count(index: int) -> int:
+    """3rd Power value: 1 + (1 + n)³"""
+    return 1 + (1 + index) ** 3
+
+
+BUILTIN_FAMILIES = [
+    LazyFamily('1st', '1st Power (Linear)',
+               'ngram_1st_power:NGram1stPowerFactory.create_ngram_1st', _first_power_count),
+    LazyFamily('2nd', '2nd Power (S-Grams/Quadratic)',
+               'sgram:SGramFactory.create_sgram', _second_power_count),
+    LazyFamily('3rd', '3rd Power (Cubic)',
+               'ngram_3rd_power:NGram3rdPowerFactory.create_ngram_3rd', _third_power_count),
+    LazyFamily('2d', '2D Catalan (Rooted Trees)',
+               'ngram_2d_catalan:NGram2DCatalanFactory.create_ngram_2d_catalan',
+               'sequences:rooted_trees_count'),
+    LazyFamily('3d', '3D Catalan (Unlabeled Trees)',
+               'ngram_3d_catalan:NGram3DCatalanFactory.create_ngram_3d_catalan',
+               'sequences:unlabeled_trees_count'),
+    LazyFamily('part', 'Integer Partitions (Resource Allocation)',
+               'ngram_partition:NGramPartitionFactory.create_ngram_partition',
+               'sequences:partition_count'),
+]
+
+
+class NGramRegistry:
+    """
+    Registry of N-Gram families by type key.
+
+    Families registered directly are kept in registration order; entry
+    point families are listed after them and loaded on first request.
+    """
+
+    def __init__(self, families: Optional[List[NGramFamily]] = None,
+                 entry_point_group: Optional[str] = ENTRY_POINT_GROUP):
+        """
+        Create a registry.
+
+        Args:
+            families: Families to register up front
+            entry_point_group: Entry point group to scan, or None to skip plug-ins
+        """
+        self._families: Dict[str, NGramFamily] = {}
+        self._entry_points: Optional[Dict[str, Any]] = None
+        self._entry_point_group = entry_point_group
+        self._lock = threading.RLock()
+        for family in families or []:
+            self.register(family)
+
+    def register(self, family: NGramFamily, replace: bool = False) -> NGramFamily:
+        """
+        Register a family under its key.
+
+        Args:
+            family: The family to register
+            replace: Whether an existing family with the same key may be replaced
+
+        Returns:
+            The registered family
+
+        Raises:
+            ValueError: If the key is already registered and replace is False
+        """
+        with self._lock:
+            if not replace and family.key in self._families:
+                raise ValueError(f"N-Gram type '{family.key}' is already registered")
+            self._families[family.key] = family
+        return family
+
+    def _discover(self) -> Dict[str, Any]:
+        """Entry points of the plug-in group, keyed by name, without loading them"""
+        with self._lock:
+            if self._entry_points is None:
+                self._entry_points = {}
+                if self._entry_point_group is not None:
+                    from importlib.metadata import entry_points
+                    for entry_point in entry_points(group=self._entry_point_group):
+                        self._entry_points.setdefault(entry_point.name, entry_point)
+            return self._entry_points
+
+    def _load_entry_point(self, key: str) -> Optional[NGramFamily]:
+        """Load and register the plug-in family for a key, if there is one"""
+        with self._lock:
+            if key in self._families:
+                return self._families[key]
+            entry_point = self._discover().get(key)
+            if entry_point is None:
+                return None
+            family = entry_point.load()
+            if isinstance(family, type):
+                family = family()
+            for method in ('get', 'iter_range', 'count'):
+                if not callable(getattr(family, method, None)):
+                    raise TypeError(
+                        f"Entry point '{key}' ({entry_point.value}) does not implement {method}()"
+                    )
+            if getattr(family, 'key', None) is None:
+                family.key = key
+            if getattr(family, 'description', None) is None:
+                family.description = key
+            self._families[key] = family
+            return family
+
+    def get_family(self, key: str) -> NGramFamily:
+        """
+        Get the family for a type key, importing it if needed.
+
+        Args:
+            key: N-Gram type key
+
+        Returns:
+            The family
+
+        Raises:
+            KeyError: If no family is registered under the key
+        """
+        family = self._families.get(key)
+        if family is None:
+            family = self._load_entry_point(key)
+            if family is None:
+                raise KeyError(f"Unknown N-Gram type '{key}'")
+        return family
+
+    def keys(self, entry_points: bool = True) -> List[str]:
+        """
+        Get type keys without importing any family.
+
+        Args:
+            entry_points: Whether to include plug-ins that are not loaded yet
+                (scanning entry points imports importlib.metadata)
+
+        Returns:
+            Registered keys first, then the remaining plug-in keys
+        """
+        keys = list(self._families)
+        if entry_points:
+            keys.extend(key for key in self._discover() if key not in self._families)
+        return keys
+
+    def descriptions(self) -> Dict[str, str]:
+        """Map every type key to its description, loading plug-ins to read theirs"""
+        return {key: self.get_family(key).description for key in self.keys()}
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._families or key in self._discover()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+
+registry = NGramRegistry(BUILTIN_FAMILIES)
+
+
+def get_family(key: str) -> NGramFamily:
+    """
+    Get a family from the default registry.
+
+    Args:
+        key: N-Gram type key, e.g. '3rd'
+
+    Returns:
+        The family
+
+    Raises:
+        KeyError: If the type is unknown
+    """
+    return registry.get_family(key)
+
+
+def register_family(family: NGramFamily, replace: bool = False) -> NGramFamily:
+    """
+    Register a family in the default registry.
+
+    Args:
+        family: The family to register
+        replace: Whether an existing family with the same key may be replaced
+
+    Returns:
+        The registered family
+    """
+    return registry.register(family, replace)
@@ -0,0 +1,357 @@
+"""
+Integer sequence engines for N-Grams.
+
+Computes the OEIS sequences behind the N-Gram families for arbitrary n
+instead of relying on short literal tables:
+
+- A000108: Catalan numbers (2nd Power S-Grams)
+- A000081: Rooted trees (2D Catalan N-Grams)
+- A000055: Unlabeled trees (3D Catalan N-Grams)
+- A000041: Integer partitions (Partition N-Grams)
+
+Each engine keeps a shared memo table that is extended incrementally,
+so asking for successive terms reuses all earlier work.
+"""
+
+import threading
+from bisect import bisect_right
+from operator import mul
+from typing import List
+
+# Catalan numbers below this index are memoized; larger single terms
+# are computed directly from their prime factorization
+CATALAN_MEMO_LIMIT = 4096
+
+_catalan_table: List[int] = [1]
+_catalan_lock = threading.Lock()
+
+# A000081 prefix a(0..m) and divisor sums s(k) = sum_{d|k} d·a(d)
+_rooted_table: List[int] = [0, 1]
+_rooted_divisor_sums: List[int] = [0, 1]
+_rooted_lock = threading.Lock()
+
+# A000055 prefix t(0..m), t(0) = 1 by convention
+_unlabeled_table: List[int] = [1]
+_unlabeled_lock = threading.Lock()
+
+# A000041 prefix p(0..m) and the generalized pentagonal numbers that
+# enter the recurrence with a plus or minus sign, in increasing order
+_partition_table: List[int] = [1]
+_pentagonal_plus: List[int] = []
+_pentagonal_minus: List[int] = []
+_pentagonal_k = 1
+_partition_lock = threading.Lock()
+
+
+def _extend_catalan(n: int) -> None:
+    """Extend the shared Catalan table up to and including C(n)"""
+    with _catalan_lock:
+        table = _catalan_table
+        value = table[-1]
+        for k in range(len(table) - 1, n):
+            # C(k+1) = C(k) * 2(2k+1) / (k+2)
+            value = value * 2 * (2 * k + 1) // (k + 2)
+            table.append(value)
+
+
+def _primes_up_to(limit: int) -> List[int]:
+    """Sieve of Eratosthenes returning all primes <= limit"""
+    if limit < 2:
+        return []
+    sieve = bytearray([1]) * (limit + 1)
+    sieve[0] = sieve[1] = 0
+    for p in range(2, int(limit ** 0.5) + 1):
+        if sieve[p]:
+            sieve[p * p::p] = bytes(len(range(p * p, limit + 1, p)))
+    return [p for p in range(2, limit + 1) if sieve[p]]
+
+
+def _product(factors: List[int]) -> int:
+    """Multiply factors pairwise so big-integer operands stay balanced"""
+    if not factors:
+        return 1
+    while len(factors) > 1:
+        paired = [factors[i] * factors[i + 1] for i in range(0, len(factors) - 1, 2)]
+        if len(factors) % 2:
+            paired.append(factors[-1])
+        factors = paired
+    return factors[0]
+
+
+def catalan_legendre(n: int) -> int:
+    """
+    Compute a single Catalan number from its prime factorization.
+
+    C(n) = (2n)! / (n! (n+1)!). Legendre's formula gives the exponent of
+    each prime p <= 2n in the central binomial coefficient, and the
+    exponents of n+1 are then subtracted. No earlier terms are needed,
+    which makes this the fast path for one very large n.
+
+    Args:
+        n: Index into A000108
+
+    Returns:
+        The Catalan number C(n)
+
+    Examples:
+        >>> catalan_legendre(11)
+        58786
+    """
+    if n < 0:
+        raise ValueError(f"Catalan index must be non-negative, got {n}")
+
+    factors = []
+    m = n + 1
+    for p in _primes_up_to(2 * n):
+        exponent = 0
+        power = p
+        while power <= 2 * n:
+            exponent += (2 * n) // power - 2 * (n // power)
+            power *= p
+        while m % p == 0:
+            m //= p
+            exponent -= 1
+        if exponent:
+            factors.append(p ** exponent)
+    return _product(factors)
+
+
+def catalan_number(n: int) -> int:
+    """
+    Get the Catalan number C(n) (OEIS A000108).
+
+    Terms below CATALAN_MEMO_LIMIT come from the shared memo table, which
+    is extended with the recurrence C(n+1) = C(n)·2(2n+1)/(n+2). Larger
+    terms use the prime-factorization path.
+
+    Args:
+        n: Index into A000108
+
+    Returns:
+        The Catalan number C(n)
+
+    Examples:
+        >>> [catalan_number(n) for n in range(8)]
+        [1, 1, 2, 5, 14, 42, 132, 429]
+    """
+    if n < 0:
+        raise ValueError(f"Catalan index must be non-negative, got {n}")
+    if n < len(_catalan_table):
+        return _catalan_table[n]
+    if n >= CATALAN_MEMO_LIMIT:
+        return catalan_legendre(n)
+    _extend_catalan(n)
+    return _catalan_table[n]
+
+
+def catalan_sequence(max_n: int) -> List[int]:
+    """
+    Get the Catalan numbers C(0) through C(max_n).
+
+    Terms past CATALAN_MEMO_LIMIT are generated with the same recurrence
+    but not kept in the shared table.
+
+    Args:
+        max_n: Largest index to include
+
+    Returns:
+        List of Catalan numbers
+    """
+    if max_n < 0:
+        return []
+    memo_end = min(max_n, CATALAN_MEMO_LIMIT - 1)
+    if memo_end >= len(_catalan_table):
+        _extend_catalan(memo_end)
+    sequence = _catalan_table[:memo_end + 1]
+    value = sequence[-1]
+    for k in range(memo_end, max_n):
+        value = value * 2 * (2 * k + 1) // (k + 2)
+        sequence.append(value)
+    return sequence
+
+
+def _extend_rooted_trees(n: int) -> None:
+    """Extend the shared A000081 prefix and divisor sums up to a(n)"""
+    with _rooted_lock:
+        a = _rooted_table
+        s = _rooted_divisor_sums
+        for m in range(len(a), n + 1):
+            # Euler transform: (m-1)·a(m) = sum_{k=1}^{m-1} s(k)·a(m-k)
+            total = sum(map(mul, s[1:m], a[m - 1:0:-1]))
+            a.append(total // (m - 1))
+
+            divisor_sum = 0
+            d = 1
+            while d * d <= m:
+                if m % d == 0:
+                    divisor_sum += d * a[d]
+                    if d * d != m:
+                        divisor_sum += (m // d) * a[m // d]
+                d += 1
+            s.append(divisor_sum)
+
+
+def rooted_trees_count(n: int) -> int:
+    """
+    Get the number of rooted trees with n nodes (OEIS A000081).
+
+    Uses the exact Euler-transform recurrence
+    (n-1)·a(n) = sum_{k=1}^{n-1} s(k)·a(n-k), with s(k) = sum_{d|k} d·a(d),
+    on a shared prefix that grows on demand. a(0) is 0 by convention.
+
+    Args:
+        n: Number of nodes
+
+    Returns:
+        The rooted tree count a(n)
+
+    Examples:
+        >>> [rooted_trees_count(n) for n in range(10)]
+        [0, 1, 1, 2, 4, 9, 20, 48, 115, 286]
+    """
+    if n < 0:
+        raise ValueError(f"Rooted tree index must be non-negative, got {n}")
+    if n >= len(_rooted_table):
+        _extend_rooted_trees(n)
+    return _rooted_table[n]
+
+
+def rooted_trees_sequence(max_n: int) -> List[int]:
+    """
+    Get the rooted tree counts a(0) through a(max_n).
+
+    Args:
+        max_n: Largest number of nodes to include
+
+    Returns:
+        List of A000081 terms
+    """
+    if max_n < 0:
+        return []
+    if max_n >= len(_rooted_table):
+        _extend_rooted_trees(max_n)
+    return _rooted_table[:max_n + 1]
+
+
+def _extend_unlabeled_trees(n: int) -> None:
+    """Extend the shared A000055 prefix up to t(n)"""
+    a = rooted_trees_sequence(n)
+    with _unlabeled_lock:
+        t = _unlabeled_table
+        for m in range(len(t), n + 1):
+            # Otter: t(m) = a(m) - 1/2 sum_{i+j=m} a(i)a(j) + [m even] a(m/2)/2
+            half = (m + 1) // 2
+            value = a[m] - sum(map(mul, a[1:half], a[m - 1:m - half:-1]))
+            if m % 2 == 0:
+                value -= (a[half] * a[half] - a[half]) // 2
+            t.append(value)
+
+
+def unlabeled_trees_count(n: int) -> int:
+    """
+    Get the number of unlabeled (free) trees with n nodes (OEIS A000055).
+
+    Uses Otter's dissimilarity formula on the memoized rooted-tree series:
+    t(n) = a(n) - 1/2 sum_{i+j=n} a(i)·a(j) + [n even] a(n/2)/2.
+    Both prefixes are shared, so computing successive terms reuses all
+    earlier work. t(0) is 1 by convention.
+
+    Args:
+        n: Number of nodes
+
+    Returns:
+        The unlabeled tree count t(n)
+
+    Examples:
+        >>> [unlabeled_trees_count(n) for n in range(12)]
+        [1, 1, 1, 1, 2, 3, 6, 11, 23, 47, 106, 235]
+    """
+    if n < 0:
+        raise ValueError(f"Unlabeled tree index must be non-negative, got {n}")
+    if n >= len(_unlabeled_table):
+        _extend_unlabeled_trees(n)
+    return _unlabeled_table[n]
+
+
+def unlabeled_trees_sequence(max_n: int) -> List[int]:
+    """
+    Get the unlabeled tree counts t(0) through t(max_n).
+
+    Args:
+        max_n: Largest number of nodes to include
+
+    Returns:
+        List of A000055 terms
+    """
+    if max_n < 0:
+        return []
+    if max_n >= len(_unlabeled_table):
+        _extend_unlabeled_trees(max_n)
+    return _unlabeled_table[:max_n + 1]
+
+
+def _extend_pentagonal(limit: int) -> None:
+    """Extend the signed generalized pentagonal numbers past limit"""
+    global _pentagonal_k
+    while not _pentagonal_plus or _pentagonal_plus[-1] <= limit:
+        k = _pentagonal_k
+        target = _pentagonal_plus if k % 2 else _pentagonal_minus
+        target.append(k * (3 * k - 1) // 2)
+        target.append(k * (3 * k + 1) // 2)
+        _pentagonal_k += 1
+
+
+def _extend_partitions(n: int) -> None:
+    """Extend the shared A000041 prefix up to p(n)"""
+    with _partition_lock:
+        _extend_pentagonal(n)
+        p = _partition_table
+        plus = _pentagonal_plus
+        minus = _pentagonal_minus
+        for m in range(len(p), n + 1):
+            # Euler: p(m) = sum_k (-1)^(k+1) [p(m - k(3k-1)/2) + p(m - k(3k+1)/2)]
+            value = sum([p[m - g] for g in plus[:bisect_right(plus, m)]])
+            value -= sum([p[m - g] for g in minus[:bisect_right(minus, m)]])
+            p.append(value)
+
+
+def partition_count(n: int) -> int:
+    """
+    Get the number of integer partitions of n (OEIS A000041).
+
+    Uses Euler's pentagonal-number recurrence on a shared memo table.
+    Each new term needs O(sqrt(n)) additions, and once the table reaches
+    n every smaller term is a lookup.
+
+    Args:
+        n: The integer to partition
+
+    Returns:
+        The partition count p(n)
+
+    Examples:
+        >>> [partition_count(n) for n in range(12)]
+        [1, 1, 2, 3, 5, 7, 11, 15, 22, 30, 42, 56]
+    """
+    if n < 0:
+        raise ValueError(f"Partition index must be non-negative, got {n}")
+    if n >= len(_partition_table):
+        _extend_partitions(n)
+    return _partition_table[n]
+
+
+def partition_sequence(max_n: int) -> List[int]:
+    """
+    Get the partition counts p(0) through p(max_n).
+
+    Args:
+        max_n: Largest integer to include
+
+    Returns:
+        List of A000041 terms
+    """
+    if max_n < 0:
+        return []
+    if max_n >= len(_partition_table):
+        _extend_partitions(max_n)
+    return _partition_table[:max_n + 1]
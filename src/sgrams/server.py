@@ -0,0 +1,487 @@
+"""
+Local query server for the N-Grams CLI.
+
+Answers CLI queries from one long-running process, so tools that run
+many queries pay for interpreter start-up, imports and N-Gram
+construction once:
+
+- The flyweight cache keeps N-Grams built and the CLI keeps compiled
+  transformers per S-Gram
+- Repeated queries are answered from a response cache bounded both in
+  entries and in total output size
+- Queries are validated before they run, and a command whose output
+  grows past MAX_OUTPUT_CHARS is stopped and answered with an error
+- Commands run on a thread pool, so clients are served concurrently
+
+The protocol is newline-delimited JSON over a Unix socket or a localhost
+TCP port. A request gives the CLI arguments of one of SERVER_COMMANDS:
+
+    {"argv": ["show", "3", "--type", "2d"]}
+
+or, as a plain line, the same arguments in shell syntax (show 3 --type 2d).
+The response carries the command's output and exit status, plus the
+request's "id" if it had one:
+
+    {"status": 0, "stdout": "...", "stderr": ""}
+
+A structured QueryServer, as used by `sgrams_cli.py batch`, runs result
+functions instead and answers {"status": 0, "result": {...}} or
+{"status": 1, "error": "..."}.
+
+Start a server with `sgrams_cli.py serve` and forward CLI commands to it
+with `sgrams_cli.py --server ADDRESS ...` or the SGRAMS_SERVER variable.
+"""
+
+import io
+import json
+import os
+import shlex
+import socket
+import stat
+import sys
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager, redirect_stderr, redirect_stdout
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+# Commands the server answers; everything else runs locally
+SERVER_COMMANDS = ('summary', 'show', 'transition', 'trace', 'compare')
+
+# Number of distinct queries whose responses are kept
+RESPONSE_CACHE_SIZE = 256
+
+# Total output characters kept in the response cache
+RESPONSE_CACHE_CHARS = 1 << 26
+
+# Longest output, in characters, a command may print on stdout or stderr
+# (S-Gram 1000's 'show' table is about 18 million)
+MAX_OUTPUT_CHARS = 1 << 25
+
+# Longest accepted request line, in bytes
+MAX_REQUEST_BYTES = 1 << 16
+
+
+class ServerError(Exception):
+    """A server accepted a query but gave no valid answer to it"""
+
+
+def parse_address(address: str) -> Tuple[str, Union[str, Tuple[str, int]]]:
+    """
+    Parse a server address.
+
+    Args:
+        address: 'unix:PATH', a path containing '/', 'HOST:PORT' or 'PORT'
+
+    Returns:
+        ('unix', path) or ('tcp', (host, port))
+
+    Raises:
+        ValueError: If the address cannot be parsed
+    """
+    if address.startswith('unix:'):
+        return 'unix', address[len('unix:'):]
+    if os.sep in address or '/' in address:
+        return 'unix', address
+    host, _, port = address.rpartition(':')
+    if not port.isdigit():
+        raise ValueError(f"Invalid server address '{address}', expected HOST:PORT or a socket path")
+    return 'tcp', (host or '127.0.0.1', int(port))
+
+
+def parse_request(line: str) -> Any:
+    """
+    Decode one request line.
+
+    Args:
+        line: A JSON request object, or CLI arguments in shell syntax
+
+    Returns:
+        The request, e.g. {'argv': ['show', '3']}
+
+    Raises:
+        ValueError: If the line is neither valid JSON nor valid shell syntax
+    """
+    line = line.strip()
+    if line.startswith('{'):
+        return json.loads(line)
+    if '"' in line or "'" in line or '\\' in line:
+        return {'argv': shlex.split(line)}
+    # Without quotes or escapes, shell syntax is plain whitespace splitting
+    return {'argv': line.split()}
+
+
+class _OutputLimitExceeded(BaseException):
+    """
+    Raised by a capture buffer once a command prints too much.
+
+    A BaseException, like SystemExit, so that the commands' own
+    `except Exception` handlers do not swallow it.
+    """
+
+
+class _CappedBuffer(io.StringIO):
+    """StringIO that refuses to grow past a number of characters"""
+
+    def __init__(self, limit: int):
+        super().__init__()
+        self.limit = limit
+        self.size = 0
+
+    def write(self, text: str) -> int:
+        self.size += len(text)
+        if self.size > self.limit:
+            raise _OutputLimitExceeded(self.limit)
+        return super().write(text)
+
+
+class _ThreadLocalStream(io.TextIOBase):
+    """
+    Text stream that writes to a per-thread buffer while one is set.
+
+    Installed as sys.stdout/sys.stderr by the server, so commands running
+    concurrently on the thread pool each capture their own print() output.
+    """
+
+    def __init__(self, fallback):
+        self._fallback = fallback
+        self._local = threading.local()
+
+    @contextmanager
+    def capture(self, limit: int = MAX_OUTPUT_CHARS) -> Iterator[io.StringIO]:
+        """Send this thread's writes to a fresh buffer of at most limit characters"""
+        buffer = _CappedBuffer(limit)
+        self._local.buffer = buffer
+        try:
+            yield buffer
+        finally:
+            self._local.buffer = None
+
+    def write(self, text: str) -> int:
+        buffer = getattr(self._local, 'buffer', None)
+        if buffer is None:
+            return self._fallback.write(text)
+        return buffer.write(text)
+
+    def flush(self) -> None:
+        if getattr(self._local, 'buffer', None) is None:
+            self._fallback.flush()
+
+
+class QueryServer:
+    """
+    Runs CLI commands for JSON requests, caching their responses.
+
+    By default commands print a report and return an exit status, and
+    responses carry what they printed: {"status", "stdout", "stderr"}.
+    A structured server instead runs commands that return JSON-ready
+    results (raising ValueError or KeyError on failure) and answers
+    {"status": 0, "result": ...} or {"status", "error"}.
+
+    Attributes:
+        parser: The CLI argument parser, shared by all requests
+        commands: Mapping from command name to its cmd_* function, or to
+            its result function for a structured server
+        validate: Returns why parsed arguments should not run, or None
+        structured: Whether commands return results instead of printing
+    """
+
+    def __init__(self, parser, commands: Dict[str, Callable[[Any], Any]],
+                 workers: int = 4, cache_size: int = RESPONSE_CACHE_SIZE,
+                 validate: Optional[Callable[[Any], Optional[str]]] = None,
+                 max_output: int = MAX_OUTPUT_CHARS, structured: bool = False):
+        """
+        Create a server.
+
+        Args:
+            parser: argparse parser that turns argv lists into command arguments
+            commands: Commands the server may run, by name
+            workers: Number of threads running commands
+            cache_size: Number of responses kept
+            validate: Checks parsed arguments before their command runs
+            max_output: Longest output a command may print, or longest JSON
+                encoding of a structured result, in characters
+            structured: Whether commands return results instead of printing
+        """
+        self.parser = parser
+        self.commands = commands
+        self.workers = workers
+        self.cache_size = cache_size
+        self.validate = validate
+        self.max_output = max_output
+        self.structured = structured
+        # Cached responses with their sizes in characters
+        self._responses: 'OrderedDict[Tuple[str, ...], Tuple[Dict[str, Any], int]]' = OrderedDict()
+        self._cached_chars = 0
+        self._lock = threading.Lock()
+        self._stdout: Optional[_ThreadLocalStream] = None
+        self._stderr: Optional[_ThreadLocalStream] = None
+
+    def handle(self, request: Any) -> Dict[str, Any]:
+        """
+        Answer one decoded request.
+
+        Args:
+            request: Dictionary with an 'argv' list of strings and an optional 'id'
+
+        Returns:
+            Response dictionary with 'status', 'stdout' and 'stderr' (or
+            'result' or 'error' when structured) and the request's 'id'
+        """
+        response = self._respond(request)
+        if isinstance(request, dict) and 'id' in request:
+            response = dict(response, id=request['id'])
+        return response
+
+    def error_response(self, status: int, message: str) -> Dict[str, Any]:
+        """
+        Response reporting an error, in this server's response form.
+
+        Args:
+            status: Exit status
+            message: What went wrong, without an 'Error:' prefix
+
+        Returns:
+            {'status', 'error'} when structured, else {'status', 'stdout', 'stderr'}
+        """
+        if self.structured:
+            return {'status': status, 'error': message}
+        return {'status': status, 'stdout': '', 'stderr': f"Error: {message}\n"}
+
+    def _respond(self, request: Any) -> Dict[str, Any]:
+        """Response for a request, from the cache when possible"""
+        argv = request.get('argv') if isinstance(request, dict) else None
+        if not isinstance(argv, list) or not argv or not all(isinstance(a, str) for a in argv):
+            return self.error_response(2, "request needs a non-empty 'argv' list of strings")
+        if argv[0] not in self.commands:
+            return self.error_response(2, f"'{argv[0]}' is not served; use one of {', '.join(self.commands)}")
+
+        key = tuple(argv)
+        with self._lock:
+            cached = self._responses.get(key)
+            if cached is not None:
+                self._responses.move_to_end(key)
+                return cached[0]
+
+        try:
+            response, size = self._run(argv)
+        except _OutputLimitExceeded:
+            # Not cached: the query is cheap to refuse again
+            return self.error_response(1, f"output exceeds {self.max_output} characters; "
+                                          f"run this query locally")
+
+        with self._lock:
+            if key not in self._responses:
+                self._responses[key] = (response, size)
+                self._cached_chars += size
+            while self._responses and (len(self._responses) > self.cache_size or
+                                       self._cached_chars > RESPONSE_CACHE_CHARS):
+                _, (_, evicted_size) = self._responses.popitem(last=False)
+                self._cached_chars -= evicted_size
+        return response
+
+    def _run(self, argv: List[str]) -> Tuple[Dict[str, Any], int]:
+        """Run one command, capturing what it prints; returns the response and its size"""
+        if self._stdout is None:
+            stdout, stderr = _CappedBuffer(self.max_output), _CappedBuffer(self.max_output)
+            # Outside serve(), redirect the process streams
+            with redirect_stdout(stdout), redirect_stderr(stderr):
+                status, result = self._call(argv)
+        else:
+            with self._stdout.capture(self.max_output) as stdout, \
+                    self._stderr.capture(self.max_output) as stderr:
+                status, result = self._call(argv)
+
+        if not self.structured:
+            response = {'status': status, 'stdout': stdout.getvalue(), 'stderr': stderr.getvalue()}
+            return response, len(response['stdout']) + len(response['stderr'])
+        if status:
+            message = stderr.getvalue().strip()
+            if message.startswith('Error: '):
+                message = message[len('Error: '):]
+            response = {'status': status, 'error': message}
+            return response, len(message)
+        size = len(json.dumps(result))
+        if size > self.max_output:
+            raise _OutputLimitExceeded(self.max_output)
+        return {'status': 0, 'result': result}, size
+
+    def _call(self, argv: List[str]) -> Tuple[int, Any]:
+        """
+        Parse and validate argv and run its command.
+
+        Returns:
+            (status, result): exits become a status, and result is what a
+            structured command returned (None for printing commands)
+        """
+        try:
+            args = self.parser.parse_args(argv)
+            error = self.validate(args) if self.validate is not None else None
+            if error is not None:
+                print(f"Error: {error}", file=sys.stderr)
+                return 2, None
+            if not self.structured:
+                return self.commands[args.command](args), None
+            try:
+                return 0, self.commands[args.command](args)
+            except (ValueError, KeyError) as e:
+                print(f"Error: {e.args[0] if e.args else e}", file=sys.stderr)
+                return 1, None
+        except SystemExit as e:
+            if e.code is None or isinstance(e.code, int):
+                return e.code or 0, None
+            print(e.code, file=sys.stderr)
+            return 1, None
+
+    async def _serve_client(self, reader, writer) -> None:
+        """Answer request lines from one connection until it closes"""
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    response = self.error_response(2, "request too long")
+                    writer.write(json.dumps(response).encode() + b'\n')
+                    break
+                if not line:
+                    break
+                try:
+                    request = parse_request(line.decode())
+                except ValueError as e:
+                    response = self.error_response(2, f"invalid request: {e}")
+                else:
+                    response = await loop.run_in_executor(self._executor, self.handle, request)
+                writer.write(json.dumps(response).encode() + b'\n')
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, address: str, ready: Optional[Callable[[], None]] = None) -> None:
+        """
+        Serve requests until cancelled.
+
+        Args:
+            address: Unix socket path or HOST:PORT to listen on
+            ready: Called once the server is listening
+        """
+        import asyncio
+        from concurrent.futures import ThreadPoolExecutor
+
+        kind, target = parse_address(address)
+        self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix='sgrams-query')
+        saved = sys.stdout, sys.stderr
+        self._stdout = sys.stdout = _ThreadLocalStream(saved[0])
+        self._stderr = sys.stderr = _ThreadLocalStream(saved[1])
+        try:
+            if kind == 'unix':
+                _remove_stale_socket(target)
+                server = await asyncio.start_unix_server(self._serve_client, target, limit=MAX_REQUEST_BYTES)
+            else:
+                host, port = target
+                server = await asyncio.start_server(self._serve_client, host, port, limit=MAX_REQUEST_BYTES)
+            async with server:
+                if ready is not None:
+                    ready()
+                await server.serve_forever()
+        finally:
+            sys.stdout, sys.stderr = saved
+            self._stdout = self._stderr = None
+            self._executor.shutdown(wait=False)
+            if kind == 'unix':
+                _remove_stale_socket(target)
+
+
+def _remove_stale_socket(path: str) -> None:
+    """Delete a leftover Unix socket file; other files are left alone"""
+    try:
+        if stat.S_ISSOCK(os.stat(path).st_mode):
+            os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+def run_server(address: str, parser, commands: Dict[str, Callable[[Any], int]],
+               workers: int = 4, validate: Optional[Callable[[Any], Optional[str]]] = None) -> int:
+    """
+    Run a query server in the foreground until interrupted.
+
+    Enables the flyweight cache so N-Grams stay built between requests.
+
+    Args:
+        address: Unix socket path or HOST:PORT to listen on
+        parser: The CLI argument parser
+        commands: Commands to serve, by name
+        workers: Number of threads running commands
+        validate: Checks parsed arguments before their command runs
+
+    Returns:
+        Exit status
+    """
+    import asyncio
+    from .flyweight import enable_flyweight_cache
+
+    enable_flyweight_cache()
+    server = QueryServer(parser, commands, workers=workers, validate=validate)
+
+    def ready():
+        print(f"Serving N-Gram queries on {address} (Ctrl+C to stop)", file=sys.__stdout__, flush=True)
+
+    try:
+        asyncio.run(server.serve(address, ready))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def query(address: str, argv: List[str], timeout: Optional[float] = 30.0) -> Dict[str, Any]:
+    """
+    Send one request to a running server.
+
+    Args:
+        address: The server's Unix socket path or HOST:PORT
+        argv: CLI arguments, starting with the command name
+        timeout: Socket timeout in seconds
+
+    Returns:
+        Response dictionary with 'status', 'stdout' and 'stderr'
+
+    Raises:
+        OSError: If the server cannot be reached or the request not sent;
+            the query has not run, so it is safe to run it elsewhere
+        ServerError: If the request was sent but no valid response came
+            back in time; the server may still be running the query
+    """
+    kind, target = parse_address(address)
+    if kind == 'unix':
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        connection.settimeout(timeout)
+        try:
+            connection.connect(target)
+        except OSError:
+            connection.close()
+            raise
+    else:
+        connection = socket.create_connection(target, timeout=timeout)
+
+    with connection:
+        connection.sendall(json.dumps({'argv': argv}).encode() + b'\n')
+        try:
+            with connection.makefile('rb') as reply:
+                line = reply.readline()
+        except socket.timeout:
+            raise ServerError(f"no response from the server at {address} within {timeout} s") from None
+        except OSError as e:
+            raise ServerError(f"lost the connection to the server at {address}: {e}") from None
+    if not line:
+        raise ServerError(f"the server at {address} closed the connection without a response")
+    try:
+        response = json.loads(line)
+    except ValueError:
+        response = None
+    if not isinstance(response, dict) or not isinstance(response.get('status'), int):
+        raise ServerError(f"malformed response from the server at {address}")
+    return response
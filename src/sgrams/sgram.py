@@ -2,7 +2,7 @@
 SGram class representing a single S-Gram (2nd Power N-Gram).
 
 Each S-Gram has:
-- An index (0-11)
+- An index (0-11 hand-written, any index via the closed-form generator)
 - A symbolic notation (s1-s12)
 - A Catalan number
 - Transformation patterns
@@ -11,6 +11,10 @@ Each S-Gram has:
 
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass, field
+from .sequences import catalan_number
+from .sgram_generator import generate_sgram_patterns
+from .ngram_base import intern_patterns
+from .flyweight import flyweight
 
 
 @dataclass
@@ -19,7 +23,7 @@ class SGram:
     Represents a single S-Gram with its properties and state transformations.
     
     Attributes:
-        index: The S-Gram index (0-11)
+        index: The S-Gram index
         catalan_number: The corresponding Catalan number
         numerator: Numerator in the fraction form
         denominator: Denominator in the fraction form
@@ -39,6 +43,11 @@ class SGram:
     fraction_patterns: Dict[str, List[int]] = field(default_factory=dict)
     additional_factors: Dict[str, List[int]] = field(default_factory=dict)
     
+    def __post_init__(self):
+        """Key the pattern dicts by interned PatternKeys"""
+        self.fraction_patterns = intern_patterns(self.fraction_patterns)
+        self.additional_factors = intern_patterns(self.additional_factors)
+    
     @property
     def symbol(self) -> str:
         """Returns the s-notation (s1, s2, etc.)"""
@@ -118,15 +127,12 @@ class SGram:
 class SGramFactory:
     """Factory class for creating S-Gram instances"""
     
-    # Catalan numbers for indices 0-11
-    CATALAN_NUMBERS = [1, 2, 5, 14, 42, 132, 429, 1430, 4862, 16796, 58786, 208012]
-    
     @staticmethod
     def create_sgram_0() -> SGram:
         """S-Gram 0: s1 [1] 0/0"""
         return SGram(
             index=0,
-            catalan_number=1,
+            catalan_number=catalan_number(1),
             numerator=0,
             denominator=0,
             symbolic_notation="[0)(0] = [0] ~> [-] = ()",
@@ -143,7 +149,7 @@ class SGramFactory:
         """S-Gram 1: s2 [2] 1/1"""
         return SGram(
             index=1,
-            catalan_number=2,
+            catalan_number=catalan_number(2),
             numerator=1,
             denominator=1,
             symbolic_notation="[1)(1] = [1] ~> [(0)] = []",
@@ -162,7 +168,7 @@ class SGramFactory:
         """S-Gram 2: s3 [4] 2/4 = 1/2"""
         return SGram(
             index=2,
-            catalan_number=5,
+            catalan_number=catalan_number(3),
             numerator=2,
             denominator=4,
             symbolic_notation="[2)(1] = [2] ~> [([1])] = [([])]",
@@ -182,7 +188,7 @@ class SGramFactory:
         """S-Gram 3: s4 [9] 3/9 = 1/3"""
         return SGram(
             index=3,
-            catalan_number=14,
+            catalan_number=catalan_number(4),
             numerator=3,
             denominator=9,
             symbolic_notation="[3)(1] = [3] ~> [([2])] = [([()])]",
@@ -202,7 +208,7 @@ class SGramFactory:
         """S-Gram 4: s5 [20] 4/16 = 1/4"""
         return SGram(
             index=4,
-            catalan_number=42,
+            catalan_number=catalan_number(5),
             numerator=4,
             denominator=16,
             symbolic_notation="[4] = [2][2] = [(1)][(1)]",
@@ -225,7 +231,7 @@ class SGramFactory:
         """S-Gram 5: s6 [48] 5/25 = 1/5"""
         return SGram(
             index=5,
-            catalan_number=132,
+            catalan_number=catalan_number(6),
             numerator=5,
             denominator=25,
             symbolic_notation="[5] ~> [([3])] = [([(())])]",
@@ -248,7 +254,7 @@ class SGramFactory:
         """S-Gram 6: s7 [115] 6/36 = 1/6"""
         return SGram(
             index=6,
-            catalan_number=429,
+            catalan_number=catalan_number(7),
             numerator=6,
             denominator=36,
             symbolic_notation="[6] = [2][3] = [()][(())]",
@@ -275,7 +281,7 @@ class SGramFactory:
         """S-Gram 7: s8 [286] 7/49 = 1/7"""
         return SGram(
             index=7,
-            catalan_number=1430,
+            catalan_number=catalan_number(8),
             numerator=7,
             denominator=49,
             symbolic_notation="[7] = [([4])] = [([()()])]",
@@ -301,7 +307,7 @@ class SGramFactory:
         """S-Gram 8: s9 [719] 8/64 = 1/8"""
         return SGram(
             index=8,
-            catalan_number=4862,
+            catalan_number=catalan_number(9),
             numerator=8,
             denominator=64,
             symbolic_notation="[8] = [2][2][2] = [3[2]] = [()][()][()] ",
@@ -333,7 +339,7 @@ class SGramFactory:
         """S-Gram 9: s10 [1842] 9/81 = 1/9"""
         return SGram(
             index=9,
-            catalan_number=16796,
+            catalan_number=catalan_number(10),
             numerator=9,
             denominator=81,
             symbolic_notation="[9] = [3][3] = [2[3]] = [(())][(())]",
@@ -366,7 +372,7 @@ class SGramFactory:
         """S-Gram 10: s11 [4766] 10/100 = 1/10"""
         return SGram(
             index=10,
-            catalan_number=58786,
+            catalan_number=catalan_number(11),
             numerator=10,
             denominator=100,
             symbolic_notation="[10] = [2][5] = [()][((()))]",
@@ -403,7 +409,7 @@ class SGramFactory:
         """S-Gram 11: s12 [128??] 11/121 = 1/11"""
         return SGram(
             index=11,
-            catalan_number=208012,
+            catalan_number=catalan_number(12),
             numerator=11,
             denominator=121,
             symbolic_notation="[11] = [[5]] = [[((()))]]",
@@ -439,26 +445,53 @@ class SGramFactory:
     @classmethod
     def create_all_sgrams(cls) -> List[SGram]:
         """Create all S-Grams from 0 to 11"""
-        return [
-            cls.create_sgram_0(),
-            cls.create_sgram_1(),
-            cls.create_sgram_2(),
-            cls.create_sgram_3(),
-            cls.create_sgram_4(),
-            cls.create_sgram_5(),
-            cls.create_sgram_6(),
-            cls.create_sgram_7(),
-            cls.create_sgram_8(),
-            cls.create_sgram_9(),
-            cls.create_sgram_10(),
-            cls.create_sgram_11(),
-        ]
+        return [cls.create_sgram(index) for index in range(12)]
+    
+    @staticmethod
+    def create_generated_sgram(index: int) -> SGram:
+        """
+        Create an S-Gram for any index using the closed-form generator.
+        
+        Symbolic notation and transformation strings are only hand-written
+        for indices 0-11; generated S-Grams use the plain bracket form [n].
+        
+        Args:
+            index: The S-Gram index (any non-negative integer)
+            
+        Returns:
+            SGram instance
+        """
+        if index < 0:
+            raise ValueError(f"S-Gram index must be non-negative, got {index}")
+        
+        fraction_patterns, additional_factors = generate_sgram_patterns(index)
+        
+        return SGram(
+            index=index,
+            catalan_number=catalan_number(index + 1),
+            numerator=index,
+            denominator=index * index,
+            symbolic_notation=f"[{index}]",
+            transformation=f"[{index}]",
+            formula_parts={
+                'base': max(index, 1),
+                'expansion': index * index - index + 1 if index else 0
+            },
+            fraction_patterns=fraction_patterns,
+            additional_factors=additional_factors
+        )
     
     @classmethod
+    @flyweight('2nd')
     def create_sgram(cls, index: int) -> SGram:
-        """Create a specific S-Gram by index (0-11)"""
-        if index < 0 or index > 11:
-            raise ValueError(f"S-Gram index must be between 0 and 11, got {index}")
+        """
+        Create a specific S-Gram by index.
+        
+        Indices 0-11 use the hand-written tables; larger indices are
+        built by the closed-form generator.
+        """
+        if index < 0:
+            raise ValueError(f"S-Gram index must be non-negative, got {index}")
         
         creators = [
             cls.create_sgram_0, cls.create_sgram_1, cls.create_sgram_2,
@@ -467,4 +500,7 @@ class SGramFactory:
             cls.create_sgram_9, cls.create_sgram_10, cls.create_sgram_11,
         ]
         
+        if index >= len(creators):
+            return cls.create_generated_sgram(index)
+        
         return creators[index]()
@@ -0,0 +1,171 @@
+"""
+Closed-form S-Gram pattern generator.
+
+The hand-written S-Grams 0-11 all follow the same structure, so the
+fraction patterns for any index n >= 2 can be computed directly:
+
+- Primary rows are the digit cycles of k/(n²-n+1) written in base n²+1.
+  Since n³ ≡ -1 (mod n²-n+1), every cycle has length 6 (or 2 when
+  k is a multiple of (n²-n+1)/3). For k=1 the cycle is
+  1, n+1, n-1, n²-1, n²-n-1, n²-n+1.
+- The last primary row '1/n' holds the multiples of n below n².
+- Additional factors group the multiples of n up to n² by their gcd
+  with n ('1/n', '1/(n/g)', ..., '1/1').
+
+Rows can be streamed lazily for very large indices, and fully built
+pattern tables are kept in a bounded LRU cache.
+"""
+
+from functools import lru_cache
+from math import gcd
+from typing import Dict, Iterator, List, Tuple
+from .ngram_base import PatternKey
+
+# Number of fully generated pattern tables kept in memory
+GENERATOR_CACHE_SIZE = 32
+
+
+def _orbit_leader(r: int, n: int, d: int) -> int:
+    """Smallest remainder in the cycle of r under multiplication by n (mod d)"""
+    r1 = r * n % d
+    r2 = r1 * n % d
+    return min(r, r1, r2, d - r, d - r1, d - r2)
+
+
+def iter_fraction_rows(index: int) -> Iterator[Tuple[str, List[int]]]:
+    """
+    Lazily yield the primary fraction pattern rows of an S-Gram.
+
+    Rows are produced in the same order as the hand-written tables:
+    digit cycles ordered by their smallest remainder k, followed by
+    the '1/n' row of multiples of n. Only one row is held at a time.
+
+    Args:
+        index: The S-Gram index (any non-negative integer)
+
+    Yields:
+        (divisor, sequence) pairs
+
+    Examples:
+        >>> next(iter_fraction_rows(3))
+        ('1/7', [1, 4, 2, 8, 5, 7])
+    """
+    if index < 0:
+        raise ValueError(f"S-Gram index must be non-negative, got {index}")
+
+    n = index
+    if n == 0:
+        yield '0/1', [0]
+        return
+    if n == 1:
+        yield '1/1', [1]
+        return
+
+    d = n * n - n + 1
+    base = n * n + 1
+
+    for k in range(1, d):
+        if _orbit_leader(k, n, d) != k:
+            continue
+        sequence = []
+        remainder = k
+        while True:
+            digit, remainder = divmod(remainder * base, d)
+            sequence.append(digit)
+            if remainder == k:
+                break
+        yield f'{k}/{d}', sequence
+
+    yield f'1/{n}', list(range(n, n * n, n))
+
+
+def iter_additional_factor_rows(index: int) -> Iterator[Tuple[str, List[int]]]:
+    """
+    Lazily yield the additional factor rows of an S-Gram.
+
+    The multiples j·n (j = 1..n) are grouped by gcd(j, n) and keyed by
+    the reduced fraction '1/(n/g)'. The gcd-1 group is omitted when it
+    would repeat the full '1/n' primary row, i.e. when n is prime.
+
+    Args:
+        index: The S-Gram index (any non-negative integer)
+
+    Yields:
+        (divisor, sequence) pairs
+
+    Examples:
+        >>> list(iter_additional_factor_rows(4))
+        [('1/4', [4, 12]), ('1/2', [8]), ('1/1', [16])]
+    """
+    if index < 0:
+        raise ValueError(f"S-Gram index must be non-negative, got {index}")
+
+    n = index
+    if n == 0:
+        return
+
+    for g in range(1, n + 1):
+        if n % g:
+            continue
+        sequence = [j * n for j in range(g, n + 1, g) if gcd(j, n) == g]
+        if g == 1 and len(sequence) == n - 1:
+            continue
+        yield f'1/{n // g}', sequence
+
+
+@lru_cache(maxsize=GENERATOR_CACHE_SIZE)
+def _cached_patterns(index: int) -> Tuple[Tuple[Tuple[str, Tuple[int, ...]], ...],
+                                          Tuple[Tuple[str, Tuple[int, ...]], ...]]:
+    """Build and cache immutable pattern rows for an index"""
+    fraction_rows = tuple((PatternKey(k), tuple(seq)) for k, seq in iter_fraction_rows(index))
+    factor_rows = tuple((PatternKey(k), tuple(seq)) for k, seq in iter_additional_factor_rows(index))
+    return fraction_rows, factor_rows
+
+
+def generate_sgram_patterns(index: int) -> Tuple[Dict[str, List[int]], Dict[str, List[int]]]:
+    """
+    Generate the fraction patterns and additional factors for an S-Gram.
+
+    Results are served from a bounded LRU cache; each call returns fresh
+    dictionaries and lists, so callers may modify them freely.
+
+    Args:
+        index: The S-Gram index (any non-negative integer)
+
+    Returns:
+        (fraction_patterns, additional_factors) tuple
+    """
+    fraction_rows, factor_rows = _cached_patterns(index)
+    fraction_patterns = {k: list(seq) for k, seq in fraction_rows}
+    additional_factors = {k: list(seq) for k, seq in factor_rows}
+    return fraction_patterns, additional_factors
+
+
+def clear_generator_cache() -> None:
+    """Drop all cached pattern tables"""
+    _cached_patterns.cache_clear()
+
+
+def verify_against_tables() -> List[int]:
+    """
+    Compare the generator with the hand-written S-Grams 0-11.
+
+    Both the contents and the ordering of the pattern dictionaries
+    are checked.
+
+    Returns:
+        List of indices whose generated patterns differ (empty if all match)
+
+    Examples:
+        >>> verify_against_tables()
+        []
+    """
+    from .sgram import SGramFactory
+
+    mismatches = []
+    for sgram in SGramFactory.create_all_sgrams():
+        fraction_patterns, additional_factors = generate_sgram_patterns(sgram.index)
+        if (list(fraction_patterns.items()) != list(sgram.fraction_patterns.items()) or
+                list(additional_factors.items()) != list(sgram.additional_factors.items())):
+            mismatches.append(sgram.index)
+    return mismatches
@@ -3,68 +3,93 @@
 N-Grams CLI Tool
 
 Command-line interface for exploring N-Gram state transformations.
-Supports 1st Power, 2nd Power (S-Grams), 3rd Power, 2D Catalan, and 3D Catalan.
+Supports 1st Power, 2nd Power (S-Grams), 3rd Power, 2D Catalan, 3D Catalan,
+and Integer Partitions.
 
 Usage:
     python sgrams_cli.py summary [--type TYPE]         # Show summary of N-Grams
     python sgrams_cli.py show <index> [--type TYPE]    # Show details for N-Gram at index
     python sgrams_cli.py transition <index> <state>    # Show state transitions (S-Grams only)
     python sgrams_cli.py compare [--type TYPE]         # Compare N-Grams
-    python sgrams_cli.py export [--type TYPE]          # Export tables to markdown
+    python sgrams_cli.py export [--type TYPE ...]      # Export tables to markdown, JSON Lines, CSV or NPZ
+    python sgrams_cli.py catalogue --output FILE       # Write a memory-mapped pattern catalogue
+    python sgrams_cli.py store --output FILE           # Load patterns into a SQLite pattern store
+    python sgrams_cli.py query FILE [--state STATE]    # Find patterns in a pattern store
     python sgrams_cli.py types                         # List all available N-Gram types
+    python sgrams_cli.py batch [--input FILE]          # Answer queries from stdin as JSON Lines
+    python sgrams_cli.py serve [--address ADDRESS]     # Answer queries from a warm server
+    python sgrams_cli.py --server ADDRESS show <index> # Forward a query to a running server
 """
 
+import os
 import sys
 import argparse
-from pathlib import Path
+from functools import lru_cache
 
 # Add the src directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
-from sgrams import (
-    SGram,
-    NGram1stPower, NGram1stPowerFactory,
-    NGram3rdPower, NGram3rdPowerFactory,
-    NGram2DCatalan, NGram2DCatalanFactory,
-    NGram3DCatalan, NGram3DCatalanFactory,
-    FlipTransform
-)
-from sgrams.sgram import SGramFactory
-from sgrams.state_transformer import StateTransformer
-from sgrams.fraction_patterns import FractionPatternAnalyzer, CrossSGramAnalyzer
-from sgrams.table_generator import (
-    StateTransformationTableGenerator,
-    AllSGramsTableGenerator,
-    generate_all_markdown_tables
-)
-
-
-NGRAM_TYPES = {
-    '1st': '1st Power (Linear)',
-    '2nd': '2nd Power (S-Grams/Quadratic)',
-    '3rd': '3rd Power (Cubic)',
-    '2d': '2D Catalan (Rooted Trees)',
-    '3d': '3D Catalan (Unlabeled Trees)',
-}
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+# Commands import the analysis modules they need when they run, so
+# parsing arguments and light commands stay cheap
+from sgrams.registry import registry
 
-def get_ngram_factory(ngram_type: str):
-    """Get the appropriate factory for the N-Gram type"""
-    factories = {
-        '1st': NGram1stPowerFactory,
-        '2nd': SGramFactory,
-        '3rd': NGram3rdPowerFactory,
-        '2d': NGram2DCatalanFactory,
-        '3d': NGram3DCatalanFactory,
-    }
-    return factories.get(ngram_type)
+# Largest index show, transition and trace accept; building and printing
+# an N-Gram grows quickly with the index (S-Gram 1000 takes seconds, and
+# A000081 counts for tens of thousands of nodes take minutes)
+MAX_INDEX = 1000
+
+# Most [step, state] pairs a structured trace result lists
+MAX_TRACE_POINTS = 1_000_000
+
+# Compiled transformers kept warm by the query server
+TRANSFORMER_CACHE_SIZE = 256
+_warm_transformers = False
+
+
+@lru_cache(maxsize=TRANSFORMER_CACHE_SIZE)
+def _cached_transformer(index: int, compiled: bool):
+    """Transformer for an S-Gram, kept between server requests"""
+    from sgrams.state_transformer import StateTransformer
+    return StateTransformer(registry.get_family('2nd').get(index), compiled=compiled)
+
+
+def get_transformer(sgram, compiled: bool = False):
+    """Get a StateTransformer for an S-Gram, reusing warm ones in the server"""
+    if _warm_transformers:
+        return _cached_transformer(sgram.index, compiled)
+    from sgrams.state_transformer import StateTransformer
+    return StateTransformer(sgram, compiled=compiled)
+
+
+def check_index(index: int) -> bool:
+    """Report an index outside 0..MAX_INDEX; returns whether it is usable"""
+    if not 0 <= index <= MAX_INDEX:
+        print(f"Error: index must be between 0 and {MAX_INDEX}, got {index}", file=sys.stderr)
+        return False
+    return True
+
+
+def query_error(args):
+    """Why a server or batch query should not run, or None if it may"""
+    index = getattr(args, 'index', None)
+    if index is not None and not 0 <= index <= MAX_INDEX:
+        return f"index must be between 0 and {MAX_INDEX}, got {index}"
+    return None
+
+
+def get_ngram_family(ngram_type: str):
+    """Get the registered family for the N-Gram type, or None if unknown"""
+    try:
+        return registry.get_family(ngram_type)
+    except KeyError:
+        return None
 
 
 def cmd_types(args):
     """List all available N-Gram types"""
     print("\nAvailable N-Gram Types:")
     print("=" * 70)
-    for key, description in NGRAM_TYPES.items():
+    for key, description in registry.descriptions().items():
         print(f"  {key:5s} : {description}")
     print("\nUse --type <TYPE> to specify which N-Gram type to use")
     print("Default is '2nd' (S-Grams)")
@@ -77,20 +102,21 @@ def cmd_summary(args):
     
     if ngram_type == '2nd':
         # Use existing S-Grams summary
+        from sgrams.table_generator import AllSGramsTableGenerator
         generator = AllSGramsTableGenerator()
         print(generator.generate_summary_table())
     else:
         # Generate summary for other types
-        factory = get_ngram_factory(ngram_type)
-        if not factory:
+        family = get_ngram_family(ngram_type)
+        if not family:
             print(f"Error: Unknown N-Gram type '{ngram_type}'", file=sys.stderr)
             return 1
         
-        print(f"\n{NGRAM_TYPES[ngram_type]} Summary")
+        print(f"\n{family.description} Summary")
         print("=" * 70)
         
         try:
-            ngrams = factory.create_range(0, 12)
+            ngrams = family.iter_range(0, 12)
             print(f"\n{'Index':<8} {'Symbol':<12} {'Value':<10} {'Formula'}")
             print("-" * 70)
             for ng in ngrams:
@@ -105,28 +131,21 @@ def cmd_summary(args):
 def cmd_show(args):
     """Show detailed information for a specific N-Gram"""
     ngram_type = args.type if hasattr(args, 'type') and args.type else '2nd'
-    factory = get_ngram_factory(ngram_type)
+    family = get_ngram_family(ngram_type)
     
-    if not factory:
+    if not family:
         print(f"Error: Unknown N-Gram type '{ngram_type}'", file=sys.stderr)
         return 1
+    if not check_index(args.index):
+        return 1
     
     try:
+        ngram = family.get(args.index)
         if ngram_type == '2nd':
-            sgram = factory.create_sgram(args.index)
-            generator = StateTransformationTableGenerator(sgram)
+            from sgrams.table_generator import StateTransformationTableGenerator
+            generator = StateTransformationTableGenerator(ngram)
             print(generator.generate_complete_table())
-        elif ngram_type == '1st':
-            ngram = factory.create_ngram_1st(args.index)
-            print(ngram)
-        elif ngram_type == '3rd':
-            ngram = factory.create_ngram_3rd(args.index)
-            print(ngram)
-        elif ngram_type == '2d':
-            ngram = factory.create_ngram_2d_catalan(args.index)
-            print(ngram)
-        elif ngram_type == '3d':
-            ngram = factory.create_ngram_3d_catalan(args.index)
+        else:
             print(ngram)
     except (ValueError, IndexError) as e:
         print(f"Error: {e}", file=sys.stderr)
@@ -136,9 +155,11 @@ def cmd_show(args):
 
 def cmd_transition(args):
     """Show state transitions for a specific state"""
+    if not check_index(args.index):
+        return 1
     try:
-        sgram = SGramFactory.create_sgram(args.index)
-        transformer = StateTransformer(sgram)
+        sgram = registry.get_family('2nd').get(args.index)
+        transformer = get_transformer(sgram)
         
         print(f"\nState Transitions for S-Gram {sgram.symbol}, State {args.state}")
         print("=" * 70)
@@ -181,11 +202,14 @@ def cmd_compare(args):
     ngram_type = args.type if hasattr(args, 'type') and args.type else '2nd'
     
     if ngram_type == '2nd':
+        from sgrams.table_generator import AllSGramsTableGenerator
+        from sgrams.fraction_patterns import CrossSGramAnalyzer
+        
         generator = AllSGramsTableGenerator()
         print(generator.generate_comparison_table())
         
         # Cross-S-Gram analysis
-        sgrams = SGramFactory.create_all_sgrams()
+        sgrams = list(registry.get_family('2nd').iter_range(0, 12))
         analyzer = CrossSGramAnalyzer(sgrams)
         
         print("\nCommon Patterns Across S-Grams:")
@@ -195,16 +219,16 @@ def cmd_compare(args):
             print(f"  {divisor}: appears in S-Grams {sgram_indices}")
     else:
         # Generate comparison for other types
-        factory = get_ngram_factory(ngram_type)
-        if not factory:
+        family = get_ngram_family(ngram_type)
+        if not family:
             print(f"Error: Unknown N-Gram type '{ngram_type}'", file=sys.stderr)
             return 1
         
-        print(f"\n{NGRAM_TYPES[ngram_type]} Comparison")
+        print(f"\n{family.description} Comparison")
         print("=" * 70)
         
         try:
-            ngrams = factory.create_range(0, 12)
+            ngrams = family.iter_range(0, 12)
             
             print(f"\n{'Index':<8} {'Value':<12} {'Growth Rate':<15} {'Patterns'}")
             print("-" * 70)
@@ -224,81 +248,110 @@ def cmd_compare(args):
 
 
 def cmd_export(args):
-    """Export all tables to markdown file"""
-    ngram_type = args.type if hasattr(args, 'type') and args.type else '2nd'
-    output_file = args.output or f"NGRAMS_{ngram_type.upper()}_TABLES.md"
+    """Export tables to markdown or machine-readable files, one per N-Gram type"""
+    ngram_types = registry.keys() if args.all else (args.type or ['2nd'])
+    ngram_types = list(dict.fromkeys(ngram_types))
     
-    if ngram_type == '2nd':
-        content = generate_all_markdown_tables()
-    else:
-        # Generate markdown for other types
-        factory = get_ngram_factory(ngram_type)
-        if not factory:
+    if args.start < 0 or args.end <= args.start:
+        print("Error: need 0 <= --start < --end", file=sys.stderr)
+        return 1
+    if args.jobs < 0:
+        print("Error: --jobs must be 0 (all CPUs) or more", file=sys.stderr)
+        return 1
+    if args.output and len(ngram_types) > 1:
+        print("Error: --output needs a single --type; files are named per type", file=sys.stderr)
+        return 1
+    if args.format != 'markdown' and args.jobs != 1:
+        print("Error: --jobs only applies to markdown exports", file=sys.stderr)
+        return 1
+    if args.max_cycle_length is not None and args.max_cycle_length < 0:
+        print("Error: --max-cycle-length must be 0 (no limit) or more", file=sys.stderr)
+        return 1
+    
+    from sgrams.table_generator import (
+        iter_all_markdown_lines, iter_family_markdown_lines, iter_parallel_markdown_lines,
+        make_export_executor, write_lines
+    )
+    from sgrams.exporters import EXPORT_FORMATS, MAX_CYCLE_LENGTH, write_export
+    
+    max_cycle_length = MAX_CYCLE_LENGTH if args.max_cycle_length is None else args.max_cycle_length
+    
+    families = {}
+    for ngram_type in ngram_types:
+        family = get_ngram_family(ngram_type)
+        if not family:
             print(f"Error: Unknown N-Gram type '{ngram_type}'", file=sys.stderr)
             return 1
-        
-        try:
-            ngrams = factory.create_range(0, 12)
-            
-            content = f"# {NGRAM_TYPES[ngram_type]} Tables\n\n"
-            content += f"Generated tables for {NGRAM_TYPES[ngram_type]}\n\n"
-            content += "## Summary\n\n"
-            content += "| Index | Symbol | Value | Formula |\n"
-            content += "|-------|--------|-------|----------|\n"
+        families[ngram_type] = family
+    
+    jobs = args.jobs or os.cpu_count() or 1
+    executor = None
+    if jobs > 1:
+        executor = make_export_executor(jobs, len(families) * (args.end - args.start))
+    
+    try:
+        # Families are written one after another, each streamed straight
+        # to its file; with --jobs their sections render on one shared pool
+        for ngram_type, family in families.items():
+            if args.format != 'markdown':
+                output_file = (args.output or
+                               f"NGRAMS_{ngram_type.upper()}_PATTERNS.{EXPORT_FORMATS[args.format]}")
+                write_export(output_file, args.format, [ngram_type], args.start, args.end,
+                             max_cycle_length or None)
+                print(f"Exported {family.description} patterns to {output_file}")
+                continue
             
-            for ng in ngrams:
-                content += f"| {ng.index} | {ng.symbol} | {ng.sequence_value} | {ng.formula} |\n"
+            output_file = args.output or f"NGRAMS_{ngram_type.upper()}_TABLES.md"
+            if executor is not None:
+                lines = iter_parallel_markdown_lines(ngram_type, args.start, args.end, executor)
+            elif ngram_type == '2nd':
+                lines = iter_all_markdown_lines(args.start, args.end)
+            else:
+                lines = iter_family_markdown_lines(family, args.start, args.end)
             
-            content += "\n## Detailed Information\n\n"
+            with open(output_file, 'w') as f:
+                write_lines(lines, f)
             
-            for ng in ngrams:
-                content += f"### {ng.symbol} (Index {ng.index})\n\n"
-                content += f"**Value:** {ng.sequence_value}\n\n"
-                content += f"**Formula:** {ng.formula}\n\n"
-                
-                if ng.fraction_patterns:
-                    content += "**Patterns:**\n\n"
-                    for divisor, pattern in ng.fraction_patterns.items():
-                        content += f"- {divisor}: {' '.join(map(str, pattern))}\n"
-                    content += "\n"
-                
-                content += "---\n\n"
-        
-        except Exception as e:
-            print(f"Error generating export: {e}", file=sys.stderr)
-            return 1
-    
-    with open(output_file, 'w') as f:
-        f.write(content)
+            print(f"Exported {family.description} tables to {output_file}")
+    except Exception as e:
+        print(f"Error generating export: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
     
-    print(f"Exported {NGRAM_TYPES[ngram_type]} tables to {output_file}")
     return 0
 
 
 def cmd_trace(args):
     """Trace a path through state space"""
+    if not check_index(args.index):
+        return 1
     try:
-        sgram = SGramFactory.create_sgram(args.index)
-        transformer = StateTransformer(sgram)
+        sgram = registry.get_family('2nd').get(args.index)
+        transformer = get_transformer(sgram, compiled=True)
         
         pattern = args.pattern
         if pattern is None:
             # Use primary pattern
             pattern = list(sgram.fraction_patterns.keys())[0]
         
-        path = transformer.trace_path(
+        path = transformer.iter_path(
             args.state, 
             args.steps, 
             pattern=pattern,
-            reverse=args.reverse
+            reverse=args.reverse,
+            every=args.every
         )
         
         direction = "Informing (←)" if args.reverse else "Resolving (→)"
         print(f"\nPath Trace for S-Gram {sgram.symbol}")
         print(f"Pattern: {pattern}, Starting State: {args.state}, Direction: {direction}")
+        if args.every > 1:
+            print(f"Showing every {args.every} steps")
         print("=" * 70)
         
-        for i, state in enumerate(path):
+        for i, state in path:
             prefix = "Start: " if i == 0 else f"Step {i}: "
             print(f"{prefix:>10s}{state}")
         
@@ -308,8 +361,310 @@ def cmd_trace(args):
     return 0
 
 
-def main():
-    """Main CLI entry point"""
+def _ngram_fields(ngram_type, ngram):
+    """JSON-ready fields describing an N-Gram of any family"""
+    fields = {
+        'family': ngram_type,
+        'index': ngram.index,
+        'symbol': ngram.symbol,
+        'formula': ngram.formula,
+    }
+    if hasattr(ngram, 'sequence_value'):
+        fields['value'] = ngram.sequence_value
+    else:
+        fields['catalan_number'] = ngram.catalan_number
+        fields['fraction'] = ngram.fraction
+    return fields
+
+
+def result_summary(args):
+    """Structured form of summary: the fields of N-Grams 0-11"""
+    family = get_ngram_family(args.type)
+    if not family:
+        raise ValueError(f"Unknown N-Gram type '{args.type}'")
+    return {'family': args.type, 'description': family.description,
+            'ngrams': [_ngram_fields(args.type, ngram) for ngram in family.iter_range(0, 12)]}
+
+
+def result_show(args):
+    """Structured form of show: an N-Gram's fields and every pattern"""
+    from sgrams.exporters import pattern_record
+    
+    family = get_ngram_family(args.type)
+    if not family:
+        raise ValueError(f"Unknown N-Gram type '{args.type}'")
+    ngram = family.get(args.index)
+    result = _ngram_fields(args.type, ngram)
+    result['formula_parts'] = dict(ngram.formula_parts)
+    result['patterns'] = [
+        pattern_record(divisor, bool(additional), states)
+        for additional, patterns in enumerate((ngram.fraction_patterns, ngram.additional_factors))
+        for divisor, states in patterns.items()
+    ]
+    return result
+
+
+def result_transition(args):
+    """Structured form of transition: next and previous state in each pattern"""
+    sgram = registry.get_family('2nd').get(args.index)
+    transformer = get_transformer(sgram)
+    transitions = []
+    for pattern, sequence in sgram.get_all_patterns().items():
+        if args.state in sequence:
+            transitions.append({
+                'pattern': str(pattern),
+                'state': args.state,
+                'next': transformer.resolve(args.state, pattern),
+                'prev': transformer.inform(args.state, pattern),
+            })
+    if not transitions:
+        raise ValueError(f"State {args.state} not found in any pattern of S-Gram {sgram.symbol}")
+    return {'index': sgram.index, 'symbol': sgram.symbol, 'transitions': transitions}
+
+
+def result_trace(args):
+    """Structured form of trace: the pattern and the [step, state] path"""
+    if args.every > 0 and args.steps // args.every + 1 > MAX_TRACE_POINTS:
+        raise ValueError(f"trace would list more than {MAX_TRACE_POINTS} states; raise --every")
+    sgram = registry.get_family('2nd').get(args.index)
+    transformer = get_transformer(sgram, compiled=True)
+    pattern = args.pattern
+    if pattern is None:
+        pattern = list(sgram.fraction_patterns.keys())[0]
+    path = transformer.iter_path(args.state, args.steps, pattern=pattern,
+                                 reverse=args.reverse, every=args.every)
+    return {'index': sgram.index, 'symbol': sgram.symbol, 'pattern': str(pattern),
+            'reverse': args.reverse, 'path': [[step, state] for step, state in path]}
+
+
+def result_compare(args):
+    """Structured form of compare: cycle lengths and pattern counts of N-Grams 0-11"""
+    from sgrams.ngram_base import PatternRange
+    
+    family = get_ngram_family(args.type)
+    if not family:
+        raise ValueError(f"Unknown N-Gram type '{args.type}'")
+    ngrams = []
+    for ngram in family.iter_range(0, 12):
+        fields = _ngram_fields(args.type, ngram)
+        patterns = ngram.fraction_patterns
+        fields['patterns'] = len(patterns)
+        if patterns:
+            divisor, states = next(iter(patterns.items()))
+            fields['primary_pattern'] = str(divisor)
+            fields['cycle_length'] = states.size if isinstance(states, PatternRange) else len(states)
+        ngrams.append(fields)
+    return {'family': args.type, 'description': family.description, 'ngrams': ngrams}
+
+
+def _warm_up():
+    """Keep N-Grams and transformers between queries in this process"""
+    global _warm_transformers
+    from sgrams.flyweight import enable_flyweight_cache
+    
+    enable_flyweight_cache()
+    _warm_transformers = True
+
+
+def cmd_catalogue(args):
+    """Write the patterns of N-Gram types to a binary catalogue"""
+    if args.start < 0 or args.end <= args.start:
+        print("Error: need 0 <= --start < --end", file=sys.stderr)
+        return 1
+    
+    from sgrams.catalogue import write_catalogue
+    
+    try:
+        write_catalogue(args.output, args.end, args.type, args.start)
+    except (OSError, ValueError) as e:
+        print(f"Error writing catalogue: {e}", file=sys.stderr)
+        return 1
+    
+    print(f"Wrote catalogue of indices {args.start} to {args.end - 1} to {args.output}")
+    return 0
+
+
+def cmd_store(args):
+    """Load the patterns of N-Gram types into a SQLite pattern store"""
+    if args.start < 0 or args.end <= args.start:
+        print("Error: need 0 <= --start < --end", file=sys.stderr)
+        return 1
+    
+    from sgrams.pattern_store import write_pattern_store
+    
+    try:
+        write_pattern_store(args.output, args.end, args.type, args.start)
+    except (OSError, ValueError) as e:
+        print(f"Error writing pattern store: {e}", file=sys.stderr)
+        return 1
+    
+    print(f"Stored patterns of indices {args.start} to {args.end - 1} in {args.output}")
+    return 0
+
+
+def cmd_query(args):
+    """Find patterns in a pattern store by state, divisor and cycle length"""
+    import sqlite3
+    from sgrams.pattern_store import PatternStore
+    
+    if args.state is None and args.divisor is None and args.cycle_length is None:
+        print("Error: give at least one of --state, --divisor, --cycle-length", file=sys.stderr)
+        return 1
+    if args.limit < 0:
+        print("Error: --limit must be 0 (no limit) or more", file=sys.stderr)
+        return 1
+    
+    try:
+        with PatternStore(args.database) as store:
+            # One extra row tells whether the output was cut off
+            limit = args.limit + 1 if args.limit else None
+            matches = store.query(state=args.state, divisor=args.divisor,
+                                  cycle_length=args.cycle_length, family=args.type, limit=limit)
+    except (sqlite3.Error, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    
+    truncated = args.limit and len(matches) > args.limit
+    if truncated:
+        matches = matches[:args.limit]
+    
+    position_header = 'Position' if args.state is not None else ''
+    print(f"{'Type':<6} {'Index':<8} {'Divisor':<14} {'Cycle':<8} {'Kind':<11} {position_header}".rstrip())
+    print("-" * 70)
+    for match in matches:
+        kind = 'additional' if match.additional else 'primary'
+        length = match.cycle_length if match.cycle_length is not None else '-'
+        position = match.position if match.position is not None else ''
+        print(f"{match.family:<6} {match.index:<8} {match.divisor:<14} {length:<8} {kind:<11} {position}".rstrip())
+    
+    if truncated:
+        print(f"\n(first {args.limit} matches; raise --limit or use --limit 0 for all)")
+    else:
+        print(f"\n{len(matches)} matches")
+    return 0
+
+
+def cmd_batch(args):
+    """
+    Answer one query per input line, writing one JSON result per line.
+    
+    Results are structured ({"status": 0, "result": {...}} or
+    {"status", "error"}); with --text they carry each command's printed
+    report instead ({"status", "stdout", "stderr"}).
+    """
+    import json
+    from sgrams.server import SERVER_COMMANDS, QueryServer, parse_request
+    
+    try:
+        stream = sys.stdin if args.input == '-' else open(args.input)
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    
+    _warm_up()
+    commands = COMMANDS if args.text else RESULTS
+    server = QueryServer(build_parser(), {name: commands[name] for name in SERVER_COMMANDS},
+                         validate=query_error, structured=not args.text)
+    out = sys.stdout
+    
+    try:
+        for line in stream:
+            if not line.strip() or line.lstrip().startswith('#'):
+                continue
+            try:
+                response = server.handle(parse_request(line))
+            except ValueError as e:
+                response = server.error_response(2, f"invalid request: {e}")
+            out.write(json.dumps(response) + '\n')
+            out.flush()
+    finally:
+        # Only close files this command opened, never stdin
+        if stream is not sys.stdin:
+            stream.close()
+    return 0
+
+
+def cmd_serve(args):
+    """Serve queries from a long-running process with warm caches"""
+    from sgrams.server import SERVER_COMMANDS, run_server
+    
+    try:
+        _warm_up()
+        return run_server(args.address, build_parser(),
+                          {name: COMMANDS[name] for name in SERVER_COMMANDS},
+                          workers=args.workers, validate=query_error)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+
+def _command_argv(argv, command):
+    """The part of argv from the subcommand on, without top-level options"""
+    skip = False
+    for i, token in enumerate(argv):
+        if skip:
+            skip = False
+        elif token == '--server':
+            skip = True
+        elif token == command:
+            return argv[i:]
+    return [command]
+
+
+def forward(args, argv):
+    """
+    Run a command on the query server, if one is reachable.
+    
+    Only a failed connection falls back to running locally; once the
+    server has the query, a timeout or bad reply is reported as an error
+    rather than running the query a second time.
+    
+    Returns:
+        The command's exit status, or None to run it locally
+    """
+    from sgrams.server import SERVER_COMMANDS, ServerError, query
+    
+    if args.command not in SERVER_COMMANDS:
+        return None
+    try:
+        response = query(args.server, _command_argv(argv, args.command))
+    except ServerError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    except (OSError, ValueError):
+        return None
+    sys.stdout.write(response.get('stdout', ''))
+    sys.stderr.write(response.get('stderr', ''))
+    return response['status']
+
+
+COMMANDS = {
+    'types': cmd_types,
+    'summary': cmd_summary,
+    'show': cmd_show,
+    'transition': cmd_transition,
+    'trace': cmd_trace,
+    'compare': cmd_compare,
+    'export': cmd_export,
+    'catalogue': cmd_catalogue,
+    'store': cmd_store,
+    'query': cmd_query,
+    'batch': cmd_batch,
+    'serve': cmd_serve,
+}
+
+# Structured counterparts of the commands the server answers, for batch
+RESULTS = {
+    'summary': result_summary,
+    'show': result_show,
+    'transition': result_transition,
+    'trace': result_trace,
+    'compare': result_compare,
+}
+
+
+def build_parser():
+    """Build the CLI argument parser"""
     parser = argparse.ArgumentParser(
         description="N-Grams State Transformation Explorer (1st, 2nd, 3rd Power and Catalan)",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -320,71 +675,149 @@ Examples:
   %(prog)s summary --type 3rd
   %(prog)s show 3 --type 2d
   %(prog)s show 5 --type 3d
+  %(prog)s show 7 --type part
   %(prog)s transition 3 5
   %(prog)s trace 3 1 --steps 10
+  %(prog)s trace 3 1 --steps 1000000000 --every 100000000
   %(prog)s compare --type 1st
   %(prog)s export --type 3rd --output cubic_tables.md
+  %(prog)s export --all --end 200 --jobs 8
+  %(prog)s export --type 1st 2nd --end 100 --format npz
+  %(prog)s catalogue --output ngrams.cat --end 100
+  %(prog)s catalogue --output powers.cat --type 1st 3rd --end 10000
+  %(prog)s store --output ngrams.db --end 100
+  %(prog)s query ngrams.db --state 8 --cycle-length 6
+  %(prog)s batch --input queries.txt > results.jsonl
+  %(prog)s serve --address /tmp/sgrams.sock
+  %(prog)s --server /tmp/sgrams.sock show 3
         """
     )
+    parser.add_argument('--server', default=os.environ.get('SGRAMS_SERVER'), metavar='ADDRESS',
+                        help='Forward queries to a running server (default: $SGRAMS_SERVER); '
+                             'runs locally if it is unreachable')
     
     subparsers = parser.add_subparsers(dest='command', help='Command to execute')
     
+    # --type accepts plug-in families too, but only the built-in keys are
+    # listed in usage so parsing does not scan entry points
+    type_metavar = '{' + ','.join(registry.keys(entry_points=False)) + '}'
+    
     # Types command
     subparsers.add_parser('types', help='List all available N-Gram types')
     
     # Summary command
     summary_parser = subparsers.add_parser('summary', help='Display summary of N-Grams')
-    summary_parser.add_argument('--type', choices=NGRAM_TYPES.keys(), default='2nd',
+    summary_parser.add_argument('--type', choices=registry, default='2nd', metavar=type_metavar,
                                 help='N-Gram type (default: 2nd)')
     
     # Show command
     show_parser = subparsers.add_parser('show', help='Show details for specific N-Gram')
-    show_parser.add_argument('index', type=int, help='N-Gram index (0-11)')
-    show_parser.add_argument('--type', choices=NGRAM_TYPES.keys(), default='2nd',
+    show_parser.add_argument('index', type=int, help='N-Gram index')
+    show_parser.add_argument('--type', choices=registry, default='2nd', metavar=type_metavar,
                             help='N-Gram type (default: 2nd)')
     
     # Transition command (S-Grams only)
     trans_parser = subparsers.add_parser('transition', help='Show state transitions (S-Grams only)')
-    trans_parser.add_argument('index', type=int, help='S-Gram index (0-11)')
+    trans_parser.add_argument('index', type=int, help='S-Gram index')
     trans_parser.add_argument('state', type=int, help='State value')
     
     # Trace command (S-Grams only)
     trace_parser = subparsers.add_parser('trace', help='Trace path through state space (S-Grams only)')
-    trace_parser.add_argument('index', type=int, help='S-Gram index (0-11)')
+    trace_parser.add_argument('index', type=int, help='S-Gram index')
     trace_parser.add_argument('state', type=int, help='Starting state')
     trace_parser.add_argument('--steps', type=int, default=10, help='Number of steps (default: 10)')
     trace_parser.add_argument('--pattern', type=str, help='Pattern to use (e.g., 1/3)')
     trace_parser.add_argument('--reverse', action='store_true', help='Trace backward (inform)')
+    trace_parser.add_argument('--every', type=int, default=1,
+                              help='Only show every N-th step (default: 1)')
     
     # Compare command
     compare_parser = subparsers.add_parser('compare', help='Compare patterns across N-Grams')
-    compare_parser.add_argument('--type', choices=NGRAM_TYPES.keys(), default='2nd',
+    compare_parser.add_argument('--type', choices=registry, default='2nd', metavar=type_metavar,
                                help='N-Gram type (default: 2nd)')
     
     # Export command
     export_parser = subparsers.add_parser('export', help='Export tables to markdown')
     export_parser.add_argument('--output', '-o', help='Output file (default: auto-generated)')
-    export_parser.add_argument('--type', choices=NGRAM_TYPES.keys(), default='2nd',
-                              help='N-Gram type (default: 2nd)')
+    export_parser.add_argument('--start', type=int, default=0, help='First index to export (default: 0)')
+    export_parser.add_argument('--end', type=int, default=12, help='Index to stop before (default: 12)')
+    export_parser.add_argument('--type', choices=registry, nargs='+', metavar=type_metavar,
+                              help='N-Gram types, one file each (default: 2nd)')
+    export_parser.add_argument('--all', action='store_true', help='Export every N-Gram type')
+    export_parser.add_argument('--jobs', '-j', type=int, default=1,
+                              help='Workers rendering tables in parallel, 0 for all CPUs (default: 1); '
+                                   'output is identical to a serial export')
+    export_parser.add_argument('--format', '-f', choices=('markdown', 'jsonl', 'csv', 'npz'),
+                              default='markdown',
+                              help='markdown tables, or JSON Lines per pattern, CSV or NPZ columns '
+                                   'of the transition table (default: markdown)')
+    # The default, exporters.MAX_CYCLE_LENGTH, is filled in by cmd_export
+    # so building the parser does not import the exporters
+    export_parser.add_argument('--max-cycle-length', type=int, default=None,
+                              help='Leave longer patterns out of csv and npz exports, '
+                                   '0 for no limit (default: exporters.MAX_CYCLE_LENGTH, one million)')
+    
+    # Catalogue command
+    catalogue_parser = subparsers.add_parser('catalogue', help='Write a memory-mapped pattern catalogue')
+    catalogue_parser.add_argument('--output', '-o', required=True, help='Catalogue file to write')
+    catalogue_parser.add_argument('--start', type=int, default=0, help='First index (default: 0)')
+    catalogue_parser.add_argument('--end', type=int, default=12, help='Index to stop before (default: 12)')
+    catalogue_parser.add_argument('--type', choices=registry, nargs='+', metavar=type_metavar,
+                                  help='N-Gram types (default: all)')
+    
+    # Store command
+    store_parser = subparsers.add_parser('store', help='Load patterns into a SQLite pattern store')
+    store_parser.add_argument('--output', '-o', required=True, help='Database file to write')
+    store_parser.add_argument('--start', type=int, default=0, help='First index (default: 0)')
+    store_parser.add_argument('--end', type=int, default=12, help='Index to stop before (default: 12)')
+    store_parser.add_argument('--type', choices=registry, nargs='+', metavar=type_metavar,
+                              help='N-Gram types (default: all)')
     
-    args = parser.parse_args()
+    # Query command
+    query_parser = subparsers.add_parser('query', help='Find patterns in a pattern store')
+    query_parser.add_argument('database', help='Database written by the store command')
+    query_parser.add_argument('--state', type=int, help='State the pattern contains')
+    query_parser.add_argument('--divisor', help='Divisor key (e.g., 1/7)')
+    query_parser.add_argument('--cycle-length', type=int, help='Number of states in the pattern')
+    query_parser.add_argument('--type', help='Only patterns of this N-Gram type')
+    query_parser.add_argument('--limit', type=int, default=50,
+                              help='Maximum matches to show, 0 for all (default: 50)')
+    
+    # Batch command
+    batch_parser = subparsers.add_parser('batch', help='Answer queries read one per line as JSON Lines')
+    batch_parser.add_argument('--input', '-i', default='-',
+                              help='File with one query per line, JSON or CLI syntax (default: stdin)')
+    batch_parser.add_argument('--text', action='store_true',
+                              help="Answer with each command's printed report instead of structured results")
+    
+    # Serve command
+    serve_parser = subparsers.add_parser('serve', help='Answer queries from a long-running server')
+    serve_parser.add_argument('--address', default='127.0.0.1:8765',
+                              help='Unix socket path or HOST:PORT to listen on (default: 127.0.0.1:8765)')
+    serve_parser.add_argument('--workers', type=int, default=4,
+                              help='Threads running queries (default: 4)')
+    
+    return parser
+
+
+def main(argv=None):
+    """Main CLI entry point"""
+    if argv is None:
+        argv = sys.argv[1:]
+    parser = build_parser()
+    args = parser.parse_args(argv)
     
     if not args.command:
         parser.print_help()
         return 1
     
-    # Dispatch to appropriate command
-    commands = {
-        'types': cmd_types,
-        'summary': cmd_summary,
-        'show': cmd_show,
-        'transition': cmd_transition,
-        'trace': cmd_trace,
-        'compare': cmd_compare,
-        'export': cmd_export,
-    }
+    if args.server:
+        status = forward(args, argv)
+        if status is not None:
+            return status
     
-    return commands[args.command](args)
+    # Dispatch to appropriate command
+    return COMMANDS[args.command](args)
 
 
 if __name__ == '__main__':
@@ -5,10 +5,330 @@ Implements state transformation logic for S-Grams, including:
 - State transitions based on fraction patterns
 - Resolving patterns (forward transitions)
 - Informing patterns (backward transitions)
+- Compiled O(1) lookup tables for large patterns
+- Vectorized batch transitions over NumPy arrays of states
 """
 
-from typing import List, Dict, Tuple, Optional
+from array import array
+from typing import Any, List, Dict, Iterator, Tuple, Optional, Sequence, Union
 from .sgram import SGram
+from .ngram_base import PatternRange
+
+# NumPy is only needed for the batch API and is imported on first use
+np = None
+
+# Explicit sequences get dense tables while their state span is at most
+# this many times the pattern length; sparser ones fall back to a dict
+DENSE_SPAN_FACTOR = 8
+
+# Batch tables gather from a dense (patterns x states) array up to this
+# many cells; larger tables use a sorted-key search instead
+BATCH_DENSE_LIMIT = 1 << 24
+
+# Sentinel returned by the batch API for states that are not in the pattern
+INVALID_STATE = -1
+
+
+def _load_numpy() -> Any:
+    """
+    Import NumPy for the batch API.
+    
+    Raises:
+        ImportError: If NumPy is not installed
+    """
+    global np
+    if np is None:
+        try:
+            import numpy
+        except ImportError:
+            raise ImportError("The batch API requires NumPy") from None
+        np = numpy
+    return np
+
+
+_INT64_MIN = -(1 << 63)
+_INT64_MAX = (1 << 63) - 1
+
+
+class CompiledPattern:
+    """
+    O(1) lookup tables for a single pattern.
+    
+    Explicit sequences are compiled into dense arrays indexed by the
+    slot state - offset: positions (-1 where a state is absent),
+    next_states and prev_states. Sequences that are too sparse for a
+    dense table, or whose states do not fit in 64 bits, use a
+    state -> position dict instead. Range-backed patterns need no tables
+    at all, since positions follow from the range arithmetic.
+    
+    Attributes:
+        name: The pattern name (e.g., '1/7')
+        sequence: The original state sequence
+        length: The cycle length
+        offset: State stored in slot 0 of the dense arrays
+        positions: Dense array or dict mapping state to cycle position
+        next_states: Dense array of next states by slot, if dense
+        prev_states: Dense array of previous states by slot, if dense
+    """
+    
+    __slots__ = ('name', 'sequence', 'length', 'offset', 'states',
+                 'positions', 'next_states', 'prev_states', '_span', '_range')
+    
+    def __init__(self, name: str, sequence: Sequence[int]):
+        """
+        Compile a pattern.
+        
+        Args:
+            name: The pattern name
+            sequence: The state sequence of the pattern
+        """
+        self.name = name
+        self.sequence = sequence
+        self.length = sequence.size if isinstance(sequence, PatternRange) else len(sequence)
+        self.offset = 0
+        self.states: Sequence[int] = sequence
+        self.positions: Union[array, Dict[int, int], None] = None
+        self.next_states: Optional[array] = None
+        self.prev_states: Optional[array] = None
+        self._span = 0
+        self._range = sequence.as_range() if isinstance(sequence, PatternRange) else None
+        
+        if self._range is None and self.length:
+            self._compile(sequence)
+    
+    def _compile(self, sequence: Sequence[int]) -> None:
+        """Build the position and neighbour tables for an explicit sequence"""
+        low = min(sequence)
+        high = max(sequence)
+        span = high - low + 1
+        length = self.length
+        
+        if low < _INT64_MIN or high > _INT64_MAX or span > DENSE_SPAN_FACTOR * length + 64:
+            self.states = tuple(sequence)
+            positions = {}
+            for i, state in enumerate(self.states):
+                positions.setdefault(state, i)
+            self.positions = positions
+            return
+        
+        states = array('q', sequence)
+        positions = array('q', [-1]) * span
+        next_states = array('q', bytes(8 * span))
+        prev_states = array('q', bytes(8 * span))
+        for i in range(length - 1, -1, -1):
+            slot = states[i] - low
+            positions[slot] = i
+            next_states[slot] = states[(i + 1) % length]
+            prev_states[slot] = states[i - 1]
+        
+        self.offset = low
+        self._span = span
+        self.states = states
+        self.positions = positions
+        self.next_states = next_states
+        self.prev_states = prev_states
+    
+    @property
+    def is_dense(self) -> bool:
+        """Whether the pattern is backed by dense state-indexed arrays"""
+        return self.next_states is not None
+    
+    def position(self, state: int) -> int:
+        """Position of a state in the cycle, or -1 if it is not in the pattern"""
+        if self._range is not None:
+            if state not in self._range:
+                return -1
+            return self._range.index(state)
+        if self.next_states is not None:
+            slot = state - self.offset
+            if 0 <= slot < self._span:
+                return self.positions[slot]
+            return -1
+        if self.positions is None:
+            return -1
+        return self.positions.get(state, -1)
+    
+    def state_at(self, position: int) -> int:
+        """State at a cycle position (taken modulo the cycle length)"""
+        return self.states[position % self.length]
+    
+    def next_state(self, state: int) -> Optional[int]:
+        """Next state in the cycle, or None if the state is not in the pattern"""
+        if self.next_states is not None:
+            slot = state - self.offset
+            if 0 <= slot < self._span and self.positions[slot] >= 0:
+                return self.next_states[slot]
+            return None
+        if self._range is not None:
+            states = self._range
+            if state not in states:
+                return None
+            return states.start if state == states[-1] else state + states.step
+        position = self.position(state)
+        if position < 0:
+            return None
+        return self.state_at(position + 1)
+    
+    def prev_state(self, state: int) -> Optional[int]:
+        """Previous state in the cycle, or None if the state is not in the pattern"""
+        if self.prev_states is not None:
+            slot = state - self.offset
+            if 0 <= slot < self._span and self.positions[slot] >= 0:
+                return self.prev_states[slot]
+            return None
+        if self._range is not None:
+            states = self._range
+            if state not in states:
+                return None
+            return states[-1] if state == states.start else state - states.step
+        position = self.position(state)
+        if position < 0:
+            return None
+        return self.state_at(position - 1)
+    
+    def __repr__(self) -> str:
+        kind = "range" if self._range is not None else "dense" if self.is_dense else "sparse"
+        return f"CompiledPattern({self.name!r}, length={self.length}, {kind})"
+
+
+class BatchTransitionTable:
+    """
+    Vectorized next/previous lookups for every pattern of an N-Gram.
+    
+    Explicit patterns are stacked into one (patterns x states) array per
+    direction, indexed by [row, state - offset], so a batch step is a
+    single gather. When that array would exceed BATCH_DENSE_LIMIT cells,
+    each pattern keeps its states sorted instead and is looked up with a
+    binary search. Range-backed patterns are evaluated with
+    array arithmetic and never materialized. States that do not fit in
+    a NumPy int64 can never appear in a batch, so they are left out.
+    
+    Attributes:
+        pattern_names: Pattern names, indexed by pattern id
+        pattern_ids: Mapping from pattern name to pattern id
+    """
+    
+    def __init__(self, compiled: Dict[str, CompiledPattern]):
+        """
+        Build the batch table from compiled patterns.
+        
+        Args:
+            compiled: Mapping from pattern name to its CompiledPattern
+        
+        Raises:
+            ImportError: If NumPy is not installed
+        """
+        _load_numpy()
+        
+        self.pattern_names = list(compiled)
+        self.pattern_ids = {name: i for i, name in enumerate(self.pattern_names)}
+        
+        # Pattern id -> explicit row (-1 for range-backed or skipped patterns)
+        rows = np.full(len(self.pattern_names), -1, dtype=np.intp)
+        self._ranges: List[Tuple[int, int, int, int]] = []
+        explicit: List[np.ndarray] = []
+        
+        for pattern_id, name in enumerate(self.pattern_names):
+            table = compiled[name]
+            if table.length == 0:
+                continue
+            if isinstance(table.sequence, PatternRange):
+                states = table.sequence.as_range()
+                if _INT64_MIN <= states.start <= _INT64_MAX:
+                    length = min(table.length, _INT64_MAX)
+                    self._ranges.append((pattern_id, states.start, states.step, length))
+                continue
+            if _INT64_MIN <= min(table.sequence) and max(table.sequence) <= _INT64_MAX:
+                rows[pattern_id] = len(explicit)
+                explicit.append(np.asarray(table.sequence, dtype=np.int64))
+        
+        self._rows = rows
+        self._build_explicit(explicit)
+    
+    def _build_explicit(self, explicit: List['np.ndarray']) -> None:
+        """Pack explicit patterns into dense or sorted-key tables"""
+        self._dense = True
+        self._offset = 0
+        self._span = 0
+        empty = np.empty((len(explicit), 0), dtype=np.int64)
+        self._next = self._prev = empty
+        if not explicit:
+            return
+        
+        low = min(int(states.min()) for states in explicit)
+        high = max(int(states.max()) for states in explicit)
+        span = high - low + 1
+        self._offset = low
+        self._span = span
+        
+        if span * len(explicit) <= BATCH_DENSE_LIMIT:
+            self._next = np.full((len(explicit), span), INVALID_STATE, dtype=np.int64)
+            self._prev = np.full((len(explicit), span), INVALID_STATE, dtype=np.int64)
+            for row, states in enumerate(explicit):
+                # Assign in reverse so repeated states keep their first position
+                slots = (states - low)[::-1]
+                self._next[row, slots] = np.roll(states, -1)[::-1]
+                self._prev[row, slots] = np.roll(states, 1)[::-1]
+            return
+        
+        self._dense = False
+        self._sorted = []
+        for states in explicit:
+            order = np.argsort(states, kind='stable')
+            self._sorted.append((states[order], np.roll(states, -1)[order],
+                                 np.roll(states, 1)[order]))
+    
+    def step(self, states: Any, pattern_ids: Any, reverse: bool = False) -> 'np.ndarray':
+        """
+        Move every state one step along its pattern.
+        
+        Args:
+            states: Integer array (or array-like) of current states
+            pattern_ids: Pattern id per element, or a single id for all
+            reverse: If True, step backward (inform), otherwise forward (resolve)
+        
+        Returns:
+            int64 array of the same shape holding the new states, with
+            INVALID_STATE where a state is not in its pattern or the
+            pattern id is out of range
+        """
+        states = np.asarray(states, dtype=np.int64)
+        ids = np.broadcast_to(np.asarray(pattern_ids, dtype=np.intp), states.shape)
+        result = np.full(states.shape, INVALID_STATE, dtype=np.int64)
+        if not self.pattern_names:
+            return result
+        
+        known = (ids >= 0) & (ids < len(self.pattern_names))
+        rows = np.where(known, self._rows[np.where(known, ids, 0)], -1)
+        
+        # Explicit patterns: one gather over the stacked tables
+        slots = states - self._offset
+        hit = (rows >= 0) & (slots >= 0) & (slots < self._span)
+        if hit.any():
+            if self._dense:
+                table = self._prev if reverse else self._next
+                result[hit] = table[rows[hit], slots[hit]]
+            else:
+                for row in np.unique(rows[hit]):
+                    mask = hit & (rows == row)
+                    keys, nexts, prevs = self._sorted[row]
+                    found = np.minimum(np.searchsorted(keys, states[mask]), len(keys) - 1)
+                    values = prevs[found] if reverse else nexts[found]
+                    result[mask] = np.where(keys[found] == states[mask], values, INVALID_STATE)
+        
+        # Range-backed patterns: position arithmetic
+        for pattern_id, start, step, length in self._ranges:
+            mask = ids == pattern_id
+            if not mask.any():
+                continue
+            offset = states[mask] - start
+            position = offset // step
+            valid = (offset % step == 0) & (position >= 0) & (position < length)
+            position += -1 if reverse else 1
+            position %= length
+            result[mask] = np.where(valid, start + position * step, INVALID_STATE)
+        
+        return result
 
 
 class StateTransformer:
@@ -19,15 +339,24 @@ class StateTransformer:
     that govern how states transition within an S-Gram system.
     """
     
-    def __init__(self, sgram: SGram):
+    def __init__(self, sgram: SGram, compiled: bool = False):
         """
         Initialize the StateTransformer with an S-Gram.
         
         Args:
             sgram: The S-Gram to use for state transformations
+            compiled: If True, compile every pattern into O(1) lookup
+                     tables instead of building the state map
         """
         self.sgram = sgram
-        self._state_map = self._build_state_map()
+        self._compiled: Optional[Dict[str, CompiledPattern]] = None
+        self._resolve_compiled: Optional[Dict[str, CompiledPattern]] = None
+        self._batch: Dict[bool, BatchTransitionTable] = {}
+        if compiled:
+            self._state_map = None
+            self.compile()
+        else:
+            self._state_map = self._build_state_map()
     
     def _build_state_map(self) -> Dict[int, Dict[str, int]]:
         """
@@ -48,6 +377,76 @@ class StateTransformer:
         
         return state_map
     
+    def compile(self) -> 'StateTransformer':
+        """
+        Compile every pattern into O(1) lookup tables.
+        
+        After compiling, resolve, inform and get_state_distance are array
+        lookups instead of dict-of-dict or list scans. Lookups follow the
+        same precedence as the uncompiled transformer: resolve uses
+        get_all_patterns(), where an additional factor replaces a primary
+        pattern of the same name, and everything else prefers the primary
+        pattern.
+        
+        Returns:
+            The transformer itself, so calls can be chained
+        """
+        compiled = {}
+        names = list(self.sgram.fraction_patterns) + list(self.sgram.additional_factors)
+        for name in names:
+            if name not in compiled:
+                compiled[name] = CompiledPattern(name, self._get_sequence(name))
+        
+        resolve_compiled = {}
+        for name, sequence in self.sgram.get_all_patterns().items():
+            table = compiled[name]
+            if table.sequence is not sequence and table.sequence != sequence:
+                table = CompiledPattern(name, sequence)
+            resolve_compiled[name] = table
+        
+        self._compiled = compiled
+        self._resolve_compiled = resolve_compiled
+        self._batch = {}
+        return self
+    
+    @property
+    def is_compiled(self) -> bool:
+        """Whether the transformer uses compiled lookup tables"""
+        return self._compiled is not None
+    
+    def get_compiled_pattern(self, pattern: Optional[str] = None) -> CompiledPattern:
+        """
+        Get the compiled tables for a pattern, compiling on first use.
+        
+        Args:
+            pattern: The pattern name. If None, uses the primary pattern.
+            
+        Returns:
+            The CompiledPattern for the pattern
+            
+        Raises:
+            ValueError: If the pattern is invalid
+        """
+        if self._compiled is None:
+            self.compile()
+        if pattern is None:
+            pattern = self._primary_pattern()
+        if pattern not in self._compiled:
+            raise ValueError(f"Pattern {pattern} not found in S-Gram {self.sgram.index}")
+        return self._compiled[pattern]
+    
+    def _primary_pattern(self) -> str:
+        """Name of the primary (first) pattern"""
+        patterns = list(self.sgram.fraction_patterns.keys())
+        if not patterns:
+            raise ValueError(f"No patterns available for S-Gram {self.sgram.index}")
+        return patterns[0]
+    
+    def _get_sequence(self, pattern: str) -> Optional[Sequence[int]]:
+        """Sequence for a pattern, preferring primary patterns"""
+        return self.sgram.fraction_patterns.get(pattern) or \
+               self.sgram.additional_factors.get(pattern)
+    
     def resolve(self, state: int, pattern: Optional[str] = None) -> int:
         """
         Apply the "Resolving" pattern: move forward in the state sequence.
@@ -70,6 +469,15 @@ class StateTransformer:
                 raise ValueError(f"No patterns available for S-Gram {self.sgram.index}")
             pattern = patterns[0]
         
+        if self._resolve_compiled is not None:
+            table = self._resolve_compiled.get(pattern)
+            next_state = table.next_state(state) if table is not None else None
+            if next_state is None:
+                if not any(t.position(state) >= 0 for t in self._resolve_compiled.values()):
+                    raise ValueError(f"State {state} not found in S-Gram {self.sgram.index}")
+                raise ValueError(f"Pattern {pattern} not applicable to state {state}")
+            return next_state
+        
         if state not in self._state_map:
             raise ValueError(f"State {state} not found in S-Gram {self.sgram.index}")
         
@@ -99,6 +507,15 @@ class StateTransformer:
                 raise ValueError(f"No patterns available for S-Gram {self.sgram.index}")
             pattern = patterns[0]
         
+        if self._compiled is not None:
+            table = self._compiled.get(pattern)
+            if table is None:
+                raise ValueError(f"Pattern {pattern} not found in S-Gram {self.sgram.index}")
+            prev_state = table.prev_state(state)
+            if prev_state is None:
+                raise ValueError(f"State {state} not in pattern {pattern}")
+            return prev_state
+        
         sequence = self.sgram.fraction_patterns.get(pattern) or \
                    self.sgram.additional_factors.get(pattern)
         
@@ -129,6 +546,10 @@ class StateTransformer:
                 return 0
             pattern = patterns[0]
         
+        if self._compiled is not None:
+            table = self._compiled.get(pattern)
+            return table.length if table is not None else 0
+        
         sequence = self.sgram.fraction_patterns.get(pattern) or \
                    self.sgram.additional_factors.get(pattern)
         
@@ -156,6 +577,16 @@ class StateTransformer:
                 raise ValueError(f"No patterns available for S-Gram {self.sgram.index}")
             pattern = patterns[0]
         
+        if self._compiled is not None:
+            table = self._compiled.get(pattern)
+            if table is None:
+                raise ValueError(f"Pattern {pattern} not found")
+            from_idx = table.position(from_state)
+            to_idx = table.position(to_state)
+            if from_idx < 0 or to_idx < 0:
+                raise ValueError(f"States must be in the pattern sequence")
+            return (to_idx - from_idx) % table.length
+        
         sequence = self.sgram.fraction_patterns.get(pattern) or \
                    self.sgram.additional_factors.get(pattern)
         
@@ -174,6 +605,98 @@ class StateTransformer:
         else:
             return len(sequence) - from_idx + to_idx
     
+    def _jump_table(self, state: int, pattern: Optional[str],
+                    reverse: bool) -> Tuple[CompiledPattern, int]:
+        """
+        Compiled table and start position for jumping along a pattern.
+        
+        Forward jumps use the same tables as resolve and backward jumps
+        the same tables as inform, and raise the same errors.
+        """
+        if self._compiled is None:
+            self.compile()
+        if pattern is None:
+            pattern = self._primary_pattern()
+        
+        if reverse:
+            table = self._compiled.get(pattern)
+            if table is None:
+                raise ValueError(f"Pattern {pattern} not found in S-Gram {self.sgram.index}")
+            position = table.position(state)
+            if position < 0:
+                raise ValueError(f"State {state} not in pattern {pattern}")
+            return table, position
+        
+        table = self._resolve_compiled.get(pattern)
+        position = table.position(state) if table is not None else -1
+        if position < 0:
+            if not any(t.position(state) >= 0 for t in self._resolve_compiled.values()):
+                raise ValueError(f"State {state} not found in S-Gram {self.sgram.index}")
+            raise ValueError(f"Pattern {pattern} not applicable to state {state}")
+        return table, position
+    
+    def state_after(self, state: int, steps: int, pattern: Optional[str] = None) -> int:
+        """
+        Get the state reached after a number of steps, in constant time.
+        
+        Equivalent to calling resolve (or inform, for negative steps)
+        repeatedly, but the position is worked out modulo the cycle length.
+        The transformer is compiled on first use.
+        
+        Args:
+            state: Current state value
+            steps: Number of steps; negative values move backward
+            pattern: The pattern to follow. If None, uses the primary pattern.
+            
+        Returns:
+            The state after the given number of steps
+            
+        Raises:
+            ValueError: If the state or pattern is invalid
+        """
+        table, position = self._jump_table(state, pattern, reverse=steps < 0)
+        return table.state_at(position + steps)
+    
+    def iter_path(self, start_state: int, steps: int,
+                  pattern: Optional[str] = None,
+                  reverse: bool = False,
+                  every: int = 1) -> Iterator[Tuple[int, int]]:
+        """
+        Lazily trace a path through the state space.
+        
+        Each state is looked up directly from its cycle position, so
+        memory use is constant and sampling every m-th step costs the
+        same as tracing every step. The transformer is compiled on first use.
+        
+        Args:
+            start_state: Starting state
+            steps: Number of steps to trace
+            pattern: The pattern to follow. If None, uses the primary pattern.
+            reverse: If True, trace backward (inform), otherwise forward (resolve)
+            every: Only yield every m-th step (the start state is always yielded)
+            
+        Returns:
+            Iterator of (step, state) pairs, starting with (0, start_state)
+            
+        Raises:
+            ValueError: If the state or pattern is invalid (raised up front,
+                       before any state is yielded)
+        """
+        if every < 1:
+            raise ValueError(f"every must be positive, got {every}")
+        if steps < 1:
+            return iter([(0, start_state)])
+        
+        table, position = self._jump_table(start_state, pattern, reverse)
+        direction = -1 if reverse else 1
+        
+        def generate() -> Iterator[Tuple[int, int]]:
+            yield 0, start_state
+            for step in range(every, steps + 1, every):
+                yield step, table.state_at(position + direction * step)
+        
+        return generate()
+    
     def trace_path(self, start_state: int, steps: int, 
                    pattern: Optional[str] = None, 
                    reverse: bool = False) -> List[int]:
@@ -189,17 +712,83 @@ class StateTransformer:
         Returns:
             List of states in the path, including the start state
         """
-        path = [start_state]
-        current_state = start_state
+        return [state for _, state in self.iter_path(start_state, steps, pattern, reverse)]
+    
+    def _batch_table(self, reverse: bool) -> BatchTransitionTable:
+        """Batch table for one direction, built on first use"""
+        if self._compiled is None:
+            self.compile()
+        if reverse not in self._batch:
+            compiled = self._compiled if reverse else self._resolve_compiled
+            self._batch[reverse] = BatchTransitionTable(compiled)
+        return self._batch[reverse]
+    
+    def get_pattern_ids(self) -> Dict[str, int]:
+        """
+        Get the pattern ids used by the batch API.
         
-        for _ in range(steps):
-            if reverse:
-                current_state = self.inform(current_state, pattern)
-            else:
-                current_state = self.resolve(current_state, pattern)
-            path.append(current_state)
+        Returns:
+            Dictionary mapping pattern name -> pattern id
+        """
+        return dict(self._batch_table(False).pattern_ids)
+    
+    def _step_batch(self, states: Any, pattern_ids: Any, pattern: Optional[str],
+                    reverse: bool) -> 'np.ndarray':
+        """Shared implementation of resolve_batch and inform_batch"""
+        table = self._batch_table(reverse)
+        if pattern_ids is None:
+            if pattern is None:
+                pattern = self._primary_pattern()
+            if pattern not in table.pattern_ids:
+                raise ValueError(f"Pattern {pattern} not found in S-Gram {self.sgram.index}")
+            pattern_ids = table.pattern_ids[pattern]
+        return table.step(states, pattern_ids, reverse)
+    
+    def resolve_batch(self, states: Any, pattern_ids: Any = None,
+                      pattern: Optional[str] = None) -> 'np.ndarray':
+        """
+        Apply the "Resolving" pattern to a whole array of states at once.
         
-        return path
+        Invalid elements do not raise; they come back as INVALID_STATE,
+        so ``result != INVALID_STATE`` is the validity mask.
+        
+        Args:
+            states: NumPy integer array (or array-like) of current states
+            pattern_ids: Optional per-element pattern ids (see get_pattern_ids)
+            pattern: Pattern for every element when pattern_ids is None.
+                    If None, uses the primary pattern.
+                    
+        Returns:
+            int64 array of next states, shaped like states
+            
+        Raises:
+            ImportError: If NumPy is not installed
+            ValueError: If the pattern name is invalid
+        """
+        return self._step_batch(states, pattern_ids, pattern, reverse=False)
+    
+    def inform_batch(self, states: Any, pattern_ids: Any = None,
+                     pattern: Optional[str] = None) -> 'np.ndarray':
+        """
+        Apply the "Informing" pattern to a whole array of states at once.
+        
+        Invalid elements do not raise; they come back as INVALID_STATE,
+        so ``result != INVALID_STATE`` is the validity mask.
+        
+        Args:
+            states: NumPy integer array (or array-like) of current states
+            pattern_ids: Optional per-element pattern ids (see get_pattern_ids)
+            pattern: Pattern for every element when pattern_ids is None.
+                    If None, uses the primary pattern.
+                    
+        Returns:
+            int64 array of previous states, shaped like states
+            
+        Raises:
+            ImportError: If NumPy is not installed
+            ValueError: If the pattern name is invalid
+        """
+        return self._step_batch(states, pattern_ids, pattern, reverse=True)
     
     def get_transition_table(self, pattern: Optional[str] = None) -> Dict[int, Tuple[int, int]]:
         """
@@ -217,6 +806,15 @@ class StateTransformer:
                 return {}
             pattern = patterns[0]
         
+        if self._compiled is not None:
+            table = self._compiled.get(pattern)
+            if table is None:
+                return {}
+            return {
+                table.state_at(i): (table.state_at(i - 1), table.state_at(i + 1))
+                for i in range(table.length)
+            }
+        
         sequence = self.sgram.fraction_patterns.get(pattern) or \
                    self.sgram.additional_factors.get(pattern)
         
@@ -233,7 +831,8 @@ class StateTransformer:
     
     def __repr__(self) -> str:
         """String representation of the StateTransformer"""
-        return f"StateTransformer(sgram={self.sgram.symbol})"
+        compiled = ", compiled=True" if self.is_compiled else ""
+        return f"StateTransformer(sgram={self.sgram.symbol}{compiled})"
 
 
 class MultiPatternTransformer:
@@ -242,6 +841,13 @@ class MultiPatternTransformer:
     
     This allows for more complex state transitions that may jump between
     different fraction patterns based on specific rules.
+    
+    All patterns share one compiled StateTransformer. Pattern membership
+    is indexed once as a tuple of pattern ids per state (id i for the i-th
+    pattern of get_all_patterns()), so cross-pattern queries cost one dict
+    lookup and a scan of the few patterns sharing that state. Range-backed
+    patterns are not expanded into the index; their membership is tested
+    arithmetically.
     """
     
     def __init__(self, sgram: SGram):
@@ -252,10 +858,69 @@ class MultiPatternTransformer:
             sgram: The S-Gram to use
         """
         self.sgram = sgram
+        self.transformer = StateTransformer(sgram, compiled=True)
         self.transformers = {
-            pattern: StateTransformer(sgram)
+            pattern: self.transformer
             for pattern in sgram.get_all_patterns().keys()
         }
+        self._patterns = sgram.get_all_patterns()
+        self.pattern_names = list(self._patterns)
+        self._pattern_ids = {name: i for i, name in enumerate(self.pattern_names)}
+        self._membership, self._range_patterns = self._build_membership_index()
+    
+    def _build_membership_index(self) -> Tuple[Dict[int, Tuple[int, ...]], List[Tuple[int, range]]]:
+        """
+        Build the state -> pattern ids index.
+        
+        A tuple of ids per state keeps the index linear in the number of
+        (state, pattern) pairs; a bitmask per state would hold one bit per
+        pattern, which for S-Grams with thousands of patterns is far larger.
+        
+        Returns:
+            (membership, range_patterns) where membership maps each state of
+            an explicit pattern to the ids of the patterns holding it, in
+            order, and range_patterns lists the (id, range) pairs of
+            range-backed patterns
+        """
+        membership: Dict[int, List[int]] = {}
+        range_patterns = []
+        for pattern_id, sequence in enumerate(self._patterns.values()):
+            if isinstance(sequence, PatternRange):
+                range_patterns.append((pattern_id, sequence.as_range()))
+                continue
+            for state in sequence:
+                ids = membership.get(state)
+                if ids is None:
+                    membership[state] = [pattern_id]
+                elif ids[-1] != pattern_id:
+                    ids.append(pattern_id)
+        return {state: tuple(ids) for state, ids in membership.items()}, range_patterns
+    
+    def get_pattern_ids(self, state: int) -> Tuple[int, ...]:
+        """
+        Get the ids of the patterns containing a state.
+        
+        Args:
+            state: The state to look up
+            
+        Returns:
+            Increasing indices into pattern_names of the patterns holding the state
+        """
+        ids = self._membership.get(state, ())
+        matches = [pattern_id for pattern_id, states in self._range_patterns if state in states]
+        if matches:
+            ids = tuple(sorted(ids + tuple(matches)))
+        return ids
+    
+    def _contains(self, state: int, pattern: str) -> bool:
+        """Whether a pattern, by name, contains a state"""
+        pattern_id = self._pattern_ids.get(pattern)
+        if pattern_id is None:
+            return False
+        sequence = self._patterns[pattern]
+        if isinstance(sequence, PatternRange):
+            return state in sequence.as_range()
+        return pattern_id in self._membership.get(state, ())
     
     def cross_pattern_transition(self, state: int, 
                                 from_pattern: str, 
@@ -272,14 +937,11 @@ class MultiPatternTransformer:
             The state in the target pattern, or None if not possible
         """
         # Check if state exists in both patterns
-        from_seq = self.sgram.get_all_patterns().get(from_pattern, [])
-        to_seq = self.sgram.get_all_patterns().get(to_pattern, [])
-        
-        if state not in from_seq:
+        if not self._contains(state, from_pattern):
             return None
         
         # If the state exists in the target pattern, return it
-        if state in to_seq:
+        if self._contains(state, to_pattern):
             return state
         
         # Otherwise, no direct cross-pattern transition
@@ -295,8 +957,4 @@ class MultiPatternTransformer:
         Returns:
             List of pattern names containing the state
         """
-        patterns = []
-        for pattern_name, sequence in self.sgram.get_all_patterns().items():
-            if state in sequence:
-                patterns.append(pattern_name)
-        return patterns
+        return [self.pattern_names[pattern_id] for pattern_id in self.get_pattern_ids(state)]
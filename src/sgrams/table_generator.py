@@ -3,12 +3,48 @@ Table Generator for S-Grams State Transformations
 
 This module generates formatted tables for visualizing S-Gram
 state transformations and patterns.
+
+Every generate_* method has an iter_* counterpart yielding the table's
+lines one at a time; write_lines() streams such an iterator straight to
+an open file, so large exports never hold the whole document in memory.
+iter_parallel_markdown_lines() renders an export's per-index sections on
+a thread or process pool and yields them back in index order.
 """
 
-from typing import List, Optional, Dict
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Deque, IO, Iterable, Iterator, List, Optional, Dict
 from .sgram import SGram, SGramFactory
 from .state_transformer import StateTransformer
 from .fraction_patterns import FractionPatternAnalyzer
+from .ngram_base import PatternRange, format_states
+from .exporters import MAX_CYCLE_LENGTH
+
+# Indices rendered per task in parallel exports
+EXPORT_CHUNK_SIZE = 32
+
+# Chunks a parallel export keeps in flight or waiting to be written
+EXPORT_WINDOW = 64
+
+# Parallel exports of fewer indices run on threads instead of processes
+PROCESS_POOL_THRESHOLD = 256
+
+
+def write_lines(lines: Iterable[str], file: IO[str]) -> None:
+    """
+    Write lines to a file as "\\n".join(lines) would, without joining them.
+    
+    Args:
+        lines: Lines to write, e.g. from an iter_* method
+        file: Open text file
+    """
+    lines = iter(lines)
+    for line in lines:
+        file.write(line)
+        break
+    for line in lines:
+        file.write("\n")
+        file.write(line)
 
 
 class StateTransformationTableGenerator:
@@ -27,6 +63,18 @@ class StateTransformationTableGenerator:
         self.transformer = StateTransformer(sgram)
         self.analyzer = FractionPatternAnalyzer(sgram)
     
+    def iter_basic_info_lines(self) -> Iterator[str]:
+        """Lines of the basic information table"""
+        yield "=" * 70
+        yield f"S-GRAM {self.sgram.symbol.upper()} (Index {self.sgram.index})"
+        yield "=" * 70
+        yield f"Catalan Number:      [{self.sgram.catalan_number}]"
+        yield f"Fraction:            {self.sgram.fraction} -> {self.sgram.numerator}/{self.sgram.denominator}"
+        yield f"Symbolic Notation:   {self.sgram.symbolic_notation}"
+        yield f"Transformation:      {self.sgram.transformation}"
+        yield f"Formula:             {self.sgram.formula}"
+        yield "=" * 70
+    
     def generate_basic_info_table(self) -> str:
         """
         Generate a table with basic S-Gram information.
@@ -34,69 +82,53 @@ class StateTransformationTableGenerator:
         Returns:
             Formatted string table
         """
-        lines = []
-        lines.append("=" * 70)
-        lines.append(f"S-GRAM {self.sgram.symbol.upper()} (Index {self.sgram.index})")
-        lines.append("=" * 70)
-        lines.append(f"Catalan Number:      [{self.sgram.catalan_number}]")
-        lines.append(f"Fraction:            {self.sgram.fraction} -> {self.sgram.numerator}/{self.sgram.denominator}")
-        lines.append(f"Symbolic Notation:   {self.sgram.symbolic_notation}")
-        lines.append(f"Transformation:      {self.sgram.transformation}")
-        lines.append(f"Formula:             {self.sgram.formula}")
-        lines.append("=" * 70)
-        return "\n".join(lines)
+        return "\n".join(self.iter_basic_info_lines())
     
-    def generate_fraction_patterns_table(self) -> str:
-        """
-        Generate a table showing all fraction patterns.
-        
-        Returns:
-            Formatted string table
-        """
-        lines = []
-        lines.append("\nFRACTION PATTERNS")
-        lines.append("-" * 70)
+    def iter_fraction_patterns_lines(self) -> Iterator[str]:
+        """Lines of the fraction patterns table"""
+        yield "\nFRACTION PATTERNS"
+        yield "-" * 70
         
         # Primary patterns
         if self.sgram.fraction_patterns:
-            lines.append("Primary Patterns:")
+            yield "Primary Patterns:"
             for divisor, sequence in self.sgram.fraction_patterns.items():
                 seq_str = ' '.join(f"{s:3d}" for s in sequence)
-                lines.append(f"  {divisor:>8s} | {seq_str}")
+                yield f"  {divisor:>8s} | {seq_str}"
         
         # Additional factors
         if self.sgram.additional_factors:
-            lines.append("\nAdditional Factors:")
+            yield "\nAdditional Factors:"
             for divisor, sequence in self.sgram.additional_factors.items():
                 seq_str = ' '.join(f"{s:3d}" for s in sequence)
-                lines.append(f"  {divisor:>8s} | {seq_str}")
+                yield f"  {divisor:>8s} | {seq_str}"
         
-        lines.append("-" * 70)
-        return "\n".join(lines)
+        yield "-" * 70
     
-    def generate_state_transition_table(self, pattern: Optional[str] = None) -> str:
+    def generate_fraction_patterns_table(self) -> str:
         """
-        Generate a table showing state transitions (previous <- current -> next).
+        Generate a table showing all fraction patterns.
         
-        Args:
-            pattern: The pattern to use. If None, uses the primary pattern.
-            
         Returns:
             Formatted string table
         """
+        return "\n".join(self.iter_fraction_patterns_lines())
+    
+    def iter_state_transition_lines(self, pattern: Optional[str] = None) -> Iterator[str]:
+        """Lines of the state transition table; see generate_state_transition_table"""
         if pattern is None:
             patterns = list(self.sgram.fraction_patterns.keys())
             if not patterns:
-                return "No patterns available"
+                yield "No patterns available"
+                return
             pattern = patterns[0]
         
         transition_table = self.transformer.get_transition_table(pattern)
         
-        lines = []
-        lines.append(f"\nSTATE TRANSITION TABLE (Pattern: {pattern})")
-        lines.append("-" * 70)
-        lines.append(f"{'State':>8s} | {'Previous':>8s} | {'Next':>8s} | {'Resolving →':>15s} | {'← Informing':>15s}")
-        lines.append("-" * 70)
+        yield f"\nSTATE TRANSITION TABLE (Pattern: {pattern})"
+        yield "-" * 70
+        yield f"{'State':>8s} | {'Previous':>8s} | {'Next':>8s} | {'Resolving →':>15s} | {'← Informing':>15s}"
+        yield "-" * 70
         
         sequence = self.sgram.fraction_patterns.get(pattern) or \
                    self.sgram.additional_factors.get(pattern)
@@ -104,58 +136,70 @@ class StateTransformationTableGenerator:
         if sequence:
             for state in sequence:
                 prev_state, next_state = transition_table[state]
-                lines.append(f"{state:8d} | {prev_state:8d} | {next_state:8d} | "
-                           f"{state:5d} → {next_state:5d} | {prev_state:5d} ← {state:5d}")
+                yield (f"{state:8d} | {prev_state:8d} | {next_state:8d} | "
+                       f"{state:5d} → {next_state:5d} | {prev_state:5d} ← {state:5d}")
         
-        lines.append("-" * 70)
-        return "\n".join(lines)
+        yield "-" * 70
     
-    def generate_cycle_info_table(self) -> str:
+    def generate_state_transition_table(self, pattern: Optional[str] = None) -> str:
         """
-        Generate a table with cycle information for all patterns.
+        Generate a table showing state transitions (previous <- current -> next).
         
+        Args:
+            pattern: The pattern to use. If None, uses the primary pattern.
+            
         Returns:
             Formatted string table
         """
-        lines = []
-        lines.append("\nCYCLE INFORMATION")
-        lines.append("-" * 70)
-        lines.append(f"{'Pattern':>10s} | {'Cycle Length':>12s} | {'Type':>20s}")
-        lines.append("-" * 70)
+        return "\n".join(self.iter_state_transition_lines(pattern))
+    
+    def iter_cycle_info_lines(self) -> Iterator[str]:
+        """Lines of the cycle information table"""
+        yield "\nCYCLE INFORMATION"
+        yield "-" * 70
+        yield f"{'Pattern':>10s} | {'Cycle Length':>12s} | {'Type':>20s}"
+        yield "-" * 70
         
         for pattern in self.analyzer.patterns:
             pattern_type = "Primary" if pattern.is_primary else \
                           "Additional Factor" if pattern.is_additional_factor else \
                           "Standard"
-            lines.append(f"{pattern.divisor:>10s} | {pattern.cycle_length:12d} | {pattern_type:>20s}")
+            yield f"{pattern.divisor:>10s} | {pattern.cycle_length:12d} | {pattern_type:>20s}"
         
-        lines.append("-" * 70)
+        yield "-" * 70
         
         # Summary
         cycle_info = self.analyzer.analyze_cycle_relationships()
-        lines.append(f"\nCommon Divisor: {cycle_info['common_divisor']}")
-        lines.append(f"Max Cycle: {cycle_info['max_cycle_length']}, Min Cycle: {cycle_info['min_cycle_length']}")
-        
-        return "\n".join(lines)
+        yield f"\nCommon Divisor: {cycle_info['common_divisor']}"
+        yield f"Max Cycle: {cycle_info['max_cycle_length']}, Min Cycle: {cycle_info['min_cycle_length']}"
     
-    def generate_complete_table(self) -> str:
+    def generate_cycle_info_table(self) -> str:
         """
-        Generate a complete table with all information.
+        Generate a table with cycle information for all patterns.
         
         Returns:
-            Formatted string with all tables
+            Formatted string table
         """
-        parts = [
-            self.generate_basic_info_table(),
-            self.generate_fraction_patterns_table(),
-            self.generate_cycle_info_table(),
-        ]
+        return "\n".join(self.iter_cycle_info_lines())
+    
+    def iter_complete_table_lines(self) -> Iterator[str]:
+        """Lines of the complete table; see generate_complete_table"""
+        yield from self.iter_basic_info_lines()
+        yield from self.iter_fraction_patterns_lines()
+        yield from self.iter_cycle_info_lines()
         
         # Add transition tables for primary patterns
         for pattern_name in list(self.sgram.fraction_patterns.keys())[:3]:  # Limit to first 3
-            parts.append(self.generate_state_transition_table(pattern_name))
+            yield from self.iter_state_transition_lines(pattern_name)
+    
+    def generate_complete_table(self) -> str:
+        """
+        Generate a complete table with all information.
         
-        return "\n".join(parts)
+        Returns:
+            Formatted string with all tables
+        """
+        return "\n".join(self.iter_complete_table_lines())
 
 
 class AllSGramsTableGenerator:
@@ -192,6 +236,15 @@ class AllSGramsTableGenerator:
         lines.append("=" * 100)
         return "\n".join(lines)
     
+    def iter_all_tables_lines(self) -> Iterator[str]:
+        """Lines of the complete tables for all S-Grams"""
+        yield self.generate_summary_table()
+        yield "\n"
+        
+        for generator in self.generators:
+            yield "\n" + "=" * 100 + "\n"
+            yield from generator.iter_complete_table_lines()
+    
     def generate_all_tables(self) -> str:
         """
         Generate complete tables for all S-Grams.
@@ -199,13 +252,7 @@ class AllSGramsTableGenerator:
         Returns:
             Formatted string with all tables
         """
-        lines = [self.generate_summary_table(), "\n"]
-        
-        for generator in self.generators:
-            lines.append("\n" + "=" * 100 + "\n")
-            lines.append(generator.generate_complete_table())
-        
-        return "\n".join(lines)
+        return "\n".join(self.iter_all_tables_lines())
     
     def generate_comparison_table(self) -> str:
         """
@@ -244,72 +291,292 @@ class AllSGramsTableGenerator:
         return "\n".join(lines)
 
 
-def generate_markdown_table(sgram: SGram) -> str:
+def iter_markdown_lines(sgram: SGram) -> Iterator[str]:
     """
-    Generate a Markdown-formatted table for an S-Gram.
+    Lines of the Markdown table for an S-Gram.
     
     Args:
         sgram: The S-Gram to format
         
-    Returns:
-        Markdown formatted table string
+    Yields:
+        Markdown lines, without line endings
     """
-    lines = []
-    lines.append(f"## S-Gram {sgram.symbol} (Index {sgram.index})")
-    lines.append("")
-    lines.append("### Basic Information")
-    lines.append("")
-    lines.append("| Property | Value |")
-    lines.append("|----------|-------|")
-    lines.append(f"| Catalan Number | {sgram.catalan_number} |")
-    lines.append(f"| Fraction | {sgram.fraction} |")
-    lines.append(f"| Formula | {sgram.formula} |")
-    lines.append(f"| Symbolic Notation | {sgram.symbolic_notation} |")
-    lines.append(f"| Transformation | {sgram.transformation} |")
-    lines.append("")
-    
-    lines.append("### Fraction Patterns")
-    lines.append("")
-    lines.append("| Divisor | Sequence |")
-    lines.append("|---------|----------|")
+    yield f"## S-Gram {sgram.symbol} (Index {sgram.index})"
+    yield ""
+    yield "### Basic Information"
+    yield ""
+    yield "| Property | Value |"
+    yield "|----------|-------|"
+    yield f"| Catalan Number | {sgram.catalan_number} |"
+    yield f"| Fraction | {sgram.fraction} |"
+    yield f"| Formula | {sgram.formula} |"
+    yield f"| Symbolic Notation | {sgram.symbolic_notation} |"
+    yield f"| Transformation | {sgram.transformation} |"
+    yield ""
+    
+    yield "### Fraction Patterns"
+    yield ""
+    yield "| Divisor | Sequence |"
+    yield "|---------|----------|"
     
     for divisor, sequence in sgram.fraction_patterns.items():
         seq_str = ', '.join(map(str, sequence))
-        lines.append(f"| {divisor} | {seq_str} |")
+        yield f"| {divisor} | {seq_str} |"
     
     if sgram.additional_factors:
-        lines.append("")
-        lines.append("### Additional Factors")
-        lines.append("")
-        lines.append("| Divisor | Sequence |")
-        lines.append("|---------|----------|")
+        yield ""
+        yield "### Additional Factors"
+        yield ""
+        yield "| Divisor | Sequence |"
+        yield "|---------|----------|"
         for divisor, sequence in sgram.additional_factors.items():
             seq_str = ', '.join(map(str, sequence))
-            lines.append(f"| {divisor} | {seq_str} |")
+            yield f"| {divisor} | {seq_str} |"
     
-    lines.append("")
-    return "\n".join(lines)
+    yield ""
+
+
+def generate_markdown_table(sgram: SGram) -> str:
+    """
+    Generate a Markdown-formatted table for an S-Gram.
+    
+    Args:
+        sgram: The S-Gram to format
+        
+    Returns:
+        Markdown formatted table string
+    """
+    return "\n".join(iter_markdown_lines(sgram))
+
 
+def _iter_sgram_section_lines(sgram: SGram) -> Iterator[str]:
+    """Lines of one S-Gram's section in the all-S-Grams document"""
+    yield from iter_markdown_lines(sgram)
+    yield "---"
+    yield ""
 
-def generate_all_markdown_tables() -> str:
+
+def _iter_sgram_header_lines(start: int, end: int) -> Iterator[str]:
+    """Lines of the all-S-Grams document before the first section"""
+    yield "# S-Grams State Transformation Tables"
+    yield ""
+    yield f"Complete reference for S-Grams (2nd Power N-Grams) from {start} to {end - 1}."
+    yield ""
+    yield "---"
+    yield ""
+
+
+def iter_all_markdown_lines(start: int = 0, end: int = 12) -> Iterator[str]:
+    """
+    Lines of the Markdown document for a range of S-Grams.
+    
+    S-Grams are built one at a time as the lines are consumed.
+    
+    Args:
+        start: First S-Gram index (inclusive)
+        end: Last S-Gram index (exclusive)
+        
+    Yields:
+        Markdown lines, without line endings
+    """
+    yield from _iter_sgram_header_lines(start, end)
+    
+    for index in range(start, end):
+        yield from _iter_sgram_section_lines(SGramFactory.create_sgram(index))
+
+
+def generate_all_markdown_tables(start: int = 0, end: int = 12) -> str:
     """
     Generate Markdown tables for all S-Grams.
     
+    Args:
+        start: First S-Gram index (inclusive)
+        end: Last S-Gram index (exclusive)
+        
     Returns:
         Complete Markdown document
     """
-    lines = []
-    lines.append("# S-Grams State Transformation Tables")
-    lines.append("")
-    lines.append("Complete reference for S-Grams (2nd Power N-Grams) from 0 to 11.")
-    lines.append("")
-    lines.append("---")
-    lines.append("")
-    
-    sgrams = SGramFactory.create_all_sgrams()
-    for sgram in sgrams:
-        lines.append(generate_markdown_table(sgram))
-        lines.append("---")
-        lines.append("")
+    return "\n".join(iter_all_markdown_lines(start, end))
+
+
+def _iter_family_header_lines(family: Any) -> Iterator[str]:
+    """Lines of a family document up to its summary rows"""
+    yield f"# {family.description} Tables"
+    yield ""
+    yield f"Generated tables for {family.description}"
+    yield ""
+    yield "## Summary"
+    yield ""
+    yield "| Index | Symbol | Value | Formula |"
+    yield "|-------|--------|-------|----------|"
+
+
+def _family_summary_row(ng: Any) -> str:
+    """Summary table row for one N-Gram"""
+    return f"| {ng.index} | {ng.symbol} | {ng.sequence_value} | {ng.formula} |"
+
+
+def _iter_family_detail_lines(ng: Any) -> Iterator[str]:
+    """Lines of one N-Gram's detailed section"""
+    yield f"### {ng.symbol} (Index {ng.index})"
+    yield ""
+    yield f"**Value:** {ng.sequence_value}"
+    yield ""
+    yield f"**Formula:** {ng.formula}"
+    yield ""
+    
+    if ng.fraction_patterns:
+        yield "**Patterns:**"
+        yield ""
+        elided = False
+        for divisor, pattern in ng.fraction_patterns.items():
+            # Range-backed patterns can hold billions of states; past the
+            # exports' cycle length limit only their ends are written
+            if isinstance(pattern, PatternRange) and pattern.size > MAX_CYCLE_LENGTH:
+                elided = True
+                yield f"- {divisor}: {format_states(pattern)}"
+            else:
+                yield f"- {divisor}: {' '.join(map(str, pattern))}"
+        yield ""
+        if elided:
+            yield (f"*Note: patterns longer than {MAX_CYCLE_LENGTH:,} states list only "
+                   f"their first and last states.*")
+            yield ""
+    
+    yield "---"
+    yield ""
+
+
+def iter_family_markdown_lines(family: Any, start: int = 0, end: int = 12) -> Iterator[str]:
+    """
+    Lines of the Markdown document for a range of N-Grams of any family.
     
+    The summary and the detailed sections each walk the range once, so
+    no more than one N-Gram is held at a time. Every state of a pattern is
+    written, except for range-backed patterns longer than MAX_CYCLE_LENGTH
+    (see sgrams.exporters), which list their first and last states under a
+    note.
+    
+    Args:
+        family: Registry family (see sgrams.registry) with description and iter_range
+        start: First index (inclusive)
+        end: Last index (exclusive)
+        
+    Yields:
+        Markdown lines, without line endings
+    """
+    yield from _iter_family_header_lines(family)
+    
+    for ng in family.iter_range(start, end):
+        yield _family_summary_row(ng)
+    
+    yield ""
+    yield "## Detailed Information"
+    yield ""
+    
+    for ng in family.iter_range(start, end):
+        yield from _iter_family_detail_lines(ng)
+    
+    yield ""
+
+
+def _render_chunk(key: str, part: str, start: int, end: int) -> str:
+    """
+    Render one part of an export for a range of indices, in a worker.
+    
+    Args:
+        key: Registry type key
+        part: 'sgram' for S-Gram sections, 'summary' for family summary
+            rows or 'detail' for family detailed sections
+        start: First index (inclusive)
+        end: Last index (exclusive)
+        
+    Returns:
+        The rendered lines joined by newlines
+    """
+    from .registry import registry
+    
+    ngrams = registry.get_family(key).iter_range(start, end)
+    if part == 'sgram':
+        lines = (line for sgram in ngrams for line in _iter_sgram_section_lines(sgram))
+    elif part == 'summary':
+        lines = map(_family_summary_row, ngrams)
+    else:
+        lines = (line for ng in ngrams for line in _iter_family_detail_lines(ng))
     return "\n".join(lines)
+
+
+def _iter_ordered(executor: Executor, key: str, part: str, start: int, end: int,
+                  chunk_size: int, window: int) -> Iterator[str]:
+    """Render chunks of a range on the executor, yielding them in index order"""
+    pending: Deque[Future] = deque()
+    try:
+        for chunk_start in range(start, end, chunk_size):
+            if len(pending) >= window:
+                yield pending.popleft().result()
+            chunk_end = min(chunk_start + chunk_size, end)
+            pending.append(executor.submit(_render_chunk, key, part, chunk_start, chunk_end))
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def iter_parallel_markdown_lines(key: str, start: int, end: int, executor: Executor,
+                                 chunk_size: int = EXPORT_CHUNK_SIZE,
+                                 window: int = EXPORT_WINDOW) -> Iterator[str]:
+    """
+    Lines of an export document, rendering the per-index sections on an executor.
+    
+    Chunks of indices are rendered concurrently and yielded in index
+    order, so write_lines() over the result produces exactly the bytes
+    of the serial iter_all_markdown_lines / iter_family_markdown_lines.
+    At most `window` chunks are in flight or waiting to be written.
+    
+    Workers look the family up by key in the default registry, so with a
+    process pool the family must be built in or discoverable through its
+    entry point.
+    
+    Args:
+        key: Registry type key, e.g. '3rd'
+        start: First index (inclusive)
+        end: Last index (exclusive)
+        executor: Pool rendering the chunks, e.g. from make_export_executor()
+        chunk_size: Indices rendered per task
+        window: Chunks kept in flight
+        
+    Yields:
+        Markdown lines, or several lines already joined by newlines
+    """
+    from .registry import registry
+    
+    if key == '2nd':
+        yield from _iter_sgram_header_lines(start, end)
+        yield from _iter_ordered(executor, key, 'sgram', start, end, chunk_size, window)
+        return
+    
+    yield from _iter_family_header_lines(registry.get_family(key))
+    yield from _iter_ordered(executor, key, 'summary', start, end, chunk_size, window)
+    yield ""
+    yield "## Detailed Information"
+    yield ""
+    yield from _iter_ordered(executor, key, 'detail', start, end, chunk_size, window)
+    yield ""
+
+
+def make_export_executor(jobs: int, size: int) -> Executor:
+    """
+    Create a pool for parallel exports.
+    
+    Args:
+        jobs: Number of workers
+        size: Total number of indices to be rendered; jobs smaller than
+            PROCESS_POOL_THRESHOLD use threads, avoiding process start-up
+            
+    Returns:
+        A ProcessPoolExecutor, or a ThreadPoolExecutor for small jobs
+    """
+    if size < PROCESS_POOL_THRESHOLD:
+        return ThreadPoolExecutor(jobs, thread_name_prefix='sgrams-export')
+    return ProcessPoolExecutor(jobs)
@@ -0,0 +1,239 @@
+"""
+Tree enumeration for the Catalan N-Gram families.
+
+sequences.py counts the trees behind the 2D and 3D Catalan N-Grams;
+this module lists them. Trees are written as level sequences: the depth
+of each node in preorder, root first at depth 0, with children visited
+in the order that makes the sequence lexicographically largest. That
+canonical form is unique per unlabeled tree.
+
+- iter_rooted_trees(n): every rooted tree on n nodes (OEIS A000081),
+  Beyer-Hedetniemi successor rule, constant amortized time per tree
+- iter_free_trees(n): every free (unrooted) tree on n nodes (OEIS
+  A000055), rooted at its center, Wright-Richmond-Odlyzko-McKay
+  algorithm, constant amortized time per tree
+
+Generators reuse one list for every tree they yield; copy it
+(list(levels) or tuple(levels)) to keep a tree past the next step:
+
+    >>> from sgrams.trees import iter_rooted_trees
+    >>> [tuple(levels) for levels in iter_rooted_trees(4)]
+    [(0, 1, 2, 3), (0, 1, 2, 2), (0, 1, 2, 1), (0, 1, 1, 1)]
+    >>> [tuple(levels) for levels in iter_free_trees(5)]
+    [(0, 1, 2, 1, 2), (0, 1, 2, 1, 1), (0, 1, 1, 1, 1)]
+"""
+
+from typing import Iterator, List, Sequence
+
+
+def iter_rooted_trees(n: int) -> Iterator[List[int]]:
+    """
+    Iterate over all unlabeled rooted trees on n nodes.
+
+    Trees come in decreasing lexicographic order of their canonical
+    level sequences, from the path (0, 1, ..., n-1) to the star
+    (0, 1, ..., 1). Each successor takes constant amortized time
+    (Beyer and Hedetniemi, 1980): the last node p deeper than 1 moves
+    up one level, under its grandparent q, and the nodes after it are
+    refilled with copies of q's subtree.
+
+    Args:
+        n: Number of nodes (n = 0 yields nothing, as A000081(0) = 0)
+
+    Yields:
+        The level sequence of each tree, in one list updated in place
+
+    Raises:
+        ValueError: If n is negative
+    """
+    if n < 0:
+        raise ValueError(f"Number of nodes must be non-negative, got {n}")
+    if n == 0:
+        return
+
+    levels = list(range(n))
+    p = n - 1
+    while True:
+        yield levels
+
+        # Last node below depth 1; the nodes after it are leaves of the root
+        while levels[p] <= 1:
+            if p == 0:
+                return
+            p -= 1
+
+        level = levels[p] - 1
+        q = p - 1
+        while levels[q] != level:
+            q -= 1
+
+        # Fill p.. with repeats of the subtree rooted at q
+        segment = levels[q:p]
+        tail = n - p
+        levels[p:] = (segment * (tail // len(segment) + 1))[:tail]
+        p = n - 1
+
+
+def iter_free_trees(n: int, parents: bool = False) -> Iterator[List[int]]:
+    """
+    Iterate over all free (unlabeled, unrooted) trees on n nodes.
+
+    Each tree is rooted at its center (one fixed choice of the two for
+    bicentral trees) and written as the canonical level sequence of that
+    rooted tree, so every free tree appears exactly once. Trees come in
+    decreasing lexicographic order, from the path to the star, in
+    constant amortized time per tree (Wright, Richmond, Odlyzko and
+    McKay, 1986): Beyer-Hedetniemi successors are taken only among
+    center-rooted trees, and when the next rooted tree would not be
+    rooted at a center, the tail is reset to the next one that is in a
+    single step. Parent pointers are maintained alongside the levels.
+
+    Args:
+        n: Number of nodes (n = 0 yields the empty tree, as A000055(0) = 1)
+        parents: Whether to yield parent arrays instead of level sequences
+
+    Yields:
+        The level sequence (or parent array, -1 for the root) of each
+        tree, in one list updated in place
+
+    Raises:
+        ValueError: If n is negative
+    """
+    if n < 0:
+        raise ValueError(f"Number of nodes must be non-negative, got {n}")
+    if n < 4:
+        # The only tree is the path, rooted at its center
+        yield [-1, 0, 0][:n] if parents else [0, 1, 1][:n]
+        return
+
+    # Positions p, q, h1, h2, r, c and k follow the paper and are 1-based;
+    # node i is levels[i - 1] (depth, root 0) and parent[i - 1] (0-based)
+    unset = n + 2
+    k = n // 2 + 1
+    levels = list(range(k)) + list(range(1, n - k + 1))
+    parent = list(range(-1, n - 1))
+    parent[k] = 0
+
+    # p: last node deeper than 1; q: its parent; h1/h2: ends of the
+    # first and second subtrees of the root; r: start of the second
+    # subtree; c: first position where the two subtrees may differ
+    p = 3 if n == 4 else n
+    q = p - 1
+    h1, h2, r = k, n, k
+    c = unset if n % 2 else n + 1
+
+    while True:
+        yield parent if parents else levels
+        if q == 0:
+            return
+
+        fixit = False
+        if c == n + 1 or (p == h2 and (
+                (levels[h1 - 1] == levels[h2 - 1] + 1 and n - h2 > r - h1) or
+                (levels[h1 - 1] == levels[h2 - 1] and n - h2 + 1 < r - h1))):
+            # The successor would not be rooted at a center
+            if levels[r - 1] > 2:
+                p = r
+                q = parent[r - 1] + 1
+                if h1 == r:
+                    h1 -= 1
+                fixit = True
+            else:
+                p = r
+                r -= 1
+                q = 2
+
+        need_r = need_c = need_h2 = False
+        if p <= h1:
+            h1 = p - 1
+        if p <= r:
+            need_r = True
+        elif p <= h2:
+            need_h2 = True
+        elif levels[h2 - 1] == levels[h1 - 1] - 1 and n - h2 == r - h1:
+            if p <= c:
+                need_c = True
+        else:
+            c = unset
+
+        # Beyer-Hedetniemi step from p, tracking r, h2 and c as it goes
+        old_p = p
+        delta = q - p
+        old_level_q = levels[q - 1]
+        old_parent_q = parent[q - 1] + 1
+        p = unset
+        for i in range(old_p, n + 1):
+            level = levels[i - 1] = levels[i + delta - 1]
+            if level == 1:
+                parent[i - 1] = 0
+            else:
+                p = i
+                if level == old_level_q:
+                    q = old_parent_q
+                else:
+                    q = parent[i + delta - 1] + 1 - delta
+                parent[i - 1] = q - 1
+            if need_r and level == 1:
+                need_r = False
+                need_h2 = True
+                r = i - 1
+            if need_h2 and level <= levels[i - 2] and i > r + 1:
+                need_h2 = False
+                h2 = i - 1
+                if levels[h2 - 1] == levels[h1 - 1] - 1 and n - h2 == r - h1:
+                    need_c = True
+                else:
+                    c = unset
+            if need_c:
+                if level != levels[h1 - h2 + i - 1] - 1:
+                    need_c = False
+                    c = i
+                else:
+                    c = i + 1
+
+        if fixit:
+            # Jump past rooted trees that are not center-rooted: the
+            # nodes after r become a path hanging from the root
+            r = n - h1 + 1
+            for i in range(r + 1, n + 1):
+                levels[i - 1] = i - r
+                parent[i - 1] = i - 2
+            parent[r] = 0
+            h2 = n
+            p = n
+            q = p - 1
+            c = unset
+        else:
+            if p == unset:
+                p = old_p - 1 if levels[old_p - 2] != 1 else old_p - 2
+                q = parent[p - 1] + 1
+            if need_h2:
+                h2 = n
+                if levels[h2 - 1] == levels[h1 - 1] - 1 and h1 == r:
+                    c = n + 1
+                else:
+                    c = unset
+
+
+def level_sequence_to_parents(levels: Sequence[int]) -> List[int]:
+    """
+    Convert a level sequence to a parent array.
+
+    Args:
+        levels: Depth of each node in preorder, root first at depth 0
+
+    Returns:
+        Preorder position of each node's parent, -1 for the root
+
+    Examples:
+        >>> level_sequence_to_parents([0, 1, 2, 1])
+        [-1, 0, 1, 0]
+    """
+    parents = []
+    # Most recent node seen at each depth
+    last = []
+    for position, level in enumerate(levels):
+        parents.append(last[level - 1] if level else -1)
+        del last[level:]
+        last.append(position)
+    return parents